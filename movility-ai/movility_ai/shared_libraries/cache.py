@@ -0,0 +1,22 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Directorio de los archivos precalculados (matrices, red vial, DEM, geocodificación)"""
+
+import os
+
+
+def cache_dir() -> str:
+    """Directorio de caché: MOVILITY_CACHE_DIR o ~/.cache/movility_ai."""
+    return os.getenv("MOVILITY_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "movility_ai")
@@ -30,3 +30,51 @@ CONGESTION_THRESHOLD_MEDIUM = 0.4
 STATUS_ACTIVE = "active"
 STATUS_ERROR = "error"
 STATUS_COMPLETED = "completed"
+
+# Zonas de Medellín y el Valle de Aburrá: centroide aproximado (lat, lon) y
+# zona de tráfico de FlowSense que mejor la representa (None si no hay)
+MEDELLIN_ZONES = {
+    "laureles": {"name": "Laureles", "lat": 6.2447, "lon": -75.5956, "traffic_zone": "laureles"},
+    "el_poblado": {"name": "El Poblado", "lat": 6.2088, "lon": -75.5664, "traffic_zone": "poblado"},
+    "envigado": {"name": "Envigado", "lat": 6.1719, "lon": -75.5863, "traffic_zone": "poblado"},
+    "belen": {"name": "Belén", "lat": 6.2310, "lon": -75.6030, "traffic_zone": "av_80"},
+    "centro": {"name": "Centro", "lat": 6.2518, "lon": -75.5636, "traffic_zone": "centro"},
+    "estadio": {"name": "Estadio", "lat": 6.2569, "lon": -75.5903, "traffic_zone": "estadio"},
+    "aranjuez": {"name": "Aranjuez", "lat": 6.2820, "lon": -75.5560, "traffic_zone": "autopista_norte"},
+    "castilla": {"name": "Castilla", "lat": 6.2940, "lon": -75.5740, "traffic_zone": "autopista_norte"},
+    "robledo": {"name": "Robledo", "lat": 6.2780, "lon": -75.5960, "traffic_zone": "av_80"},
+    "buenos_aires": {"name": "Buenos Aires", "lat": 6.2390, "lon": -75.5530, "traffic_zone": "centro"},
+    "la_candelaria": {"name": "La Candelaria", "lat": 6.2480, "lon": -75.5700, "traffic_zone": "centro"},
+    "guayabal": {"name": "Guayabal", "lat": 6.2160, "lon": -75.5850, "traffic_zone": "av_80"},
+    "itagui": {"name": "Itagüí", "lat": 6.1719, "lon": -75.6110, "traffic_zone": None},
+    "sabaneta": {"name": "Sabaneta", "lat": 6.1515, "lon": -75.6160, "traffic_zone": None},
+    "la_estrella": {"name": "La Estrella", "lat": 6.1580, "lon": -75.6430, "traffic_zone": None},
+    "caldas": {"name": "Caldas", "lat": 6.0910, "lon": -75.6360, "traffic_zone": None},
+}
+
+# Nombres alternativos frecuentes de las zonas
+ZONE_ALIASES = {
+    "poblado": "el_poblado",
+    "candelaria": "la_candelaria",
+    "centro de medellin": "centro",
+}
+
+# Sitios de interés de Medellín con coordenadas aproximadas
+MEDELLIN_LANDMARKS = [
+    {"name": "Parque Lleras", "lat": 6.2088, "lon": -75.5664, "aliases": ["Lleras"]},
+    {"name": "Plaza Botero", "lat": 6.2522, "lon": -75.5685, "aliases": ["Plaza de las Esculturas"]},
+    {"name": "Pueblito Paisa", "lat": 6.2366, "lon": -75.5797, "aliases": ["Cerro Nutibara"]},
+    {"name": "Parque Explora", "lat": 6.2705, "lon": -75.5655, "aliases": ["Explora"]},
+    {"name": "Jardín Botánico", "lat": 6.2705, "lon": -75.5637, "aliases": ["Jardín Botánico de Medellín"]},
+    {"name": "Parque de los Pies Descalzos", "lat": 6.2445, "lon": -75.5778, "aliases": ["Pies Descalzos"]},
+    {"name": "Aeropuerto Olaya Herrera", "lat": 6.2201, "lon": -75.5906, "aliases": ["Olaya Herrera"]},
+    {"name": "Estadio Atanasio Girardot", "lat": 6.2566, "lon": -75.5906, "aliases": ["Atanasio Girardot"]},
+    {"name": "Universidad de Antioquia", "lat": 6.2676, "lon": -75.5694, "aliases": ["UdeA"]},
+    {"name": "Centro Comercial Santafé", "lat": 6.1968, "lon": -75.5741, "aliases": ["Santafé"]},
+    {"name": "Centro Comercial Oviedo", "lat": 6.1995, "lon": -75.5743, "aliases": ["Oviedo"]},
+    {"name": "Centro Comercial Unicentro", "lat": 6.2407, "lon": -75.5873, "aliases": ["Unicentro"]},
+    {"name": "Terminal del Norte", "lat": 6.2758, "lon": -75.5674, "aliases": ["Terminal Norte"]},
+    {"name": "Terminal del Sur", "lat": 6.2155, "lon": -75.5870, "aliases": ["Terminal Sur"]},
+    {"name": "Comuna 13", "lat": 6.2560, "lon": -75.6190, "aliases": ["Graffitour"]},
+    {"name": "Parque Arví", "lat": 6.2830, "lon": -75.4980, "aliases": ["Arví"]},
+]
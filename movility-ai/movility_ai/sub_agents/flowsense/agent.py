@@ -26,6 +26,7 @@ flowsense_agent = Agent(
     instruction=prompt.FLOWSENSE_AGENT_INSTR,
     tools=[
         predictor.predict_traffic_congestion,
+        predictor.forecast_congestion,
         predictor.get_traffic_events,
         predictor.get_historical_patterns,
         predictor.analyze_weather_impact,
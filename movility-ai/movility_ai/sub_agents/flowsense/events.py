@@ -0,0 +1,193 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Almacén de eventos de tráfico indexado por intervalo de tiempo y por zona"""
+
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+# Eventos agregados que se recorren linealmente antes de reconstruir los índices
+PENDING_MERGE_SIZE = 256
+
+Instant = Union[str, datetime, float]
+
+
+def to_epoch(when: Instant) -> float:
+    """Segundos epoch de una hora ISO, un datetime o un número ya convertido."""
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if isinstance(when, datetime):
+        return when.timestamp()
+    return float(when)
+
+
+class IntervalIndex:
+    """
+    Intervalos [inicio, fin] ordenados por inicio con un árbol de máximos del fin.
+
+    Los intervalos que se cruzan con [t0, t1] son los de inicio <= t1 (un
+    prefijo, por búsqueda binaria) y fin >= t0; el árbol guarda el fin
+    máximo de cada rango del prefijo y la búsqueda sólo baja por las ramas
+    que tienen algún intervalo vivo: O(log n) por resultado.
+    """
+
+    __slots__ = ("starts", "ends", "positions", "_size", "_max_end")
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, positions: np.ndarray):
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.positions = positions[order]
+
+        size = 1
+        while size < len(order):
+            size *= 2
+        tree = np.full(2 * size, -np.inf)
+        tree[size:size + len(order)] = self.ends
+        level = size
+        while level > 1:
+            tree[level // 2:level] = np.maximum(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+            level //= 2
+        self._size = size
+        self._max_end = tree.tolist()
+
+    def overlapping(self, t0: float, t1: float) -> List[int]:
+        """Posiciones de los intervalos que se cruzan con [t0, t1]."""
+        limit = int(np.searchsorted(self.starts, t1, side="right"))
+        if limit == 0:
+            return []
+        found = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or self._max_end[node] < t0:
+                continue
+            if hi - lo == 1:
+                found.append(int(self.positions[lo]))
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return found
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class EventStore:
+    """
+    Eventos de tráfico (accidentes, obras, eventos masivos) listos para consultar.
+
+    Las horas start_time y estimated_end se convierten a epoch una sola vez
+    al agregar cada evento. Hay un índice de intervalos para toda la ciudad
+    y uno por zona (campo zone del evento), así "activos a la hora T" o
+    "activos en la zona Z" no recorren la lista completa. Los eventos
+    nuevos quedan en una lista corta que se recorre aparte hasta que se
+    reconstruyen los índices. Quien se suscribe (p. ej. PathFinder para
+    re-enrutar viajes activos) recibe cada evento nuevo al agregarse.
+    """
+
+    def __init__(self, events: Iterable[Dict[str, Any]] = ()):
+        self._events: List[Dict[str, Any]] = []
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._zones: List[Optional[str]] = []
+        self._index: Optional[IntervalIndex] = None
+        self._zone_index: Dict[str, IntervalIndex] = {}
+        self._pending: List[int] = []
+        self._listeners: List[Callable[[Dict[str, Any]], Any]] = []
+        self._lock = threading.Lock()
+        self.extend(events)
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], Any]) -> None:
+        """Llama a listener con cada evento que se agregue desde ahora."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """Agrega un evento con start_time y estimated_end (ISO format)."""
+        self.extend([event])
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Agrega varios eventos; con muchos pendientes se reconstruyen los índices.
+
+        Los suscriptores se llaman después, fuera del candado, así pueden
+        consultar el almacén.
+        """
+        added = []
+        with self._lock:
+            for event in events:
+                added.append(event)
+                self._pending.append(len(self._events))
+                self._events.append(event)
+                self._starts.append(to_epoch(event["start_time"]))
+                self._ends.append(to_epoch(event["estimated_end"]))
+                self._zones.append(event.get("zone"))
+            if len(self._pending) > PENDING_MERGE_SIZE:
+                self._rebuild()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            for event in added:
+                listener(event)
+
+    def active(self, when: Instant, zone: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Eventos activos a la hora dada, opcionalmente sólo los de una zona."""
+        return self.overlapping(when, when, zone)
+
+    def overlapping(self, start: Instant, end: Instant, zone: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Eventos que se cruzan con [start, end], en el orden en que se agregaron."""
+        t0, t1 = to_epoch(start), to_epoch(end)
+        with self._lock:
+            if zone is None:
+                index = self._index
+            else:
+                index = self._zone_index.get(zone)
+            found = index.overlapping(t0, t1) if index is not None else []
+            found.extend(
+                position for position in self._pending
+                if (zone is None or self._zones[position] == zone)
+                and self._starts[position] <= t1 and self._ends[position] >= t0
+            )
+            return [self._events[position] for position in sorted(found)]
+
+    def _rebuild(self) -> None:
+        starts = np.array(self._starts)
+        ends = np.array(self._ends)
+        positions = np.arange(len(self._events))
+        self._index = IntervalIndex(starts, ends, positions)
+
+        zones = np.array([zone or "" for zone in self._zones])
+        self._zone_index = {}
+        for zone in set(self._zones) - {None}:
+            mask = zones == zone
+            self._zone_index[zone] = IntervalIndex(starts[mask], ends[mask], positions[mask])
+        self._pending = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def stats(self) -> Dict[str, int]:
+        """Eventos guardados, indexados, pendientes y zonas con índice."""
+        with self._lock:
+            return {
+                "events": len(self._events),
+                "indexed": len(self._index) if self._index is not None else 0,
+                "pending": len(self._pending),
+                "zones": len(self._zone_index),
+            }
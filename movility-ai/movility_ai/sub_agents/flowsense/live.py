@@ -0,0 +1,271 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Ingesta en streaming de velocidades de vehículos sonda con estado EWMA por zona"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from movility_ai.sub_agents.flowsense.events import Instant, to_epoch
+
+# Peso de cada muestra en el promedio móvil exponencial (EWMA)
+EWMA_ALPHA = 0.05
+
+# Muestras que se acumulan en los buffers antes de actualizar el estado
+INGEST_BATCH_SIZE = 65536
+
+# Velocidad (km/h) que corresponde a congestión 0, la misma del modelo estático
+FREE_FLOW_KMH = 50.0
+
+# Rango de velocidades válidas de un reporte (km/h); fuera de él se descarta
+MAX_PROBE_SPEED_KMH = 150.0
+
+# Mezcla con el modelo estático: peso máximo del estado en vivo, muestras
+# para confiar del todo en él y vida media (segundos) de su peso sin reportes
+LIVE_MAX_WEIGHT = 0.7
+LIVE_MIN_SAMPLES = 20
+LIVE_HALF_LIFE_S = 600.0
+
+
+class LiveTraffic:
+    """
+    Velocidad en vivo por zona a partir de reportes de vehículos sonda.
+
+    Cada zona guarda sólo su EWMA de velocidad, la varianza EWMA, el número
+    de muestras y la hora del último reporte: la memoria no crece con el
+    flujo. Las muestras se copian en buffers preasignados y se aplican por
+    lotes con numpy (ingest_arrays), sin crear objetos por muestra; las
+    muestras de una zona dentro de un lote pesan lo mismo que si llegaran
+    una a una, pero con igual peso entre ellas. ingest e ingest_lines
+    llenan un buffer compartido y se usan desde un solo hilo productor.
+    """
+
+    def __init__(
+        self,
+        zone_ids: Iterable[str],
+        alpha: float = EWMA_ALPHA,
+        batch_size: int = INGEST_BATCH_SIZE,
+    ):
+        self.zone_ids: List[str] = list(zone_ids)
+        self.position = {zone_id: i for i, zone_id in enumerate(self.zone_ids)}
+        self.alpha = alpha
+        zones = len(self.zone_ids)
+
+        # Estado por zona
+        self.mean = np.zeros(zones)
+        self.var = np.zeros(zones)
+        self.count = np.zeros(zones, dtype=np.int64)
+        self.last_seen = np.full(zones, -np.inf)
+        self.dropped = 0
+
+        # Buffers de entrada y de trabajo, reutilizados en cada lote
+        self._rows = np.empty(batch_size, dtype=np.int64)
+        self._speeds = np.empty(batch_size)
+        self._squares = np.empty(batch_size)
+        self._valid = np.empty(batch_size, dtype=bool)
+        self._check = np.empty(batch_size, dtype=bool)
+        self._filled = 0
+        self._n = np.empty(zones)
+        self._sum = np.empty(zones)
+        self._sumsq = np.empty(zones)
+        self._weight = np.empty(zones)
+        self._delta = np.empty(zones)
+        self._seen = np.empty(zones, dtype=bool)
+        self._lock = threading.Lock()
+
+    def ingest_arrays(self, rows: np.ndarray, speeds: np.ndarray, when: Optional[Instant] = None) -> int:
+        """
+        Aplica un lote de muestras ya en arreglos (camino rápido).
+
+        Args:
+            rows: Fila de zona (ver position) de cada muestra
+            speeds: Velocidad (km/h) de cada muestra; las no finitas o fuera
+                de 0-MAX_PROBE_SPEED_KMH se descartan (ver dropped)
+            when: Hora de las muestras, None para ahora
+
+        Returns:
+            Muestras aceptadas
+        """
+        now = time.time() if when is None else to_epoch(when)
+        batch = len(self._rows)
+        accepted = 0
+        with self._lock:
+            for start in range(0, len(rows), batch):
+                accepted += self._apply(rows[start:start + batch], speeds[start:start + batch], now)
+        return accepted
+
+    def ingest(self, samples: Iterable[Tuple[str, float]], when: Optional[Instant] = None) -> int:
+        """
+        Consume muestras (zona, velocidad km/h) de cualquier iterable, por ejemplo un generador.
+
+        Las zonas desconocidas y las velocidades inválidas se descartan (ver
+        dropped). Retorna las muestras aceptadas.
+        """
+        accepted = 0
+        position = self.position
+        rows, speeds = self._rows, self._speeds
+        for zone_id, speed in samples:
+            row = position.get(zone_id)
+            if row is None:
+                self.dropped += 1
+                continue
+            rows[self._filled] = row
+            speeds[self._filled] = speed
+            self._filled += 1
+            if self._filled == len(rows):
+                accepted += self.flush(when)
+        return accepted + self.flush(when)
+
+    def ingest_lines(self, lines: Iterable[str], when: Optional[Instant] = None) -> int:
+        """
+        Consume líneas de texto "zona,velocidad_kmh".
+
+        Sirve para la cola de un archivo (ver follow) o un socket
+        (sock.makefile("r")). Las líneas vacías o mal formadas se descartan.
+        """
+        return self.ingest(self._parse(lines), when)
+
+    def flush(self, when: Optional[Instant] = None) -> int:
+        """Aplica las muestras que quedan en el buffer de entrada; retorna las aceptadas."""
+        if not self._filled:
+            return 0
+        filled, self._filled = self._filled, 0
+        return self.ingest_arrays(self._rows[:filled], self._speeds[:filled], when)
+
+    def blend_weights(self, rows: np.ndarray, when: Instant) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nivel de congestión en vivo (0-1) y su peso para mezclar con el modelo estático.
+
+        El peso crece con las muestras hasta LIVE_MAX_WEIGHT y cae a la mitad
+        cada LIVE_HALF_LIFE_S segundos entre el último reporte y when.
+        """
+        now = to_epoch(when)
+        with self._lock:
+            confidence = np.minimum(self.count[rows] / LIVE_MIN_SAMPLES, 1.0)
+            age = np.abs(now - self.last_seen[rows])
+            level = np.clip(1.0 - self.mean[rows] / FREE_FLOW_KMH, 0.0, 1.0)
+        weight = LIVE_MAX_WEIGHT * confidence * np.power(0.5, age / LIVE_HALF_LIFE_S)
+        return level, weight
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Estado actual de las zonas con reportes."""
+        with self._lock:
+            return {
+                zone_id: {
+                    "speed_kmh": float(self.mean[i]),
+                    "speed_std_kmh": float(np.sqrt(self.var[i])),
+                    "samples": int(self.count[i]),
+                    "last_seen": float(self.last_seen[i]),
+                }
+                for i, zone_id in enumerate(self.zone_ids)
+                if self.count[i]
+            }
+
+    def reset(self) -> None:
+        """Olvida todo el estado en vivo."""
+        with self._lock:
+            self.mean.fill(0.0)
+            self.var.fill(0.0)
+            self.count.fill(0)
+            self.last_seen.fill(-np.inf)
+            self.dropped = 0
+            self._filled = 0
+
+    def _apply(self, rows: np.ndarray, speeds: np.ndarray, now: float) -> int:
+        # Un NaN o un infinito dañaría el estado de la zona para siempre
+        valid = np.isfinite(speeds, out=self._valid[:len(speeds)])
+        valid &= np.greater_equal(speeds, 0.0, out=self._check[:len(speeds)])
+        valid &= np.less_equal(speeds, MAX_PROBE_SPEED_KMH, out=self._check[:len(speeds)])
+        accepted = int(np.count_nonzero(valid))
+        if accepted < len(speeds):
+            self.dropped += len(speeds) - accepted
+            rows, speeds = rows[valid], speeds[valid]
+
+        # Suma, suma de cuadrados y conteo del lote por zona
+        squares = np.multiply(speeds, speeds, out=self._squares[:len(speeds)])
+        n, total, total_sq = self._n, self._sum, self._sumsq
+        n.fill(0.0)
+        total.fill(0.0)
+        total_sq.fill(0.0)
+        np.add.at(n, rows, 1.0)
+        np.add.at(total, rows, speeds)
+        np.add.at(total_sq, rows, squares)
+        seen = np.greater(n, 0, out=self._seen)
+        np.maximum(n, 1.0, out=n)
+
+        # Media y varianza del lote
+        np.divide(total, n, out=total)
+        np.divide(total_sq, n, out=total_sq)
+        np.subtract(total_sq, total * total, out=total_sq)
+        np.maximum(total_sq, 0.0, out=total_sq)
+
+        # Peso del lote: el mismo que tendrían n muestras aplicadas una a una;
+        # en una zona sin historia el lote reemplaza el estado
+        weight = np.power(1.0 - self.alpha, n, out=self._weight)
+        np.subtract(1.0, weight, out=weight)
+        weight[self.count == 0] = 1.0
+        weight[~seen] = 0.0
+
+        # Mezcla de dos distribuciones: var = (1-w)var + w var_lote + w(1-w)(delta^2)
+        delta = np.subtract(total, self.mean, out=self._delta)
+        self.var *= 1.0 - weight
+        self.var += weight * total_sq + weight * (1.0 - weight) * delta * delta
+        self.mean += weight * delta
+        self.count += np.where(seen, n, 0).astype(np.int64)
+        self.last_seen[seen] = now
+        return accepted
+
+    def _parse(self, lines: Iterable[str]) -> Iterator[Tuple[str, float]]:
+        for line in lines:
+            zone_id, _, text = line.strip().partition(",")
+            try:
+                speed = float(text)
+            except ValueError:
+                self.dropped += 1
+                continue
+            if not 0.0 <= speed <= MAX_PROBE_SPEED_KMH:  # También descarta nan
+                self.dropped += 1
+                continue
+            yield zone_id, speed
+
+
+def follow(path: str, stop: Optional[threading.Event] = None, poll_seconds: float = 0.5,
+           from_start: bool = False) -> Iterator[str]:
+    """
+    Líneas que se agregan a un archivo (como tail -f), hasta que stop se active.
+
+    Args:
+        path: Archivo a seguir
+        stop: Evento para terminar; sin él sólo se leen las líneas disponibles
+        poll_seconds: Espera entre lecturas cuando no hay líneas nuevas
+        from_start: Leer también lo que el archivo ya tenía
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        pending = ""
+        while True:
+            chunk = f.readline()
+            if chunk:
+                pending += chunk
+                if pending.endswith("\n"):
+                    yield pending
+                    pending = ""
+                continue
+            if stop is None or stop.wait(poll_seconds):
+                return
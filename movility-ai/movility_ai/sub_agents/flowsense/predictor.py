@@ -14,10 +14,15 @@
 
 """Predictor de tráfico para FlowSense Agent"""
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Union
+from datetime import datetime
 import random
 
+import numpy as np
+
+from movility_ai.sub_agents.flowsense.events import EventStore
+from movility_ai.sub_agents.flowsense.live import LIVE_HALF_LIFE_S, LiveTraffic
+
 # Zonas clave de Medellín con patrones de tráfico
 MEDELLIN_ZONES = {
     "centro": {
@@ -64,12 +69,138 @@ MEDELLIN_ZONES = {
     },
 }
 
+# Multiplicador de congestión por condición climática
+WEATHER_FACTORS = {
+    "clear": 1.0,
+    "cloudy": 1.1,
+    "rainy": 1.4,
+    None: 1.0,
+}
+
+# Multiplicador de congestión de sábados y domingos
+WEEKEND_FACTOR = 0.6
+
+HOURS_PER_WEEK = 7 * 24
+
+
+def hour_of_week(when: datetime) -> int:
+    """Índice 0-167: lunes 00:00 es 0, domingo 23:00 es 167."""
+    return when.weekday() * 24 + when.hour
+
+
+class ZoneModel:
+    """
+    MEDELLIN_ZONES compilado en arreglos, con una fila por zona.
+
+    Para cada zona y hora de la semana (0-167) se precalcula si es hora
+    pico y el multiplicador de congestión (pico x fin de semana), así cada
+    predicción es indexar arreglos sin recorrer los rangos de horas pico.
+    Una zona puede definir weekend_peak_hours para que sábados y domingos
+    tengan horas pico distintas; un festivo basta con leerlo como domingo.
+    """
+
+    __slots__ = ("ids", "position", "names", "base", "peak_multiplier", "peak", "multiplier")
+
+    def __init__(self, zones: Dict[str, Dict[str, Any]]):
+        self.ids: List[str] = list(zones)
+        self.position = {zone_id: i for i, zone_id in enumerate(self.ids)}
+        self.names = [zones[z]["name"] for z in self.ids]
+        self.base = np.array([zones[z]["base_congestion"] for z in self.ids])
+        self.peak_multiplier = np.array([zones[z]["peak_multiplier"] for z in self.ids])
+
+        self.peak = np.zeros((len(self.ids), HOURS_PER_WEEK), dtype=bool)
+        for i, zone_id in enumerate(self.ids):
+            zone = zones[zone_id]
+            for day in range(7):
+                ranges = zone.get("weekend_peak_hours", zone["peak_hours"]) if day >= 5 else zone["peak_hours"]
+                for start, end in ranges:
+                    self.peak[i, day * 24 + start:day * 24 + end] = True
+        day_factor = np.where(np.arange(HOURS_PER_WEEK) >= 5 * 24, WEEKEND_FACTOR, 1.0)
+        self.multiplier = np.where(self.peak, self.peak_multiplier[:, None], 1.0) * day_factor[None, :]
+
+    def rows(self, zones: Optional[List[str]]) -> np.ndarray:
+        """
+        Filas de las zonas pedidas (None para todas).
+
+        Raises:
+            ValueError: Si alguna zona no existe
+        """
+        if zones is None:
+            return np.arange(len(self.ids))
+        unknown = [zone_id for zone_id in zones if zone_id not in self.position]
+        if unknown:
+            raise ValueError(f"Zonas no encontradas: {', '.join(unknown)}")
+        return np.array([self.position[zone_id] for zone_id in zones], dtype=np.int64)
+
+    def levels(self, rows: np.ndarray, hours: np.ndarray, weather: Optional[str] = None) -> np.ndarray:
+        """Congestión (0-1) de cada fila en cada hora de la semana (arreglos con broadcasting)."""
+        levels = self.base[rows] * self.multiplier[rows, hours] * WEATHER_FACTORS.get(weather, 1.0)
+        return np.minimum(levels, 1.0)
+
+
+# Zonas compiladas al importar (mismo orden que MEDELLIN_ZONES)
+ZONE_MODEL = ZoneModel(MEDELLIN_ZONES)
+
+# Velocidades en vivo de vehículos sonda por zona, mezcladas con el modelo estático
+LIVE_TRAFFIC = LiveTraffic(ZONE_MODEL.ids)
+
+# Peso mínimo del estado en vivo para citarlo como causa
+LIVE_CAUSE_WEIGHT = 0.2
+
+# Horizontes por defecto de forecast_congestion: cada 5 minutos hasta 3 horas
+DEFAULT_FORECAST_HORIZONS_MIN = tuple(range(0, 3 * 60 + 1, 5))
+
+
+class ForecastBase:
+    """
+    Estado base de un pronóstico: zonas, hora de partida y clima.
+
+    Se calcula una sola vez (filas de las zonas, congestión base con el
+    clima ya aplicado, minuto de la semana de partida y estado en vivo de
+    LIVE_TRAFFIC) y cada horizonte es sólo una columna de las tablas de
+    ZONE_MODEL, así pedir 1 o 36 horizontes cuesta prácticamente lo mismo.
+    El peso del estado en vivo se reduce a la mitad cada LIVE_HALF_LIFE_S
+    segundos de horizonte.
+    """
+
+    __slots__ = ("rows", "start", "start_minute", "scaled_base", "live_level", "live_weight")
+
+    def __init__(self, rows: np.ndarray, start: datetime, weather: Optional[str] = None):
+        self.rows = rows
+        self.start = start
+        self.start_minute = hour_of_week(start) * 60 + start.minute + start.second / 60
+        self.scaled_base = ZONE_MODEL.base[rows] * WEATHER_FACTORS.get(weather, 1.0)
+        self.live_level, self.live_weight = LIVE_TRAFFIC.blend_weights(rows, start)
+
+    def hours(self, offsets_minutes: Any) -> np.ndarray:
+        """Hora de la semana de cada horizonte (minutos desde la partida)."""
+        offsets = np.asarray(offsets_minutes, dtype=float)
+        return ((self.start_minute + offsets) // 60).astype(np.int64) % HOURS_PER_WEEK
+
+    def levels(self, offsets_minutes: Any) -> np.ndarray:
+        """Arreglo (zonas, horizontes) con la congestión (0-1)."""
+        offsets = np.asarray(offsets_minutes, dtype=float)
+        hours = self.hours(offsets)
+        multiplier = ZONE_MODEL.multiplier[self.rows[:, None], hours[None, :]]
+        static = np.minimum(self.scaled_base[:, None] * multiplier, 1.0)
+        weight = self.live_weight[:, None] * np.power(0.5, offsets * 60 / LIVE_HALF_LIFE_S)[None, :]
+        return static + weight * (self.live_level[:, None] - static)
+
+    def peaks(self, offsets_minutes: Any) -> np.ndarray:
+        """Arreglo (zonas, horizontes) que indica si cada zona está en hora pico."""
+        hours = self.hours(offsets_minutes)
+        return ZONE_MODEL.peak[self.rows[:, None], hours[None, :]]
+
+
 # Eventos que afectan el tráfico (mock data)
 TRAFFIC_EVENTS_MOCK = [
     {
         "id": 1,
         "type": "accident",
         "location": "Autopista Norte con Calle 67",
+        "zone": "autopista_norte",
+        "lat": 6.2800,
+        "lon": -75.5680,
         "severity": "high",
         "description": "Accidente con dos vehículos, carril izquierdo bloqueado",
         "start_time": "2025-10-29T07:30:00",
@@ -79,6 +210,9 @@ TRAFFIC_EVENTS_MOCK = [
         "id": 2,
         "type": "construction",
         "location": "Av. El Poblado entre Calles 10 y 16",
+        "zone": "poblado",
+        "lat": 6.2088,
+        "lon": -75.5690,
         "severity": "medium",
         "description": "Obras de repavimentación, un carril cerrado",
         "start_time": "2025-10-29T06:00:00",
@@ -88,6 +222,9 @@ TRAFFIC_EVENTS_MOCK = [
         "id": 3,
         "type": "event",
         "location": "Estadio Atanasio Girardot",
+        "zone": "estadio",
+        "lat": 6.2569,
+        "lon": -75.5903,
         "severity": "high",
         "description": "Partido Atlético Nacional vs Medellín - 20:00h",
         "start_time": "2025-10-29T18:00:00",
@@ -96,6 +233,10 @@ TRAFFIC_EVENTS_MOCK = [
 ]
 
 
+# Eventos indexados por tiempo y zona para get_traffic_events
+TRAFFIC_EVENTS = EventStore(TRAFFIC_EVENTS_MOCK)
+
+
 def predict_traffic_congestion(
     target_time: Optional[str] = None,
     zone: Optional[str] = None,
@@ -118,40 +259,24 @@ def predict_traffic_congestion(
     else:
         dt = datetime.now()
     
-    hour = dt.hour
-    day_of_week = dt.weekday()  # 0=Monday, 6=Sunday
-    is_weekend = day_of_week >= 5
-    
-    # Factor climático
-    weather_factor = {
-        "clear": 1.0,
-        "cloudy": 1.1,
-        "rainy": 1.4,
-        None: 1.0,
-    }.get(weather_condition, 1.0)
+    is_weekend = dt.weekday() >= 5
     
-    # Factor fin de semana
-    weekend_factor = 0.6 if is_weekend else 1.0
-    
-    # Calcular congestión por zona
+    # Estado base compartido por la hora actual y los horizontes de 30 y 60 min
     zones_status = {}
     
-    target_zones = [zone] if zone else list(MEDELLIN_ZONES.keys())
+    if zone:
+        rows = np.array([ZONE_MODEL.position[zone]] if zone in ZONE_MODEL.position else [], dtype=np.int64)
+    else:
+        rows = ZONE_MODEL.rows(None)
+    base = ForecastBase(rows, dt, weather_condition)
+    levels = base.levels([0])[:, 0]
+    peaks = base.peaks([0])[:, 0]
+    live_weights = base.live_weight.tolist()
     
-    for zone_id in target_zones:
-        if zone_id not in MEDELLIN_ZONES:
-            continue
-            
-        zone_data = MEDELLIN_ZONES[zone_id]
-        base = zone_data["base_congestion"]
-        
-        # Verificar si estamos en hora pico
-        is_peak = any(start <= hour < end for start, end in zone_data["peak_hours"])
-        peak_factor = zone_data["peak_multiplier"] if is_peak else 1.0
-        
-        # Calcular nivel de congestión (0-1)
-        congestion_level = base * peak_factor * weather_factor * weekend_factor
-        congestion_level = min(congestion_level, 1.0)  # Cap at 1.0
+    for row, congestion_level, is_peak, live_weight in zip(
+        rows.tolist(), levels.tolist(), peaks.tolist(), live_weights
+    ):
+        zone_id = ZONE_MODEL.ids[row]
         
         # Clasificar nivel
         if congestion_level < 0.3:
@@ -175,49 +300,132 @@ def predict_traffic_congestion(
             causes.append("Lluvia")
         if is_weekend and zone_id in ["poblado", "laureles"]:
             causes.append("Zona de ocio fin de semana")
+        if live_weight >= LIVE_CAUSE_WEIGHT:
+            causes.append("Reportes en vivo")
         if not causes:
             causes.append("Tráfico normal")
         
         zones_status[zone_id] = {
-            "name": zone_data["name"],
+            "name": ZONE_MODEL.names[row],
             "level": congestion_level,
             "status": status,
             "emoji": emoji,
             "causes": causes,
             "avg_speed_kmh": int(50 * (1 - congestion_level)),  # Velocidad estimada
+            "live_weight": live_weight,  # Peso de los reportes en vivo en el nivel
         }
     
     # Predicción a 30 y 60 minutos
-    prediction_30 = predict_future_traffic(dt + timedelta(minutes=30), zones_status, weather_condition)
-    prediction_60 = predict_future_traffic(dt + timedelta(minutes=60), zones_status, weather_condition)
+    prediction_30 = predict_future_traffic(base, 30)
+    prediction_60 = predict_future_traffic(base, 60)
+    future_levels = base.levels([30, 60])
     
     return {
         "timestamp": dt.isoformat(),
         "current_conditions": zones_status,
         "prediction_30min": prediction_30,
         "prediction_60min": prediction_60,
+        "forecast": {
+            "horizons_minutes": [30, 60],
+            "levels": {ZONE_MODEL.ids[row]: future_levels[i].tolist() for i, row in enumerate(rows.tolist())},
+        },
         "general_status": calculate_general_status(zones_status),
     }
 
 
-def predict_future_traffic(
-    future_time: datetime,
-    current_zones: Dict[str, Any],
-    weather_condition: Optional[str]
-) -> Dict[str, str]:
+def predict_congestion_grid(
+    zones: Optional[List[str]],
+    start: Union[str, datetime],
+    end: Union[str, datetime],
+    step_minutes: int = 5,
+    weather: Optional[str] = None
+) -> np.ndarray:
+    """
+    Congestión (0-1) de varias zonas en una serie de horas, de una sola vez.
+    
+    Usa el mismo modelo que predict_traffic_congestion pero evalúa la
+    grilla zona x instante con broadcasting sobre los arreglos de zonas.
+    
+    Args:
+        zones: Zonas a evaluar (None para todas, en el orden de ZONE_MODEL.ids)
+        start: Primer instante (ISO format o datetime)
+        end: Fin de la serie, sin incluir (ISO format o datetime)
+        step_minutes: Minutos entre instantes
+        weather: Condición climática (clear, cloudy, rainy)
+    
+    Returns:
+        Arreglo (zonas, instantes) con el nivel de congestión
+    
+    Raises:
+        ValueError: Si una zona no existe o el paso no es positivo
+    """
+    start = datetime.fromisoformat(start) if isinstance(start, str) else start
+    end = datetime.fromisoformat(end) if isinstance(end, str) else end
+    if step_minutes <= 0:
+        raise ValueError("step_minutes debe ser positivo")
+    total_minutes = (end - start).total_seconds() / 60
+    offsets = np.arange(0, max(total_minutes, 0), step_minutes)
+    return ForecastBase(ZONE_MODEL.rows(zones), start, weather).levels(offsets)
+
+
+def forecast_congestion(
+    zones: Optional[List[str]] = None,
+    horizons_minutes: Optional[List[int]] = None,
+    target_time: Optional[str] = None,
+    weather_condition: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Pronóstico numérico de congestión para cualquier lista de horizontes.
+    
+    Args:
+        zones: Zonas a pronosticar, None para toda la ciudad
+        horizons_minutes: Minutos desde target_time (por defecto cada 5 min hasta 3 horas)
+        target_time: Hora de partida (ISO format), None para ahora
+        weather_condition: Condición climática (clear, cloudy, rainy)
+    
+    Returns:
+        Nivel (0-1), velocidad estimada y hora pico de cada zona en cada horizonte
+    """
+    dt = datetime.fromisoformat(target_time) if target_time else datetime.now()
+    horizons = list(DEFAULT_FORECAST_HORIZONS_MIN if horizons_minutes is None else horizons_minutes)
+    if any(horizon < 0 for horizon in horizons):
+        return {"error": "Los horizontes deben ser minutos no negativos"}
+    try:
+        rows = ZONE_MODEL.rows(zones)
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    base = ForecastBase(rows, dt, weather_condition)
+    levels = base.levels(horizons)
+    peaks = base.peaks(horizons)
+    
+    forecast = {}
+    for i, row in enumerate(rows.tolist()):
+        forecast[ZONE_MODEL.ids[row]] = {
+            "name": ZONE_MODEL.names[row],
+            "levels": levels[i].tolist(),
+            "avg_speed_kmh": (50 * (1 - levels[i])).astype(int).tolist(),
+            "is_peak": peaks[i].tolist(),
+        }
+    
+    return {
+        "timestamp": dt.isoformat(),
+        "horizons_minutes": horizons,
+        "zones": forecast,
+    }
+
+
+def predict_future_traffic(base: ForecastBase, minutes: int) -> Dict[str, str]:
     """
-    Predice cómo evolucionará el tráfico en 30-60 min.
+    Predice cómo evolucionará el tráfico en 30-60 min respecto a la hora de partida de base.
     """
-    future_hour = future_time.hour
+    peaks = base.peaks([0, minutes])
     predictions = {}
     
-    for zone_id, data in current_zones.items():
-        zone_info = MEDELLIN_ZONES[zone_id]
+    for row, (is_currently_peak, will_be_peak) in zip(base.rows.tolist(), peaks.tolist()):
+        zone_id = ZONE_MODEL.ids[row]
         
         # Verificar si entrará o saldrá de hora pico
-        is_currently_peak = any(start <= datetime.now().hour < end for start, end in zone_info["peak_hours"])
-        will_be_peak = any(start <= future_hour < end for start, end in zone_info["peak_hours"])
-        
         if not is_currently_peak and will_be_peak:
             predictions[zone_id] = "Aumentará congestión (entrando a hora pico)"
         elif is_currently_peak and not will_be_peak:
@@ -228,28 +436,18 @@ def predict_future_traffic(
     return predictions
 
 
-def get_traffic_events(zone: Optional[str] = None) -> List[Dict[str, Any]]:
+def get_traffic_events(zone: Optional[str] = None, at_time: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Obtiene eventos que afectan el tráfico (accidentes, obras, eventos masivos).
     
     Args:
         zone: Filtrar por zona específica
+        at_time: Hora de consulta (ISO format), None para ahora
     
     Returns:
         Lista de eventos activos
     """
-    current_time = datetime.now()
-    
-    # Filtrar eventos activos
-    active_events = []
-    for event in TRAFFIC_EVENTS_MOCK:
-        start = datetime.fromisoformat(event["start_time"])
-        end = datetime.fromisoformat(event["estimated_end"])
-        
-        if start <= current_time <= end:
-            active_events.append(event)
-    
-    return active_events
+    return TRAFFIC_EVENTS.active(at_time or datetime.now(), zone)
 
 
 def get_historical_patterns(zone: str, day_of_week: int, hour: int) -> Dict[str, Any]:
@@ -264,18 +462,18 @@ def get_historical_patterns(zone: str, day_of_week: int, hour: int) -> Dict[str,
     Returns:
         Datos históricos de la zona
     """
-    if zone not in MEDELLIN_ZONES:
+    if zone not in ZONE_MODEL.position:
         return {"error": f"Zona {zone} no encontrada"}
     
-    zone_data = MEDELLIN_ZONES[zone]
-    is_peak = any(start <= hour < end for start, end in zone_data["peak_hours"])
+    row = ZONE_MODEL.position[zone]
+    is_peak = bool(ZONE_MODEL.peak[row, (day_of_week * 24 + hour) % HOURS_PER_WEEK])
     
     return {
-        "zone": zone_data["name"],
+        "zone": ZONE_MODEL.names[row],
         "day_of_week": day_of_week,
         "hour": hour,
         "is_typical_peak_hour": is_peak,
-        "average_congestion": zone_data["base_congestion"] * (zone_data["peak_multiplier"] if is_peak else 1.0),
+        "average_congestion": float(ZONE_MODEL.base[row] * (ZONE_MODEL.peak_multiplier[row] if is_peak else 1.0)),
         "historical_note": "Basado en patrones de tráfico típicos de Medellín",
     }
 
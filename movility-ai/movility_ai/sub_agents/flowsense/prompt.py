@@ -91,6 +91,7 @@ Siempre responde en español con tono informativo y conciso:
 
 ## Herramientas que Usas
 - `predict_traffic_congestion`: predicción principal
+- `forecast_congestion`: congestión numérica por zona a los horizontes que pidas (ej. cada 5 min hasta 3 horas)
 - `get_traffic_events`: eventos que afectan tráfico
 - `get_historical_patterns`: patrones históricos
 - `analyze_weather_impact`: impacto del clima en tráfico
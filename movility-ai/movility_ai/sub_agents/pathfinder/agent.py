@@ -18,6 +18,8 @@ from google.adk.agents import Agent
 from movility_ai.sub_agents.pathfinder import prompt
 from movility_ai.sub_agents.pathfinder import tools
 
+# Datos precalculados abiertos al iniciar, no en la primera consulta
+tools.preload_routing_data()
 
 pathfinder_agent = Agent(
     model="gemini-2.0-flash-exp",
@@ -28,6 +30,17 @@ pathfinder_agent = Agent(
         tools.get_route_google_maps,
         tools.get_weather_conditions,
         tools.get_encicla_stations,
+        tools.get_nearest_encicla_stations,
+        tools.get_zone_travel_time,
+        tools.geocode_place,
+        tools.compute_isochrone,
+        tools.find_best_departure_times,
         tools.calculate_multimodal_route,
+        tools.start_trip_session,
+        tools.get_trip_session,
+        tools.end_trip_session,
+        tools.report_traffic_incident,
+        tools.clear_traffic_incident,
+        tools.sync_traffic_incidents,
     ],
 )
@@ -0,0 +1,308 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Jerarquías de contracción (CH) para consultas punto a punto en la red vial"""
+
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+INF = float("inf")
+
+# Nodos que puede asentar la búsqueda de testigos antes de rendirse (en ese
+# caso se agrega el atajo: más atajos, pero nunca un camino incorrecto)
+WITNESS_SETTLE_LIMIT = 60
+
+# Arreglos que definen una jerarquía ya preprocesada
+CH_ARRAYS = (
+    "rank",
+    "up_first", "up_head", "up_weight", "up_mid",
+    "down_first", "down_head", "down_weight", "down_mid",
+)
+
+
+def _witness_distances(
+    out_edges: List[Dict[int, Tuple[float, int]]],
+    source: int,
+    excluded: int,
+    max_cost: float,
+) -> Dict[int, float]:
+    """Dijkstra local desde source sin pasar por excluded, acotado en costo y nodos asentados."""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(heap)
+        if d > dist.get(u, INF) or d > max_cost:
+            continue
+        settled += 1
+        for v, (w, _) in out_edges[u].items():
+            if v == excluded:
+                continue
+            nd = d + w
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _to_csr(adjacency: List[Dict[int, Tuple[float, int]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    first = np.zeros(len(adjacency) + 1, dtype=np.int32)
+    heads: List[int] = []
+    weights: List[float] = []
+    mids: List[int] = []
+    for v, edges in enumerate(adjacency):
+        for head, (weight, mid) in sorted(edges.items()):
+            heads.append(head)
+            weights.append(weight)
+            mids.append(mid)
+        first[v + 1] = len(heads)
+    return (
+        first,
+        np.array(heads, dtype=np.int32),
+        np.array(weights, dtype=np.float32),
+        np.array(mids, dtype=np.int32),
+    )
+
+
+class ContractionHierarchy:
+    """
+    Jerarquía de contracción sobre un grafo dirigido con pesos no negativos.
+
+    El preprocesamiento contrae los nodos de menor a mayor importancia
+    (diferencia de aristas + vecinos contraídos) y agrega atajos sólo cuando
+    no hay un camino testigo igual o más corto. El resultado se guarda en
+    arreglos CSR compactos: el grafo hacia arriba (para la búsqueda desde el
+    origen) y el grafo hacia abajo invertido (para la búsqueda desde el
+    destino). Cada arista guarda el nodo intermedio del atajo (-1 si es
+    original) para reconstruir el camino.
+
+    Una consulta es un Dijkstra bidireccional que sólo sube de rango, por lo
+    que visita unas pocas decenas de nodos.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        for name in CH_ARRAYS:
+            setattr(self, name, arrays[name])
+        self.num_nodes = len(self.rank)
+        # Nodo intermedio de cada arista (original o atajo) para desempaquetar caminos
+        self._mid: Dict[Tuple[int, int], int] = {}
+        for v in range(self.num_nodes):
+            for e in range(self.up_first[v], self.up_first[v + 1]):
+                self._mid[(v, int(self.up_head[e]))] = int(self.up_mid[e])
+            for e in range(self.down_first[v], self.down_first[v + 1]):
+                self._mid[(int(self.down_head[e]), v)] = int(self.down_mid[e])
+        # Listas de Python para el recorrido (más rápidas que indexar numpy elemento a elemento)
+        self._up = self._adjacency(self.up_first, self.up_head, self.up_weight)
+        self._down = self._adjacency(self.down_first, self.down_head, self.down_weight)
+        # Nodos de mayor a menor rango, para el barrido de distances_to
+        self._by_rank_desc = np.argsort(-self.rank, kind="stable").tolist()
+
+    @staticmethod
+    def _adjacency(first: np.ndarray, head: np.ndarray, weight: np.ndarray) -> List[List[Tuple[int, float]]]:
+        heads, weights = head.tolist(), weight.tolist()
+        return [
+            list(zip(heads[first[v]:first[v + 1]], weights[first[v]:first[v + 1]]))
+            for v in range(len(first) - 1)
+        ]
+
+    @classmethod
+    def build(
+        cls,
+        num_nodes: int,
+        tails: Sequence[int],
+        heads: Sequence[int],
+        weights: Sequence[float],
+    ) -> "ContractionHierarchy":
+        """
+        Preprocesa la jerarquía (paso offline).
+
+        Args:
+            num_nodes: Número de nodos
+            tails: Nodo de salida de cada arista
+            heads: Nodo de llegada de cada arista
+            weights: Costo de cada arista (no negativo)
+
+        Returns:
+            Jerarquía lista para consultar o guardar
+        """
+        out_edges: List[Dict[int, Tuple[float, int]]] = [dict() for _ in range(num_nodes)]
+        in_edges: List[Dict[int, Tuple[float, int]]] = [dict() for _ in range(num_nodes)]
+        for u, v, w in zip(tails, heads, weights):
+            u, v, w = int(u), int(v), float(w)
+            if u == v:
+                continue
+            if w < out_edges[u].get(v, (INF, -1))[0]:
+                out_edges[u][v] = (w, -1)
+                in_edges[v][u] = (w, -1)
+
+        contracted = [False] * num_nodes
+        deleted_neighbors = [0] * num_nodes
+
+        def shortcuts_for(v: int) -> List[Tuple[int, int, float]]:
+            shortcuts = []
+            for u, (w_in, _) in in_edges[v].items():
+                targets = {x: w_in + w_out for x, (w_out, _) in out_edges[v].items() if x != u}
+                if not targets:
+                    continue
+                witness = _witness_distances(out_edges, u, v, max(targets.values()))
+                for x, via in targets.items():
+                    if witness.get(x, INF) > via:
+                        shortcuts.append((u, x, via))
+            return shortcuts
+
+        def priority(v: int) -> int:
+            removed = len(in_edges[v]) + len(out_edges[v])
+            return len(shortcuts_for(v)) - removed + deleted_neighbors[v]
+
+        heap = [(priority(v), v) for v in range(num_nodes)]
+        heapq.heapify(heap)
+        rank = np.zeros(num_nodes, dtype=np.int32)
+        up: List[Dict[int, Tuple[float, int]]] = [dict() for _ in range(num_nodes)]
+        down: List[Dict[int, Tuple[float, int]]] = [dict() for _ in range(num_nodes)]
+        order = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+            # Actualización perezosa: si la prioridad empeoró, se reencola
+            new_priority = priority(v)
+            if heap and new_priority > heap[0][0]:
+                heapq.heappush(heap, (new_priority, v))
+                continue
+
+            shortcuts = shortcuts_for(v)
+            rank[v] = order
+            order += 1
+            contracted[v] = True
+            up[v] = dict(out_edges[v])
+            down[v] = dict(in_edges[v])
+            for x in out_edges[v]:
+                del in_edges[x][v]
+                deleted_neighbors[x] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                deleted_neighbors[u] += 1
+            out_edges[v].clear()
+            in_edges[v].clear()
+            for u, x, via in shortcuts:
+                if via < out_edges[u].get(x, (INF, -1))[0]:
+                    out_edges[u][x] = (via, v)
+                    in_edges[x][u] = (via, v)
+
+        arrays: Dict[str, np.ndarray] = {"rank": rank}
+        arrays["up_first"], arrays["up_head"], arrays["up_weight"], arrays["up_mid"] = _to_csr(up)
+        arrays["down_first"], arrays["down_head"], arrays["down_weight"], arrays["down_mid"] = _to_csr(down)
+        return cls(arrays)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Arreglos de la jerarquía, para guardarlos con np.savez."""
+        return {name: getattr(self, name) for name in CH_ARRAYS}
+
+    def _unpack(self, u: int, v: int, path: List[int]) -> None:
+        mid = self._mid[(u, v)]
+        if mid < 0:
+            path.append(v)
+            return
+        self._unpack(u, mid, path)
+        self._unpack(mid, v, path)
+
+    def distances_to(self, target: int) -> List[float]:
+        """
+        Costo mínimo desde cada nodo hasta target (uno-a-todos invertido, tipo PHAST).
+
+        Una búsqueda hacia arriba desde target por el grafo hacia abajo da la
+        parte final (bajando) de cada camino; después un barrido de mayor a
+        menor rango por las aristas hacia arriba completa el tramo inicial
+        (subiendo) de cada nodo. Cuesta una búsqueda de la jerarquía más un
+        recorrido lineal de los nodos.
+
+        Returns:
+            Lista indexada por nodo (inf si el nodo no llega a target)
+        """
+        dist = [INF] * self.num_nodes
+        dist[target] = 0.0
+        heap = [(0.0, target)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, w in self._down[u]:
+                if d + w < dist[v]:
+                    dist[v] = d + w
+                    heapq.heappush(heap, (d + w, v))
+        for v in self._by_rank_desc:
+            best = dist[v]
+            for x, w in self._up[v]:
+                if w + dist[x] < best:
+                    best = w + dist[x]
+            dist[v] = best
+        return dist
+
+    def query(self, source: int, target: int) -> Tuple[float, Optional[List[int]]]:
+        """
+        Camino mínimo entre dos nodos.
+
+        Returns:
+            (costo, nodos del camino en el grafo original) o (inf, None) si no hay camino
+        """
+        if source == target:
+            return 0.0, [source]
+        dists = ({source: 0.0}, {target: 0.0})
+        parents: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        graphs = (self._up, self._down)
+        best, meeting = INF, -1
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                d, u = heapq.heappop(heap)
+                if d >= best:
+                    heap.clear()  # Esta dirección ya no puede mejorar el camino
+                    continue
+                dist = dists[side]
+                if d > dist[u]:
+                    continue
+                other = dists[1 - side].get(u)
+                if other is not None and d + other < best:
+                    best, meeting = d + other, u
+                for v, w in graphs[side][u]:
+                    nd = d + w
+                    if nd < dist.get(v, INF):
+                        dist[v] = nd
+                        parents[side][v] = u
+                        heapq.heappush(heap, (nd, v))
+
+        if meeting < 0:
+            return INF, None
+
+        # Camino en la jerarquía: origen -> encuentro (subiendo) -> destino (bajando)
+        upward = [meeting]
+        while upward[-1] != source:
+            upward.append(parents[0][upward[-1]])
+        upward.reverse()
+        downward = [meeting]
+        while downward[-1] != target:
+            downward.append(parents[1][downward[-1]])
+        hierarchy_path = upward + downward[1:]
+
+        path = [source]
+        for u, v in zip(hierarchy_path, hierarchy_path[1:]):
+            self._unpack(u, v, path)
+        return best, path
@@ -0,0 +1,161 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Modelo digital de elevación (DEM) del Valle de Aburrá mapeado en memoria"""
+
+import math
+import os
+import tempfile
+from typing import Optional, Tuple
+
+import numpy as np
+
+from movility_ai.shared_libraries.cache import cache_dir
+
+# Caja que cubre el raster: (lat mínima, lat máxima, lon mínima, lon máxima).
+# La fila 0 es el borde sur y la columna 0 el borde occidental.
+DEM_BOUNDS = (6.05, 6.40, -75.70, -75.45)
+
+# Resolución del raster generado (grados, ~100 m)
+DEM_CELL_DEG = 0.0009
+
+# Distancia entre muestras al recorrer una arista (km)
+SAMPLE_STEP_KM = 0.05
+
+# Perfil aproximado del valle para generar el raster si no hay uno real: el
+# río Medellín (lat, lon de sur a norte) baja hacia el norte, el fondo del
+# valle es plano cerca del río y las laderas suben hacia oriente y occidente
+RIVER_POLYLINE = [
+    (6.050, -75.640), (6.091, -75.636), (6.1525, -75.629), (6.156, -75.619),
+    (6.163, -75.607), (6.175, -75.595), (6.1935, -75.585), (6.220, -75.581),
+    (6.238, -75.581), (6.249, -75.579), (6.269, -75.569), (6.280, -75.568),
+    (6.300, -75.561), (6.315, -75.558), (6.3375, -75.548), (6.400, -75.530),
+]
+FLOOR_M_AT_REF, FLOOR_LAT_REF, FLOOR_M_PER_DEG_SOUTH = 1490.0, 6.212, 1250.0
+FLOOR_HALF_WIDTH_KM = 0.8
+SLOPE_RISE_M, SLOPE_SCALE_KM = 1000.0, 5.0
+
+KM_PER_DEG = 111.2
+
+
+def default_dem_path() -> str:
+    """Ruta del raster .npy (DEM_PATH o la caché del usuario)."""
+    return os.getenv("DEM_PATH") or os.path.join(cache_dir(), "aburra_dem.npy")
+
+
+def synthetic_aburra_dem(cell_deg: float = DEM_CELL_DEG) -> np.ndarray:
+    """
+    Raster de elevaciones (m) aproximado del Valle de Aburrá.
+
+    Sirve mientras no se exporte un DEM real (p. ej. SRTM recortado a
+    DEM_BOUNDS) al mismo formato .npy.
+    """
+    lat_min, lat_max, lon_min, lon_max = DEM_BOUNDS
+    lats = np.arange(lat_min, lat_max + cell_deg / 2, cell_deg)
+    lons = np.arange(lon_min, lon_max + cell_deg / 2, cell_deg)
+    lat, lon = np.meshgrid(lats, lons, indexing="ij")
+    river_lats, river_lons = zip(*RIVER_POLYLINE)
+    river_lon = np.interp(lat, river_lats, river_lons)
+    floor = FLOOR_M_AT_REF + (FLOOR_LAT_REF - lat) * FLOOR_M_PER_DEG_SOUTH
+    distance_km = np.abs(lon - river_lon) * KM_PER_DEG * math.cos(math.radians(FLOOR_LAT_REF))
+    slope_km = np.maximum(distance_km - FLOOR_HALF_WIDTH_KM, 0.0)
+    return (floor + SLOPE_RISE_M * (1.0 - np.exp(-slope_km / SLOPE_SCALE_KM))).astype(np.float32)
+
+
+def _save_atomic(path: str, grid: np.ndarray) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.save(handle, grid)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ElevationRaster:
+    """
+    Raster de elevaciones sobre DEM_BOUNDS con interpolación bilineal.
+
+    El archivo se abre con mmap: sólo se leen del disco las celdas que se
+    muestrean, así que un DEM de alta resolución no ocupa memoria.
+    """
+
+    def __init__(self, grid: np.ndarray):
+        self.grid = grid
+        lat_min, lat_max, lon_min, lon_max = DEM_BOUNDS
+        rows, cols = grid.shape
+        self._lat_min, self._lon_min = lat_min, lon_min
+        self._row_per_deg = (rows - 1) / (lat_max - lat_min)
+        self._col_per_deg = (cols - 1) / (lon_max - lon_min)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "ElevationRaster":
+        """
+        Abre el raster mapeado en memoria; si no existe genera el aproximado.
+
+        Si el archivo no se puede escribir se usa el raster en memoria.
+        """
+        path = path or default_dem_path()
+        if os.path.exists(path):
+            try:
+                grid = np.load(path, mmap_mode="r")
+                if grid.ndim == 2:
+                    return cls(grid)
+            except (OSError, ValueError):
+                pass
+        grid = synthetic_aburra_dem()
+        try:
+            _save_atomic(path, grid)
+            return cls(np.load(path, mmap_mode="r"))
+        except OSError:
+            return cls(grid)
+
+    def sample(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Elevación (m) en cada punto; fuera de la caja se usa el borde."""
+        rows, cols = self.grid.shape
+        r = np.clip((np.asarray(lats) - self._lat_min) * self._row_per_deg, 0, rows - 1.000001)
+        c = np.clip((np.asarray(lons) - self._lon_min) * self._col_per_deg, 0, cols - 1.000001)
+        r0, c0 = r.astype(int), c.astype(int)
+        fr, fc = r - r0, c - c0
+        top = self.grid[r0, c0] * (1 - fc) + self.grid[r0, c0 + 1] * fc
+        bottom = self.grid[r0 + 1, c0] * (1 - fc) + self.grid[r0 + 1, c0 + 1] * fc
+        return top * (1 - fr) + bottom * fr
+
+    def climb(
+        self,
+        lat_a: np.ndarray,
+        lon_a: np.ndarray,
+        lat_b: np.ndarray,
+        lon_b: np.ndarray,
+        km: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Metros de subida y de bajada acumulados a lo largo de cada segmento.
+
+        Cada segmento se muestrea cada SAMPLE_STEP_KM, así un tramo que sube
+        y baja no se cuenta como plano.
+
+        Returns:
+            (subida, bajada) en metros por segmento
+        """
+        samples = max(2, int(math.ceil(float(np.max(km, initial=0.0)) / SAMPLE_STEP_KM)) + 1)
+        t = np.linspace(0.0, 1.0, samples)[None, :]
+        lats = np.asarray(lat_a)[:, None] + (np.asarray(lat_b) - np.asarray(lat_a))[:, None] * t
+        lons = np.asarray(lon_a)[:, None] + (np.asarray(lon_b) - np.asarray(lon_a))[:, None] * t
+        rise = np.diff(self.sample(lats, lons), axis=1)
+        return np.clip(rise, 0, None).sum(axis=1), np.clip(-rise, 0, None).sum(axis=1)
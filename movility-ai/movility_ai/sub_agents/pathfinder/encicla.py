@@ -0,0 +1,111 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Historial acotado y pronóstico de disponibilidad de las estaciones EnCicla"""
+
+import math
+import threading
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder.zone_matrix import HOURS_PER_WEEK, hour_of_week
+
+# Muestras que guarda cada estación (24 h con una muestra cada 5 minutos)
+RING_CAPACITY = 288
+
+# Peso de cada muestra nueva en el promedio estacional de su hora de la semana
+SEASONAL_ALPHA = 0.2
+
+# Horas en que la desviación actual respecto al patrón se reduce a 1/e
+DEVIATION_DECAY_HOURS = 1.0
+
+
+class AvailabilityHistory:
+    """
+    Disponibilidad de bicicletas y anclajes por estación en memoria fija.
+
+    Cada estación tiene un búfer circular con las últimas RING_CAPACITY
+    muestras y, por hora de la semana, un promedio móvil exponencial (EWMA
+    estacional). La memoria no crece con el historial: las muestras viejas
+    se sobrescriben y el patrón semanal ocupa 168 valores por estación.
+
+    El pronóstico a una hora T parte del patrón de la hora de T y le suma
+    la desviación de la última muestra frente al patrón de su hora, que se
+    desvanece con el horizonte. Sin patrón se repite la última muestra.
+    """
+
+    def __init__(self, capacities: np.ndarray, ring_capacity: int = RING_CAPACITY):
+        self.capacities = np.asarray(capacities, dtype=np.float32)
+        stations = len(self.capacities)
+        self.ring_capacity = ring_capacity
+        self._times = np.zeros((stations, ring_capacity), dtype=np.float64)
+        self._bikes = np.zeros((stations, ring_capacity), dtype=np.int16)
+        self._docks = np.zeros((stations, ring_capacity), dtype=np.int16)
+        self._head = np.zeros(stations, dtype=np.int64)
+        self._count = np.zeros(stations, dtype=np.int64)
+        # Patrón semanal: (estación, hora de la semana, [bicis, anclajes])
+        self._seasonal = np.full((stations, HOURS_PER_WEEK, 2), np.nan, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def record(self, station: int, when: datetime, bikes: int, docks: int) -> None:
+        """Agrega una muestra de disponibilidad de una estación."""
+        slot = hour_of_week(when)
+        with self._lock:
+            head = self._head[station]
+            self._times[station, head] = when.timestamp()
+            self._bikes[station, head] = bikes
+            self._docks[station, head] = docks
+            self._head[station] = (head + 1) % self.ring_capacity
+            self._count[station] = min(self._count[station] + 1, self.ring_capacity)
+
+            seasonal = self._seasonal[station, slot]
+            observed = np.array([bikes, docks], dtype=np.float32)
+            if np.isnan(seasonal[0]):
+                seasonal[:] = observed
+            else:
+                seasonal += SEASONAL_ALPHA * (observed - seasonal)
+
+    def samples(self, station: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Muestras guardadas de una estación en orden cronológico (epoch, bicis, anclajes)."""
+        with self._lock:
+            count, head = self._count[station], self._head[station]
+            order = (np.arange(head - count, head)) % self.ring_capacity
+            return self._times[station, order], self._bikes[station, order], self._docks[station, order]
+
+    def forecast(self, station: int, when: datetime) -> Tuple[float, float]:
+        """
+        Bicicletas y anclajes esperados en una estación a cierta hora.
+
+        Returns:
+            (bicis, anclajes) acotados a la capacidad; (nan, nan) sin muestras
+        """
+        with self._lock:
+            if not self._count[station]:
+                return math.nan, math.nan
+            last = (self._head[station] - 1) % self.ring_capacity
+            last_time = self._times[station, last]
+            latest = np.array([self._bikes[station, last], self._docks[station, last]], dtype=np.float32)
+            then = self._seasonal[station, hour_of_week(datetime.fromtimestamp(last_time))].copy()
+            target = self._seasonal[station, hour_of_week(when)].copy()
+
+        # Sin patrón para alguna de las dos horas se asume que nada cambia
+        if np.isnan(then[0]) or np.isnan(target[0]):
+            expected = latest
+        else:
+            hours = max(when.timestamp() - last_time, 0.0) / 3600.0
+            expected = target + (latest - then) * math.exp(-hours / DEVIATION_DECAY_HOURS)
+        expected = np.clip(expected, 0.0, self.capacities[station])
+        return float(expected[0]), float(expected[1])
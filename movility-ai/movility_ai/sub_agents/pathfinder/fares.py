@@ -0,0 +1,139 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Motor de tarifas del transporte público con integraciones y transbordos Cívica"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Tarifa por servicio (COP): con tarjeta Cívica y en efectivo (tiquete sencillo)
+FARE_PRODUCTS = {
+    "metro": {"civica": 3050, "cash": 3550},
+    "metrocable": {"civica": 3050, "cash": 3550},
+    "tranvia": {"civica": 3050, "cash": 3550},
+    "metroplus": {"civica": 3050, "cash": 3550},
+    "alimentador": {"civica": 2900, "cash": 3100},
+    "bus": {"civica": 2900, "cash": 3100},
+}
+PAYMENTS = ("civica", "cash")
+
+# Sistema integrado: entre estos servicios se transborda dentro de las
+# estaciones sin volver a pagar, con cualquier medio de pago
+INTEGRATED_SERVICES = ("metro", "metrocable", "tranvia", "metroplus")
+
+# Integración alimentador <-> sistema integrado con Cívica: el viaje completo
+# cuesta la tarifa del sistema más este valor
+FEEDER_INTEGRATION_COP = 650
+
+# Minutos entre bajarse y volver a validar la Cívica para que aplique la integración
+CIVICA_TRANSFER_WINDOW_MIN = 60
+
+
+class FareEngine:
+    """
+    Tarifas de itinerarios completos a partir de reglas compiladas en una tabla.
+
+    Las reglas (tarifas por servicio, sistema integrado, descuento de
+    alimentadores y ventana de transbordo Cívica) se compilan una vez en
+    dos arreglos:
+
+    - board[pago, servicio]: lo que cuesta el primer tramo pagado
+    - transfer[pago, anterior, siguiente, en_ventana]: lo que se paga al
+      subir a un tramo según el anterior y si el transbordo cae en la ventana
+
+    Así la tarifa de un itinerario es board más la suma de transfer sobre
+    sus pares de tramos consecutivos, y muchos itinerarios se cotizan en una
+    sola pasada con indexado de numpy. Los tramos a pie, en bici o de
+    espera no se pagan ni interrumpen la integración.
+    """
+
+    def __init__(
+        self,
+        products: Optional[Dict[str, Dict[str, int]]] = None,
+        integrated: Sequence[str] = INTEGRATED_SERVICES,
+        feeder_integration_cop: int = FEEDER_INTEGRATION_COP,
+        transfer_window_min: float = CIVICA_TRANSFER_WINDOW_MIN,
+    ):
+        products = products or FARE_PRODUCTS
+        self.services: List[str] = list(products)
+        self.index = {service: i for i, service in enumerate(self.services)}
+        self.transfer_window_min = transfer_window_min
+        # Índice extra para rellenar itinerarios cortos: no cuesta nada
+        self._pad = len(self.services)
+        n = self._pad + 1
+
+        self.board = np.zeros((len(PAYMENTS), n), dtype=np.int32)
+        self.transfer = np.zeros((len(PAYMENTS), n, n, 2), dtype=np.int32)
+        for p, payment in enumerate(PAYMENTS):
+            for service, fares in products.items():
+                self.board[p, self.index[service]] = fares[payment]
+            for prev in self.services:
+                for nxt in self.services:
+                    i, j = self.index[prev], self.index[nxt]
+                    full = products[nxt][payment]
+                    self.transfer[p, i, j, :] = full
+                    if prev in integrated and nxt in integrated:
+                        # Transbordo dentro del sistema: no se sale de la zona paga
+                        self.transfer[p, i, j, :] = 0
+                    elif payment == "civica" and "alimentador" in (prev, nxt) and (
+                        prev in integrated or nxt in integrated
+                    ):
+                        # Se completa la tarifa integrada: sistema + alimentador
+                        rail = products[nxt if nxt in integrated else prev][payment]
+                        combined = rail + feeder_integration_cop
+                        self.transfer[p, i, j, 1] = max(combined - products[prev][payment], 0)
+
+    def fare(self, legs: List[Dict[str, Any]], payment: str = "civica") -> int:
+        """Tarifa de un itinerario (ver price)."""
+        return int(self.price([legs], payment)[0])
+
+    def price(self, itineraries: List[List[Dict[str, Any]]], payment: str = "civica") -> np.ndarray:
+        """
+        Tarifa de muchos itinerarios en una sola pasada vectorizada.
+
+        Args:
+            itineraries: Cada itinerario es una lista de tramos con service
+                (ver FARE_PRODUCTS) y, si se conocen, board y alight en
+                minutos; sin horas se asume que el transbordo cae en la ventana
+            payment: "civica" o "cash"
+
+        Returns:
+            Arreglo con la tarifa (COP) de cada itinerario
+
+        Raises:
+            ValueError: Si el medio de pago no existe
+        """
+        if payment not in PAYMENTS:
+            raise ValueError(f"Medio de pago desconocido: {payment}")
+        paid = [[leg for leg in legs if leg.get("service") in self.index] for legs in itineraries]
+        width = max((len(legs) for legs in paid), default=0)
+        if width == 0:
+            return np.zeros(len(itineraries), dtype=np.int64)
+
+        codes = np.full((len(paid), width), self._pad, dtype=np.int64)
+        board = np.zeros((len(paid), width))
+        alight = np.zeros((len(paid), width))
+        for row, legs in enumerate(paid):
+            for col, leg in enumerate(legs):
+                codes[row, col] = self.index[leg["service"]]
+                board[row, col] = leg.get("board", 0.0)
+                alight[row, col] = leg.get("alight", 0.0)
+
+        p = PAYMENTS.index(payment)
+        total = self.board[p, codes[:, 0]].astype(np.int64)
+        if width > 1:
+            within = (board[:, 1:] - alight[:, :-1]) <= self.transfer_window_min
+            total += self.transfer[p, codes[:, :-1], codes[:, 1:], within.astype(np.int64)].sum(axis=1)
+        return total
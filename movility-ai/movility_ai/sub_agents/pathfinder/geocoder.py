@@ -0,0 +1,261 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Geocodificación local: nomenclátor de Medellín con índice de prefijos y trigramas"""
+
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from movility_ai.shared_libraries.cache import cache_dir
+from movility_ai.sub_agents.pathfinder.transit_network import normalize_station_name
+
+GAZETTEER_VERSION = 1
+
+# Similitud mínima de trigramas (Jaccard) para aceptar una coincidencia difusa
+TRIGRAM_THRESHOLD = 0.4
+
+# Máximo de direcciones resueltas en el caché; se descartan las menos usadas
+MAX_CACHE_ENTRIES = 10000
+
+# Resoluciones nuevas que se acumulan antes de reescribir el caché en disco
+CACHE_FLUSH_EVERY = 64
+
+# Ante empates se prefiere el lugar de la clase más general
+KIND_PRIORITY = {"zone": 0, "metro": 1, "landmark": 2, "encicla": 3}
+
+# Resolución externa opcional: consulta -> lugar (name, lat, lon) o None
+RemoteGeocoder = Callable[[str], Optional[Dict[str, Any]]]
+
+
+def normalize_place(text: str) -> str:
+    """Normaliza un lugar: sin tildes, minúsculas, sin puntuación ni prefijo 'estación'."""
+    cleaned = "".join(c if c.isalnum() else " " for c in (text or ""))
+    return normalize_station_name(cleaned)
+
+
+def trigrams(text: str) -> List[str]:
+    """Trigramas del texto con relleno, para comparar palabras incompletas o con errores."""
+    padded = f"  {text} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def default_cache_path() -> str:
+    """Ruta del caché de direcciones (GEOCODE_CACHE_PATH o la caché del usuario)."""
+    return os.getenv("GEOCODE_CACHE_PATH") or os.path.join(cache_dir(), "geocode_cache.json")
+
+
+class Gazetteer:
+    """
+    Nomenclátor de zonas, estaciones y sitios de interés.
+
+    Las coincidencias exactas y las ya resueltas son una consulta a un
+    diccionario; los prefijos usan búsqueda binaria sobre una lista ordenada
+    de nombres (y de cada palabra del nombre) y los errores de escritura un
+    índice invertido de trigramas. Las resoluciones difusas o externas se
+    guardan en un caché LRU acotado que se escribe a un JSON en disco cada
+    CACHE_FLUSH_EVERY resoluciones nuevas y al terminar el proceso, así
+    sobrevive entre reinicios sin reescribir el archivo en cada consulta.
+    """
+
+    def __init__(self, places: List[Dict[str, Any]], cache_path: Optional[str] = None):
+        """
+        Args:
+            places: Lugares con name, lat, lon, kind y aliases opcionales
+            cache_path: Archivo del caché de direcciones; None no guarda en disco
+        """
+        self.places = sorted(places, key=lambda p: KIND_PRIORITY.get(p.get("kind"), len(KIND_PRIORITY)))
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+
+        self._exact: Dict[str, int] = {}
+        prefix_keys = []
+        self._trigrams: Dict[str, List[Tuple[int, int]]] = {}
+        self._names: List[str] = []
+        for i, place in enumerate(self.places):
+            for name in [place["name"], *place.get("aliases", [])]:
+                key = normalize_place(name)
+                if not key:
+                    continue
+                self._exact.setdefault(key, i)
+                tokens = key.split(" ")
+                for t in range(len(tokens)):
+                    prefix_keys.append((" ".join(tokens[t:]), len(key), i))
+                name_id = len(self._names)
+                self._names.append(key)
+                for gram in trigrams(key):
+                    self._trigrams.setdefault(gram, []).append((name_id, i))
+        prefix_keys.sort()
+        self._prefix_keys = [k for k, _, _ in prefix_keys]
+        self._prefix_entries = [(length, i) for _, length, i in prefix_keys]
+        self._gram_counts = [len(trigrams(name)) for name in self._names]
+
+        fingerprint = "|".join(f"{p['name']}:{p['lat']}:{p['lon']}" for p in self.places)
+        self.fingerprint = hashlib.sha1(f"{GAZETTEER_VERSION}|{fingerprint}".encode("utf-8")).hexdigest()
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict(self._load_cache())
+        while len(self._cache) > MAX_CACHE_ENTRIES:
+            self._cache.popitem(last=False)
+        self._unsaved = 0
+        if self.cache_path:
+            atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if data.get("fingerprint") != self.fingerprint:
+            return {}  # El nomenclátor cambió: las resoluciones guardadas ya no valen
+        return data.get("entries", {})
+
+    def flush(self) -> None:
+        """Escribe en disco las resoluciones que aún no se han guardado."""
+        with self._lock:
+            if self._unsaved:
+                self._save_cache()
+
+    def _save_cache(self) -> None:
+        # Llamar con el lock tomado
+        self._unsaved = 0
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"fingerprint": self.fingerprint, "entries": self._cache}, handle, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # El caché en disco es opcional
+
+    def _result(self, index: int, match: str, score: float) -> Dict[str, Any]:
+        place = self.places[index]
+        return {
+            "name": place["name"],
+            "lat": place["lat"],
+            "lon": place["lon"],
+            "kind": place.get("kind"),
+            "match": match,
+            "score": round(score, 3),
+        }
+
+    def _prefix_match(self, key: str) -> Optional[int]:
+        start = bisect.bisect_left(self._prefix_keys, key)
+        best = None
+        for pos in range(start, len(self._prefix_keys)):
+            if not self._prefix_keys[pos].startswith(key):
+                break
+            # El nombre más corto es el más específico
+            candidate = self._prefix_entries[pos]
+            if best is None or candidate < best:
+                best = candidate
+        return best[1] if best else None
+
+    def _fuzzy_matches(self, key: str) -> List[Tuple[float, int]]:
+        grams = trigrams(key)
+        overlap: Dict[int, int] = {}
+        owner: Dict[int, int] = {}
+        for gram in grams:
+            for name_id, i in self._trigrams.get(gram, ()):
+                overlap[name_id] = overlap.get(name_id, 0) + 1
+                owner[name_id] = i
+        best: Dict[int, float] = {}
+        for name_id, shared in overlap.items():
+            score = shared / (len(grams) + self._gram_counts[name_id] - shared)
+            i = owner[name_id]
+            if score > best.get(i, 0.0):
+                best[i] = score
+        return sorted(((score, i) for i, score in best.items()), key=lambda s: (-s[0], s[1]))
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Candidatos para una consulta, del más al menos parecido.
+
+        Args:
+            query: Texto libre
+            limit: Máximo de resultados
+
+        Returns:
+            Lugares con su puntaje de similitud
+        """
+        key = normalize_place(query)
+        if not key:
+            return []
+        return [self._result(i, "fuzzy", score) for score, i in self._fuzzy_matches(key)[:limit]]
+
+    def resolve(self, query: str, remote: Optional[RemoteGeocoder] = None) -> Optional[Dict[str, Any]]:
+        """
+        Ubica un lugar escrito en texto libre.
+
+        Orden: nombre exacto, caché, prefijo, trigramas y por último
+        el geocodificador externo (si se da). Lo resuelto por prefijo,
+        trigramas o externamente se guarda en el caché.
+
+        Args:
+            query: Texto libre (p. ej. "Centro", "parque lleras", "Pobaldo")
+            remote: Geocodificador externo opcional para direcciones desconocidas
+
+        Returns:
+            Lugar con name, lat, lon, kind, match y score, o None si no se ubica
+        """
+        key = normalize_place(query)
+        if not key:
+            return None
+        index = self._exact.get(key)
+        if index is not None:
+            return self._result(index, "exact", 1.0)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            return {**cached, "match": "cache"}
+
+        result = None
+        index = self._prefix_match(key)
+        if index is not None:
+            result = self._result(index, "prefix", len(key) / len(normalize_place(self.places[index]["name"])))
+        else:
+            matches = self._fuzzy_matches(key)
+            if matches and matches[0][0] >= TRIGRAM_THRESHOLD:
+                result = self._result(matches[0][1], "fuzzy", matches[0][0])
+        if result is None and remote is not None:
+            place = remote(query)
+            if place is not None:
+                result = {**place, "kind": place.get("kind", "address"), "match": "remote", "score": 1.0}
+        if result is None:
+            return None
+
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if len(self._cache) > MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+            self._unsaved += 1
+            if self._unsaved >= CACHE_FLUSH_EVERY:
+                self._save_cache()
+        return result
@@ -0,0 +1,130 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Isócronas: todo lo alcanzable en N minutos a partir de un barrido acotado"""
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder.spatial import haversine_km
+
+# Radio de cada hexágono de la grilla (km, centro a vértice)
+HEX_CELL_KM = 0.5
+
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+
+
+def hex_grid(lat: float, lon: float, radius_km: float, cell_km: float = HEX_CELL_KM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Centros de una grilla hexagonal (vértice arriba) que cubre un círculo.
+
+    Args:
+        lat: Latitud del centro
+        lon: Longitud del centro
+        radius_km: Radio a cubrir
+        cell_km: Radio de cada hexágono
+
+    Returns:
+        (latitudes, longitudes) de los centros
+    """
+    rings = int(math.ceil(radius_km / (cell_km * math.sqrt(3)))) + 1
+    q, r = np.meshgrid(np.arange(-rings, rings + 1), np.arange(-rings, rings + 1))
+    q, r = q.ravel(), r.ravel()
+    inside = np.abs(q + r) <= rings
+    q, r = q[inside], r[inside]
+    x_km = cell_km * math.sqrt(3) * (q + r / 2.0)
+    y_km = cell_km * 1.5 * r
+    km_per_deg_lon = KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat))
+    return lat + y_km / KM_PER_DEG_LAT, lon + x_km / km_per_deg_lon
+
+
+def hexagon(lat: float, lon: float, cell_km: float = HEX_CELL_KM) -> List[List[float]]:
+    """Vértices [lat, lon] de un hexágono de la grilla."""
+    km_per_deg_lon = KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat))
+    vertices = []
+    for k in range(6):
+        angle = math.radians(60 * k + 30)
+        vertices.append([
+            round(lat + cell_km * math.sin(angle) / KM_PER_DEG_LAT, 6),
+            round(lon + cell_km * math.cos(angle) / km_per_deg_lon, 6),
+        ])
+    return vertices
+
+
+def convex_hull(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Envolvente convexa (cadena monótona de Andrew) en sentido antihorario."""
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o: Tuple[float, float], a: Tuple[float, float], b: Tuple[float, float]) -> float:
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower: List[Tuple[float, float]] = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper: List[Tuple[float, float]] = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def arrival_times(
+    seed_lat: np.ndarray,
+    seed_lon: np.ndarray,
+    seed_minutes: np.ndarray,
+    seed_speed_kmh: np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    detour: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Llegada más temprana a cada punto desde un conjunto de semillas.
+
+    Cada semilla es un lugar ya alcanzado (origen, estación, nodo vial) con su
+    minuto de llegada y la velocidad del último tramo (caminar, bici, calles
+    locales). Se evalúan todos los puntos contra todas las semillas con
+    broadcasting.
+
+    Returns:
+        (minutos de llegada a cada punto, índice de la semilla usada)
+    """
+    km = haversine_km(lats[:, None], lons[:, None], seed_lat[None, :], seed_lon[None, :]) * detour
+    minutes = seed_minutes[None, :] + km / seed_speed_kmh[None, :] * 60.0
+    best = minutes.argmin(axis=1)
+    return minutes[np.arange(len(lats)), best], best
+
+
+def reach_radius_km(
+    lat: float,
+    lon: float,
+    seed_lat: np.ndarray,
+    seed_lon: np.ndarray,
+    seed_minutes: np.ndarray,
+    seed_speed_kmh: np.ndarray,
+    budget: float,
+    detour: float,
+) -> float:
+    """Distancia máxima al origen que alguna semilla puede cubrir dentro del límite."""
+    remaining = np.maximum(budget - seed_minutes, 0.0)
+    return float(np.max(
+        haversine_km(lat, lon, seed_lat, seed_lon) + remaining * seed_speed_kmh / 60.0 / detour
+    ))
@@ -0,0 +1,183 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Búsqueda multicriterio (tiempo, costo, CO2) con frente de Pareto para PathFinder"""
+
+import heapq
+import itertools
+from typing import Dict, Hashable, List, Any, Optional, Tuple
+
+# Criterios de una etiqueta: (duración en minutos, costo en COP, kg de CO2)
+Criteria = Tuple[float, float, float]
+
+# Aristas: nodo -> [(nodo destino, criterios del tramo, datos del tramo)]
+Graph = Dict[Hashable, List[Tuple[Hashable, Criteria, Dict[str, Any]]]]
+
+DEFAULT_MAX_LABELS = 8
+
+# Orden lexicográfico de criterios para cada prioridad del usuario
+PRIORITY_ORDER = {
+    "time": (0, 1, 2),
+    "cost": (1, 0, 2),
+    "sustainability": (2, 0, 1),
+}
+
+# Pesos para la prioridad balanceada sobre criterios normalizados del frente
+BALANCED_WEIGHTS = (0.5, 0.3, 0.2)
+
+
+class Label:
+    """Itinerario parcial que llega a un nodo con ciertos criterios acumulados."""
+
+    __slots__ = ("criteria", "node", "edge", "parent")
+
+    def __init__(self, criteria: Criteria, node: Hashable, edge: Optional[Dict[str, Any]], parent: Optional["Label"]):
+        self.criteria = criteria
+        self.node = node
+        self.edge = edge
+        self.parent = parent
+
+    def edges(self) -> List[Dict[str, Any]]:
+        """Datos de los tramos desde el origen hasta esta etiqueta."""
+        result = []
+        label: Optional[Label] = self
+        while label is not None and label.edge is not None:
+            result.append(label.edge)
+            label = label.parent
+        result.reverse()
+        return result
+
+
+def dominates(a: Criteria, b: Criteria) -> bool:
+    """True si a es al menos tan buena como b en todo y mejor en algo."""
+    return a[0] <= b[0] and a[1] <= b[1] and a[2] <= b[2] and a != b
+
+
+def _weakly_dominated(criteria: Criteria, bag: List[Label]) -> bool:
+    for label in bag:
+        other = label.criteria
+        if other[0] <= criteria[0] and other[1] <= criteria[1] and other[2] <= criteria[2]:
+            return True
+    return False
+
+
+def _prune_bag(bag: List[Label], max_labels: int) -> None:
+    """
+    Reduce la bolsa a max_labels conservando los extremos de cada criterio y
+    descartando primero las etiquetas más parecidas a otra (menor separación).
+    """
+    while len(bag) > max_labels:
+        keep = {min(range(len(bag)), key=lambda i, c=c: bag[i].criteria[c]) for c in range(3)}
+        spans = [
+            (max(label.criteria[c] for label in bag) - min(label.criteria[c] for label in bag)) or 1.0
+            for c in range(3)
+        ]
+
+        def crowding(i: int) -> float:
+            return min(
+                sum(abs(bag[i].criteria[c] - bag[j].criteria[c]) / spans[c] for c in range(3))
+                for j in range(len(bag)) if j != i
+            )
+
+        candidates = [i for i in range(len(bag)) if i not in keep] or list(range(len(bag)))
+        bag.pop(min(candidates, key=crowding))
+
+
+def pareto_search(
+    graph: Graph,
+    source: Hashable,
+    target: Hashable,
+    max_labels: int = DEFAULT_MAX_LABELS,
+    bounds: Optional[Criteria] = None,
+) -> List[Label]:
+    """
+    Búsqueda de etiquetas multicriterio (label-setting) entre dos nodos.
+
+    Las etiquetas se procesan en orden lexicográfico; una etiqueta se descarta
+    si la domina otra del mismo nodo, alguna ya en el destino o si excede los
+    límites (p. ej. presupuesto). Cada nodo guarda como máximo max_labels
+    etiquetas, de modo que el frente no crece sin control en grafos grandes.
+
+    Args:
+        graph: Lista de adyacencia con criterios por arista
+        source: Nodo de origen
+        target: Nodo de destino
+        max_labels: Máximo de etiquetas por nodo
+        bounds: Máximos admitidos (duración, costo, CO2)
+
+    Returns:
+        Etiquetas Pareto-óptimas en el destino, ordenadas por duración
+    """
+    bags: Dict[Hashable, List[Label]] = {source: []}
+    start = Label((0.0, 0.0, 0.0), source, None, None)
+    bags[source].append(start)
+    counter = itertools.count()
+    heap = [(start.criteria, next(counter), start)]
+
+    while heap:
+        criteria, _, label = heapq.heappop(heap)
+        node_bag = bags.get(label.node, [])
+        if label not in node_bag:
+            continue  # Fue desplazada por una etiqueta mejor
+        if label.node == target:
+            continue
+
+        for neighbor, edge_criteria, data in graph.get(label.node, []):
+            new = (
+                criteria[0] + edge_criteria[0],
+                criteria[1] + edge_criteria[1],
+                criteria[2] + edge_criteria[2],
+            )
+            if bounds is not None and (new[0] > bounds[0] or new[1] > bounds[1] or new[2] > bounds[2]):
+                continue
+            if neighbor != target and _weakly_dominated(new, bags.get(target, [])):
+                continue  # No puede mejorar ninguna llegada ya conocida
+            bag = bags.setdefault(neighbor, [])
+            if _weakly_dominated(new, bag):
+                continue
+            bag[:] = [other for other in bag if not dominates(new, other.criteria)]
+            new_label = Label(new, neighbor, data, label)
+            bag.append(new_label)
+            _prune_bag(bag, max_labels)
+            if new_label in bag:
+                heapq.heappush(heap, (new, next(counter), new_label))
+
+    return sorted(bags.get(target, []), key=lambda label: label.criteria)
+
+
+def rank_by_priority(frontier: List[Label], priority: str) -> List[Label]:
+    """
+    Ordena el frente de Pareto según la prioridad del usuario, sin repetir la búsqueda.
+
+    Args:
+        frontier: Etiquetas Pareto-óptimas en el destino
+        priority: time, cost, sustainability o cualquier otro valor para balance
+
+    Returns:
+        Etiquetas ordenadas de mejor a peor
+    """
+    order = PRIORITY_ORDER.get(priority)
+    if order is not None:
+        return sorted(frontier, key=lambda label: tuple(label.criteria[c] for c in order))
+
+    lows = [min((label.criteria[c] for label in frontier), default=0.0) for c in range(3)]
+    highs = [max((label.criteria[c] for label in frontier), default=0.0) for c in range(3)]
+
+    def balanced(label: Label) -> float:
+        return sum(
+            BALANCED_WEIGHTS[c] * (label.criteria[c] - lows[c]) / ((highs[c] - lows[c]) or 1.0)
+            for c in range(3)
+        )
+
+    return sorted(frontier, key=lambda label: (balanced(label), label.criteria))
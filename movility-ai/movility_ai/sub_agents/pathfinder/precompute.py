@@ -0,0 +1,67 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Paso offline: calcula y guarda los datos precalculados de PathFinder.
+
+Uso: python -m movility_ai.sub_agents.pathfinder.precompute [--only matrix|roads]
+
+Los archivos quedan en MOVILITY_CACHE_DIR (o en sus variables propias) y el
+agente sólo los abre al iniciar.
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.road_network import RoadRouter, default_ch_path
+from movility_ai.sub_agents.pathfinder.zone_matrix import ZoneMatrix, default_matrix_path
+
+# Datos que sabe calcular este paso
+TARGETS = ("matrix", "roads")
+
+
+def precompute(targets: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Recalcula y guarda los datos pedidos aunque ya estén al día.
+
+    Args:
+        targets: Datos a calcular (ver TARGETS); por defecto todos
+
+    Returns:
+        Ruta del archivo escrito por cada dato
+    """
+    written = {}
+    for target in targets or TARGETS:
+        if target == "matrix":
+            ZoneMatrix.load(tools.TRANSIT_NETWORK, tools.METRO_STATION_COORDS_MOCK, tools.METRO_FARE_COP, rebuild=True)
+            written[target] = default_matrix_path()
+        elif target == "roads":
+            RoadRouter.load(rebuild=True)
+            written[target] = default_ch_path()
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calcula los datos precalculados de PathFinder")
+    parser.add_argument("--only", action="append", choices=TARGETS, help="Dato a calcular (repetible)")
+    args = parser.parse_args(argv)
+    for target, path in precompute(args.only).items():
+        print(f"{target}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Proveedores asíncronos de rutas y clima para PathFinder"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Any, Optional, Union
+
+
+class AsyncMobilityProvider(ABC):
+    """
+    Interfaz de proveedores de rutas y clima para las consultas concurrentes.
+
+    Una implementación HTTP real (Directions API, OpenWeather) sólo necesita
+    implementar estos dos métodos para usarse en acalculate_multimodal_route.
+    """
+
+    @abstractmethod
+    async def get_route(
+        self,
+        origin: str,
+        destination: str,
+        mode: str,
+        departure_time: Optional[str] = None,
+        weather_condition: Optional[str] = None,
+        bike_profile: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Ruta entre dos puntos para un modo, con el formato de get_route_google_maps."""
+
+    @abstractmethod
+    async def get_weather(self, location: str = "Medellín") -> Dict[str, Any]:
+        """Clima actual, con el formato de get_weather_conditions."""
+
+
+class LocalMockProvider(AsyncMobilityProvider):
+    """
+    Proveedor que envuelve funciones síncronas.
+
+    Las funciones pueden bloquear (p. ej. HTTP con ProviderClient), así que
+    se ejecutan en hilos con asyncio.to_thread para no detener el event loop
+    y que las consultas corran en paralelo. Con latency_seconds se
+    simula la demora de cada proveedor (un valor para todos o uno por modo,
+    usando la llave "weather" para el clima).
+    """
+
+    def __init__(
+        self,
+        route_fn: Callable[..., Dict[str, Any]],
+        weather_fn: Callable[[str], Dict[str, Any]],
+        latency_seconds: Union[float, Dict[str, float]] = 0.0,
+    ):
+        self._route_fn = route_fn
+        self._weather_fn = weather_fn
+        self._latency = latency_seconds
+
+    async def _simulate_latency(self, key: str) -> None:
+        if isinstance(self._latency, dict):
+            delay = self._latency.get(key, 0.0)
+        else:
+            delay = self._latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def get_route(
+        self,
+        origin: str,
+        destination: str,
+        mode: str,
+        departure_time: Optional[str] = None,
+        weather_condition: Optional[str] = None,
+        bike_profile: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        await self._simulate_latency(mode)
+        return await asyncio.to_thread(
+            self._route_fn, origin, destination, mode, departure_time, weather_condition, bike_profile
+        )
+
+    async def get_weather(self, location: str = "Medellín") -> Dict[str, Any]:
+        await self._simulate_latency("weather")
+        return await asyncio.to_thread(self._weather_fn, location)
@@ -0,0 +1,465 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Enrutador RAPTOR sobre horarios de Metro/Metrocable para PathFinder"""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from movility_ai.sub_agents.pathfinder.transit_network import (
+    INF,
+    KM_PER_HOP,
+    MINUTES_PER_HOP,
+    TRANSFER_PENALTY_MIN,
+    TransitNetwork,
+    line_display_name,
+    line_mode,
+)
+
+# Frecuencias por modo y tipo de día: (desde, hasta, minutos entre trenes/cabinas)
+# Horas en minutos desde medianoche; la operación termina con el último tramo.
+HEADWAY_TABLES = {
+    "weekday": {
+        "metro": [(270, 360, 7), (360, 540, 4), (540, 1020, 6), (1020, 1200, 4), (1200, 1380, 8)],
+        "metrocable": [(270, 1380, 2)],
+    },
+    "weekend": {
+        "metro": [(300, 480, 10), (480, 1200, 7), (1200, 1320, 10)],
+        "metrocable": [(300, 1320, 3)],
+    },
+}
+
+# Tiempo mínimo para cambiar de andén en una estación compartida. Coincide
+# con la penalización de la tabla estática, que así es una cota inferior válida.
+MIN_TRANSFER_MIN = TRANSFER_PENALTY_MIN
+
+MAX_ROUNDS = 5
+
+# Espera máxima (min) en la estación de origen: si el primer tren sale más
+# tarde, a esa hora no hay servicio (p. ej. de madrugada, antes de abrir)
+MAX_WAIT_MIN = 30
+
+
+def day_type(when: datetime) -> str:
+    """Tipo de día para seleccionar la tabla de frecuencias."""
+    return "weekend" if when.weekday() >= 5 else "weekday"
+
+
+def _format_minutes(minutes: float, service_date: datetime) -> str:
+    moment = service_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    return (moment + timedelta(minutes=minutes)).strftime("%H:%M")
+
+
+class Timetable:
+    """
+    Horario en arreglos planos para un tipo de día.
+
+    Cada ruta es una línea en un sentido. Como los trenes de una misma ruta
+    no se adelantan, basta guardar la hora de salida en la cabecera de cada
+    viaje (ordenada) y el tiempo acumulado hasta cada parada: la llegada del
+    viaje t a la parada i es departures[t] + offsets[i].
+    """
+
+    def __init__(self, network: TransitNetwork, headways: Dict[str, List[Tuple[int, int, int]]]):
+        self.network = network
+        self.route_lines: List[str] = []
+        self.route_stops: List[array] = []
+        self.route_offsets: List[array] = []
+        self.route_departures: List[array] = []
+        self.stop_routes: List[List[Tuple[int, int]]] = [[] for _ in network.stations]
+
+        for line_id, stations in network.lines.items():
+            mode = line_mode(line_id)
+            stop_ids = [network.find_station(station) for station in stations]
+            for pattern in (stop_ids, stop_ids[::-1]):
+                route = len(self.route_lines)
+                self.route_lines.append(line_id)
+                self.route_stops.append(array("i", pattern))
+                self.route_offsets.append(
+                    array("d", (i * MINUTES_PER_HOP[mode] for i in range(len(pattern))))
+                )
+                departures = array("d")
+                for start, end, headway in headways[mode]:
+                    departures.extend(range(start, end, headway))
+                self.route_departures.append(departures)
+                for position, stop in enumerate(pattern):
+                    self.stop_routes[stop].append((route, position))
+
+    def earliest_trip(self, route: int, position: int, ready: float) -> Optional[float]:
+        """Salida en cabecera del primer viaje que pasa por la parada después de ready."""
+        departures = self.route_departures[route]
+        t = bisect_left(departures, ready - self.route_offsets[route][position])
+        return departures[t] if t < len(departures) else None
+
+
+class RaptorRouter:
+    """
+    Enrutador RAPTOR (Round-bAsed Public Transit Optimized Router).
+
+    En la ronda k se recorren, una sola vez y en orden, las rutas que pasan
+    por paradas mejoradas en la ronda k-1, obteniendo las llegadas más
+    tempranas con k-1 transbordos. La tabla de caminos mínimos de la red se
+    usa como cota inferior para descartar paradas que no pueden mejorar el
+    destino.
+    """
+
+    def __init__(self, network: TransitNetwork):
+        self.network = network
+        self.timetables = {
+            name: Timetable(network, headways) for name, headways in HEADWAY_TABLES.items()
+        }
+
+    def search(
+        self,
+        origin: int,
+        target: int,
+        departure: float,
+        timetable: Timetable,
+        max_rounds: int = MAX_ROUNDS,
+    ) -> Tuple[List[List[float]], List[Dict[int, Tuple[int, int, int, float]]]]:
+        """
+        Ejecuta las rondas de RAPTOR entre dos paradas.
+
+        Args:
+            origin: Índice de la parada de origen
+            target: Índice de la parada de destino
+            departure: Minutos desde medianoche en que el viajero está en origen
+            timetable: Horario del tipo de día
+            max_rounds: Máximo de viajes (transbordos + 1)
+
+        Returns:
+            Llegadas por ronda y, por ronda, el abordaje que mejoró cada parada
+            como (ruta, posición de abordaje, posición de descenso, salida en cabecera)
+        """
+        n = len(self.network.stations)
+        lower_bound = self.network.station_dist
+        best = [INF] * n
+        arrivals = [[INF] * n]
+        arrivals[0][origin] = departure
+        best[origin] = departure
+        parents: List[Dict[int, Tuple[int, int, int, float]]] = [{}]
+        marked = {origin}
+
+        for k in range(1, max_rounds + 1):
+            previous = arrivals[k - 1]
+            current = list(previous)
+            parents.append({})
+
+            # Rutas a recorrer y primera posición marcada en cada una
+            queue: Dict[int, int] = {}
+            for stop in marked:
+                for route, position in timetable.stop_routes[stop]:
+                    if route not in queue or position < queue[route]:
+                        queue[route] = position
+            marked = set()
+
+            for route, start in queue.items():
+                stops = timetable.route_stops[route]
+                offsets = timetable.route_offsets[route]
+                trip: Optional[float] = None
+                board_position = -1
+                for position in range(start, len(stops)):
+                    stop = stops[position]
+                    if trip is not None:
+                        arrival = trip + offsets[position]
+                        if (
+                            arrival < best[stop]
+                            and arrival + lower_bound[stop][target] < best[target]
+                        ):
+                            current[stop] = arrival
+                            best[stop] = arrival
+                            parents[k][stop] = (route, board_position, position, trip)
+                            marked.add(stop)
+
+                    if previous[stop] < INF:
+                        ready = previous[stop] + (MIN_TRANSFER_MIN if stop != origin else 0.0)
+                        if trip is None or ready <= trip + offsets[position]:
+                            candidate = timetable.earliest_trip(route, position, ready)
+                            if candidate is not None and (trip is None or candidate < trip):
+                                trip = candidate
+                                board_position = position
+
+            arrivals.append(current)
+            if not marked:
+                break
+
+        return arrivals, parents
+
+    def reach(
+        self,
+        sources: Dict[int, float],
+        deadline: float,
+        timetable: Timetable,
+        max_rounds: int = MAX_ROUNDS,
+    ) -> List[float]:
+        """
+        RAPTOR de uno a todos acotado por tiempo, desde varias paradas a la vez.
+
+        Args:
+            sources: Parada -> minuto desde medianoche en que el viajero llega a ella
+            deadline: Minuto límite; no se exploran llegadas posteriores
+            timetable: Horario del tipo de día
+            max_rounds: Máximo de viajes (transbordos + 1)
+
+        Returns:
+            Llegada más temprana a cada parada (INF si no se alcanza antes del límite)
+        """
+        best = [INF] * len(self.network.stations)
+        for stop, ready in sources.items():
+            if ready <= deadline:
+                best[stop] = min(best[stop], ready)
+        previous = list(best)
+        marked = {stop for stop, ready in enumerate(best) if ready < INF}
+
+        for k in range(max_rounds):
+            current = list(previous)
+            queue: Dict[int, int] = {}
+            for stop in marked:
+                for route, position in timetable.stop_routes[stop]:
+                    if route not in queue or position < queue[route]:
+                        queue[route] = position
+            marked = set()
+
+            for route, start in queue.items():
+                stops = timetable.route_stops[route]
+                offsets = timetable.route_offsets[route]
+                trip: Optional[float] = None
+                for position in range(start, len(stops)):
+                    stop = stops[position]
+                    if trip is not None:
+                        arrival = trip + offsets[position]
+                        if arrival <= deadline and arrival < best[stop]:
+                            current[stop] = best[stop] = arrival
+                            marked.add(stop)
+                    if previous[stop] < INF:
+                        # En la primera ronda se aborda desde la calle, sin transbordo
+                        ready = previous[stop] + (MIN_TRANSFER_MIN if k > 0 else 0.0)
+                        if trip is None or ready <= trip + offsets[position]:
+                            candidate = timetable.earliest_trip(route, position, ready)
+                            if candidate is not None and (trip is None or candidate < trip):
+                                trip = candidate
+
+            previous = current
+            if not marked:
+                break
+
+        return best
+
+    def profile(
+        self,
+        origin: int,
+        target: int,
+        start: float,
+        end: float,
+        timetable: Timetable,
+        max_rounds: int = MAX_ROUNDS,
+    ) -> List[Tuple[float, float, int]]:
+        """
+        rRAPTOR: viajes óptimos entre dos paradas para todas las salidas de una ventana.
+
+        Las salidas desde el origen se recorren de la última a la primera sin
+        reiniciar las llegadas por ronda: lo que se alcanza saliendo más
+        tarde también se alcanza saliendo antes (basta esperar), así que cada
+        iteración sólo explora lo que la salida más temprana logra mejorar.
+
+        Args:
+            origin: Índice de la parada de origen
+            target: Índice de la parada de destino
+            start: Primer minuto (desde medianoche) en que el viajero puede estar en origen
+            end: Último minuto de la ventana; se incluye la primera salida posterior
+            timetable: Horario del tipo de día
+            max_rounds: Máximo de viajes (transbordos + 1)
+
+        Returns:
+            (salida del origen, llegada al destino, transbordos) ordenado por
+            salida, sólo con viajes que ninguna salida posterior domina
+        """
+        departures = set()
+        for route, position in timetable.stop_routes[origin]:
+            boardings = timetable.route_departures[route]
+            offset = timetable.route_offsets[route][position]
+            t = bisect_left(boardings, start - offset)
+            while t < len(boardings):
+                departures.add(boardings[t] + offset)
+                if boardings[t] + offset > end:
+                    break
+                t += 1
+
+        n = len(self.network.stations)
+        lower_bound = self.network.station_dist
+        arrivals = [[INF] * n for _ in range(max_rounds + 1)]
+        best = [INF] * n
+        profile: List[Tuple[float, float, int]] = []
+
+        for departure in sorted(departures, reverse=True):
+            for labels in arrivals:
+                labels[origin] = departure
+            best[origin] = departure
+            marked = {origin}
+
+            for k in range(1, max_rounds + 1):
+                previous = arrivals[k - 1]
+                current = arrivals[k]
+                queue: Dict[int, int] = {}
+                for stop in marked:
+                    current[stop] = min(current[stop], previous[stop])
+                    for route, position in timetable.stop_routes[stop]:
+                        if route not in queue or position < queue[route]:
+                            queue[route] = position
+                marked = set()
+
+                for route, first in queue.items():
+                    stops = timetable.route_stops[route]
+                    offsets = timetable.route_offsets[route]
+                    trip: Optional[float] = None
+                    for position in range(first, len(stops)):
+                        stop = stops[position]
+                        if trip is not None:
+                            arrival = trip + offsets[position]
+                            if (
+                                arrival < best[stop]
+                                and arrival + lower_bound[stop][target] < best[target]
+                            ):
+                                current[stop] = best[stop] = arrival
+                                marked.add(stop)
+
+                        if previous[stop] < INF:
+                            ready = previous[stop] + (MIN_TRANSFER_MIN if stop != origin else 0.0)
+                            if trip is None or ready <= trip + offsets[position]:
+                                candidate = timetable.earliest_trip(route, position, ready)
+                                if candidate is not None and (trip is None or candidate < trip):
+                                    trip = candidate
+
+                if not marked:
+                    break
+
+            arrival, rounds = min((arrivals[k][target], k) for k in range(1, max_rounds + 1))
+            if arrival < INF and (not profile or arrival < profile[-1][1]):
+                profile.append((departure, arrival, rounds - 1))
+
+        profile.reverse()
+        return profile
+
+    def route(
+        self,
+        origin: str,
+        destination: str,
+        departure_time: Optional[datetime] = None,
+        max_rounds: int = MAX_ROUNDS,
+        max_wait: float = MAX_WAIT_MIN,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Itinerario de llegada más temprana entre dos estaciones.
+
+        Args:
+            origin: Nombre de la estación de origen
+            destination: Nombre de la estación de destino
+            departure_time: Momento de salida (por defecto ahora)
+            max_rounds: Máximo de viajes permitidos
+            max_wait: Espera máxima por el primer tren; más allá no hay servicio
+
+        Returns:
+            Itinerario con duration, departure_time, arrival_time, transfers,
+            stations (paradas recorridas en orden) y steps, o None si no hay estaciones, conexión o servicio
+        """
+        source = self.network.find_station(origin)
+        target = self.network.find_station(destination)
+        if source is None or target is None or source == target:
+            return None
+
+        when = departure_time or datetime.now()
+        timetable = self.timetables[day_type(when)]
+        departure = when.hour * 60 + when.minute + when.second / 60
+        arrivals, parents = self.search(source, target, departure, timetable, max_rounds)
+
+        # Ronda con la llegada más temprana (a igual llegada, menos transbordos)
+        best_round = min(range(len(arrivals)), key=lambda k: (arrivals[k][target], k))
+        if arrivals[best_round][target] == INF:
+            return None
+
+        legs = []
+        stop = target
+        for k in range(best_round, 0, -1):
+            if stop not in parents[k]:
+                continue  # La parada se alcanzó en una ronda anterior
+            route, board_position, alight_position, trip = parents[k][stop]
+            stops = timetable.route_stops[route]
+            offsets = timetable.route_offsets[route]
+            legs.append({
+                "line": timetable.route_lines[route],
+                "from": stops[board_position],
+                "to": stops[alight_position],
+                "board": trip + offsets[board_position],
+                "alight": trip + offsets[alight_position],
+                "terminal": stops[-1],
+                "stops": stops[board_position:alight_position + 1],
+            })
+            stop = stops[board_position]
+        legs.reverse()
+        if legs[0]["board"] - departure > max_wait:
+            return None
+
+        stations = self.network.stations
+        steps = []
+        clock = departure
+        for leg in legs:
+            mode = line_mode(leg["line"])
+            wait = leg["board"] - clock
+            if wait >= 0.5:
+                steps.append({
+                    "instruction": f"Espera en estación {stations[leg['from']]}",
+                    "duration": round(wait),
+                    "distance": 0,
+                    "mode": "waiting",
+                })
+            hops = round((leg["alight"] - leg["board"]) / MINUTES_PER_HOP[mode])
+            steps.append({
+                "instruction": (
+                    f"Toma {line_display_name(leg['line'])} en {stations[leg['from']]} "
+                    f"hacia {stations[leg['terminal']]} ({_format_minutes(leg['board'], when)})"
+                ),
+                "duration": round(leg["alight"] - leg["board"]),
+                "distance": round(hops * KM_PER_HOP[mode], 1),
+                "mode": mode,
+            })
+            steps.append({
+                "instruction": f"Baja en estación {stations[leg['to']]} ({_format_minutes(leg['alight'], when)})",
+                "duration": 0,
+                "distance": 0,
+                "mode": mode,
+            })
+            clock = leg["alight"]
+
+        # Paradas recorridas, sin repetir la estación de un transbordo
+        visited: List[str] = []
+        for leg in legs:
+            for stop in leg["stops"]:
+                if not visited or visited[-1] != stations[stop]:
+                    visited.append(stations[stop])
+
+        arrival = arrivals[best_round][target]
+        return {
+            "origin_station": stations[source],
+            "destination_station": stations[target],
+            "departure_time": _format_minutes(legs[0]["board"], when),
+            "arrival_time": _format_minutes(arrival, when),
+            "duration": round(arrival - departure),
+            "distance": round(sum(step["distance"] for step in steps), 1),
+            "transfers": len(legs) - 1,
+            "lines": [leg["line"] for leg in legs],
+            "stations": visited,
+            "steps": steps,
+        }
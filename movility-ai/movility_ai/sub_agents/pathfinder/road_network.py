@@ -0,0 +1,733 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Red vial de Medellín y enrutador en carro sobre jerarquías de contracción"""
+
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from movility_ai.shared_libraries.cache import cache_dir
+from movility_ai.shared_libraries.constants import MEDELLIN_ZONES
+from movility_ai.sub_agents.flowsense.predictor import ZONE_MODEL
+from movility_ai.sub_agents.pathfinder.contraction import CH_ARRAYS, ContractionHierarchy
+from movility_ai.sub_agents.pathfinder.elevation import ElevationRaster, default_dem_path
+from movility_ai.sub_agents.pathfinder.spatial import StationIndex, haversine_km
+from movility_ai.sub_agents.pathfinder.zone_matrix import hourly_congestion
+
+ROAD_GRAPH_VERSION = 3
+
+# Factor de curvatura de las vías respecto a la línea recta entre nodos
+ROAD_DETOUR_FACTOR = 1.1
+
+# Velocidad en las vías locales entre el punto y el nodo vial más cercano
+ACCESS_SPEED_KMH = 20.0
+
+# Intersecciones principales (lat, lon), trazado simplificado de OpenStreetMap
+ROAD_NODES = {
+    "niquia": (6.3375, -75.5480),
+    "bello": (6.3300, -75.5560),
+    "madera": (6.3150, -75.5580),
+    "acevedo": (6.3002, -75.5610),
+    "autopista_calle_67": (6.2800, -75.5680),
+    "caribe": (6.2775, -75.5710),
+    "barranquilla": (6.2690, -75.5690),
+    "rio_san_juan": (6.2490, -75.5790),
+    "rio_calle_33": (6.2380, -75.5810),
+    "rio_calle_30": (6.2320, -75.5800),
+    "rio_calle_10": (6.2200, -75.5810),
+    "aguacatala": (6.1935, -75.5850),
+    "ayura": (6.1865, -75.5890),
+    "rio_envigado": (6.1750, -75.5950),
+    "rio_itagui": (6.1630, -75.6070),
+    "rio_sabaneta": (6.1560, -75.6190),
+    "la_estrella": (6.1525, -75.6290),
+    "caldas": (6.0910, -75.6360),
+    "san_diego": (6.2350, -75.5640),
+    "parque_poblado": (6.2088, -75.5690),
+    "aguacatala_43a": (6.1950, -75.5720),
+    "envigado_centro": (6.1719, -75.5863),
+    "sabaneta_centro": (6.1515, -75.6160),
+    "las_palmas_1": (6.2270, -75.5500),
+    "las_palmas_2": (6.2150, -75.5350),
+    "guayabal": (6.2160, -75.5850),
+    "belen_calle_10": (6.2150, -75.6000),
+    "itagui_centro": (6.1719, -75.6110),
+    "robledo": (6.2780, -75.5960),
+    "ochenta_colombia": (6.2580, -75.5980),
+    "ochenta_san_juan": (6.2500, -75.6000),
+    "ochenta_calle_33": (6.2420, -75.6010),
+    "belen": (6.2310, -75.6030),
+    "laureles": (6.2447, -75.5956),
+    "nutibara_calle_33": (6.2430, -75.5950),
+    "setenta_san_juan": (6.2480, -75.5900),
+    "estadio": (6.2569, -75.5903),
+    "colombia_rio": (6.2540, -75.5760),
+    "alpujarra": (6.2470, -75.5700),
+    "centro": (6.2518, -75.5636),
+    "prado": (6.2590, -75.5620),
+    "aranjuez": (6.2820, -75.5560),
+    "castilla": (6.2940, -75.5740),
+    "calle_33_oriente": (6.2390, -75.5600),
+    "buenos_aires": (6.2390, -75.5530),
+}
+
+# Corredores: (nombre, velocidad a flujo libre en km/h, nodos en orden).
+# Todas las vías son de doble sentido en este trazado simplificado.
+ROAD_CORRIDORS = [
+    ("Autopista Norte", 60, ["niquia", "bello", "madera", "acevedo", "autopista_calle_67", "caribe", "barranquilla", "rio_san_juan"]),
+    ("Autopista Sur", 60, ["rio_san_juan", "rio_calle_33", "rio_calle_30", "rio_calle_10", "aguacatala", "ayura", "rio_envigado", "rio_itagui", "rio_sabaneta", "la_estrella", "caldas"]),
+    ("Av. El Poblado", 40, ["san_diego", "parque_poblado", "aguacatala_43a", "envigado_centro", "sabaneta_centro"]),
+    ("Av. Las Palmas", 50, ["san_diego", "las_palmas_1", "las_palmas_2"]),
+    ("Calle 10", 35, ["parque_poblado", "rio_calle_10", "guayabal", "belen_calle_10"]),
+    ("Av. 80", 45, ["robledo", "ochenta_colombia", "ochenta_san_juan", "ochenta_calle_33", "belen", "belen_calle_10", "itagui_centro", "rio_itagui"]),
+    ("Calle 44 San Juan", 40, ["ochenta_san_juan", "setenta_san_juan", "rio_san_juan", "alpujarra", "centro"]),
+    ("Calle 33", 40, ["ochenta_calle_33", "nutibara_calle_33", "rio_calle_33", "calle_33_oriente", "buenos_aires"]),
+    ("Av. Colombia", 40, ["ochenta_colombia", "estadio", "colombia_rio", "centro"]),
+    ("Av. Nutibara", 35, ["setenta_san_juan", "laureles", "nutibara_calle_33"]),
+    ("Av. Oriental", 35, ["aranjuez", "prado", "centro", "san_diego"]),
+    ("Calle 67 Barranquilla", 35, ["aranjuez", "autopista_calle_67"]),
+    ("Av. Regional", 50, ["castilla", "acevedo"]),
+    ("Calle 80", 35, ["castilla", "robledo"]),
+    ("Calle 30", 35, ["belen", "rio_calle_30"]),
+    ("Carrera 52", 35, ["guayabal", "rio_calle_30"]),
+    ("Av. Las Vegas", 40, ["aguacatala", "aguacatala_43a"]),
+    ("Calle 33 Sur", 35, ["rio_envigado", "envigado_centro"]),
+    ("Calle 50 Sabaneta", 35, ["rio_sabaneta", "sabaneta_centro"]),
+    ("Av. Ferrocarril", 40, ["alpujarra", "colombia_rio"]),
+]
+
+# Zona de tráfico de FlowSense de cada corredor; los demás toman la de la
+# zona más cercana al punto medio de cada tramo
+CORRIDOR_TRAFFIC_ZONES = {
+    "Autopista Norte": "autopista_norte",
+    "Av. 80": "av_80",
+    "Av. Las Palmas": "las_palmas",
+    "Av. El Poblado": "poblado",
+    "Av. Oriental": "centro",
+    "Calle 44 San Juan": "centro",
+    "Av. Nutibara": "laureles",
+    "Calle 33": "laureles",
+    "Av. Colombia": "estadio",
+}
+
+# Perfiles de tiempo por tramo: un punto cada 15 minutos del día (lineal entre puntos)
+PROFILE_STEP_MINUTES = 15
+PROFILE_POINTS = 24 * 60 // PROFILE_STEP_MINUTES
+DAY_TYPES = ("weekday", "weekend")
+
+# Con congestión total la velocidad no baja de esta fracción de la libre
+MIN_SPEED_RATIO = 0.2
+
+# Perfiles de ciclista: velocidad en plano, metros que sube por minuto,
+# fracción de la subida equivalente que recupera en las bajadas y velocidad
+# máxima bajando. Cada perfil tiene su arreglo de costos precalculado.
+BIKE_PROFILES = {
+    "pedal": {"flat_kmh": 14.0, "climb_m_per_min": 10.0, "descent_recovery": 0.3, "max_kmh": 30.0},
+    "ebike": {"flat_kmh": 20.0, "climb_m_per_min": 30.0, "descent_recovery": 0.3, "max_kmh": 30.0},
+}
+DEFAULT_BIKE_PROFILE = os.getenv("BIKE_PROFILE", "pedal")
+
+
+def bike_edge_minutes(km: np.ndarray, ascent_m: np.ndarray, descent_m: np.ndarray) -> np.ndarray:
+    """
+    Minutos en bici por arista para cada perfil de ciclista.
+
+    El tiempo en plano se corrige con el desnivel: cada metro de subida
+    cuesta 1/climb_m_per_min minutos y las bajadas devuelven una parte, sin
+    superar la velocidad máxima.
+
+    Returns:
+        Arreglo float32 (perfiles en el orden de BIKE_PROFILES, aristas)
+    """
+    costs = []
+    for profile in BIKE_PROFILES.values():
+        climb = (ascent_m - profile["descent_recovery"] * descent_m) / profile["climb_m_per_min"]
+        minutes = km / profile["flat_kmh"] * 60.0 + climb
+        costs.append(np.maximum(minutes, km / profile["max_kmh"] * 60.0))
+    return np.array(costs, dtype=np.float32)
+
+
+def build_edge_profiles(
+    edge_minutes: np.ndarray,
+    edge_traffic_zones: List[Optional[str]],
+) -> np.ndarray:
+    """
+    Perfiles lineales por tramos del tiempo de cada arista a lo largo del día.
+
+    La congestión horaria de FlowSense (base x multiplicador en horas pico)
+    se muestrea en el centro de cada franja de 15 minutos; entre puntos se
+    interpola, así el inicio y el fin de la hora pico son rampas y no saltos.
+
+    Args:
+        edge_minutes: Minutos de cada arista a flujo libre
+        edge_traffic_zones: Zona de tráfico de cada arista (None: congestión por defecto)
+
+    Returns:
+        Arreglo float32 (tipo de día, aristas, PROFILE_POINTS + 1); el último
+        punto repite el primero para interpolar después de las 23:45
+    """
+    slot_hours = (np.arange(PROFILE_POINTS) * PROFILE_STEP_MINUTES + PROFILE_STEP_MINUTES / 2) // 60
+    first_hour = {"weekday": 0, "weekend": 5 * 24}  # Lunes y sábado
+    by_zone = {zone: hourly_congestion(zone) for zone in set(edge_traffic_zones)}
+    profiles = np.empty((len(DAY_TYPES), len(edge_minutes), PROFILE_POINTS + 1), dtype=np.float32)
+    for d, day in enumerate(DAY_TYPES):
+        for e, zone in enumerate(edge_traffic_zones):
+            congestion = by_zone[zone][first_hour[day] + slot_hours.astype(int)]
+            factor = 1.0 / np.maximum(1.0 - congestion, MIN_SPEED_RATIO)
+            profiles[d, e, :PROFILE_POINTS] = edge_minutes[e] * factor
+        profiles[d, :, PROFILE_POINTS] = profiles[d, :, 0]
+    return profiles
+
+
+def build_road_graph(raster: Optional[ElevationRaster] = None) -> Dict[str, np.ndarray]:
+    """
+    Arreglos de la red vial: coordenadas de nodos y aristas dirigidas.
+
+    El DEM se muestrea una sola vez por arista aquí; las consultas en bici
+    sólo leen los costos ya calculados.
+
+    Args:
+        raster: Modelo de elevación (por defecto ElevationRaster.load())
+
+    Returns:
+        node_lat, node_lon, edge_tail, edge_head, edge_km, edge_minutes,
+        edge_corridor (índice en ROAD_CORRIDORS), edge_profile (perfiles por
+        hora), edge_ascent_m, edge_descent_m y edge_bike_minutes (por perfil de ciclista)
+    """
+    node_ids = list(ROAD_NODES)
+    index = {node: i for i, node in enumerate(node_ids)}
+    tails, heads, corridors = [], [], []
+    speeds = []
+    for c, (_, speed, nodes) in enumerate(ROAD_CORRIDORS):
+        for a, b in zip(nodes, nodes[1:]):
+            for u, v in ((a, b), (b, a)):
+                tails.append(index[u])
+                heads.append(index[v])
+                corridors.append(c)
+                speeds.append(speed)
+
+    lat = np.array([ROAD_NODES[n][0] for n in node_ids])
+    lon = np.array([ROAD_NODES[n][1] for n in node_ids])
+    tail = np.array(tails, dtype=np.int32)
+    head = np.array(heads, dtype=np.int32)
+    km = haversine_km(lat[tail], lon[tail], lat[head], lon[head]) * ROAD_DETOUR_FACTOR
+    minutes = (km / np.array(speeds) * 60.0).astype(np.float32)
+
+    zone_ids = list(MEDELLIN_ZONES)
+    zone_lat = np.array([MEDELLIN_ZONES[z]["lat"] for z in zone_ids])
+    zone_lon = np.array([MEDELLIN_ZONES[z]["lon"] for z in zone_ids])
+    mid_lat, mid_lon = (lat[tail] + lat[head]) / 2, (lon[tail] + lon[head]) / 2
+    nearest = haversine_km(mid_lat[:, None], mid_lon[:, None], zone_lat[None, :], zone_lon[None, :]).argmin(axis=1)
+    traffic_zones = [
+        CORRIDOR_TRAFFIC_ZONES.get(ROAD_CORRIDORS[c][0], MEDELLIN_ZONES[zone_ids[z]]["traffic_zone"])
+        for c, z in zip(corridors, nearest)
+    ]
+    raster = raster or ElevationRaster.load()
+    ascent, descent = raster.climb(lat[tail], lon[tail], lat[head], lon[head], km)
+    return {
+        "node_lat": lat,
+        "node_lon": lon,
+        "edge_tail": tail,
+        "edge_head": head,
+        "edge_km": km.astype(np.float32),
+        "edge_minutes": minutes,
+        "edge_corridor": np.array(corridors, dtype=np.int16),
+        "edge_profile": build_edge_profiles(minutes, traffic_zones),
+        "edge_ascent_m": ascent.astype(np.float32),
+        "edge_descent_m": descent.astype(np.float32),
+        "edge_bike_minutes": bike_edge_minutes(km, ascent, descent),
+    }
+
+
+def default_ch_path() -> str:
+    """Ruta del .npz con la red y la jerarquía (ROAD_CH_PATH o la caché del usuario)."""
+    return os.getenv("ROAD_CH_PATH") or os.path.join(cache_dir(), f"road_ch_v{ROAD_GRAPH_VERSION}.npz")
+
+
+def road_inputs_fingerprint(dem_path: Optional[str] = None) -> str:
+    """
+    Huella de todo lo que entra en el .npz de la red vial.
+
+    Cubre la versión, el trazado, los perfiles de ciclista, la congestión
+    horaria de FlowSense de cada zona y el DEM (ruta, tamaño y fecha de
+    modificación): si cualquiera cambia, la red guardada ya no sirve.
+    """
+    dem_path = os.path.abspath(dem_path or default_dem_path())
+    try:
+        stat = os.stat(dem_path)
+        dem = f"{dem_path}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        dem = f"{dem_path}:missing"
+    digest = hashlib.sha1()
+    digest.update(json.dumps(
+        [ROAD_GRAPH_VERSION, ROAD_DETOUR_FACTOR, ROAD_NODES, ROAD_CORRIDORS, CORRIDOR_TRAFFIC_ZONES,
+         PROFILE_STEP_MINUTES, MIN_SPEED_RATIO, BIKE_PROFILES, dem],
+        sort_keys=True,
+    ).encode("utf-8"))
+    for zone in [None, *ZONE_MODEL.ids]:
+        digest.update(np.ascontiguousarray(hourly_congestion(zone), dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class RoadRouter:
+    """
+    Enrutador en carro: ubica origen y destino en el nodo vial más cercano y
+    consulta la jerarquía de contracción precalculada (flujo libre) o, con
+    hora de salida, un A* dependiente del tiempo que evalúa cada tramo en el
+    minuto en que el viajero llega a él, con la distancia a flujo libre de
+    la jerarquía hacia el destino como cota inferior.
+
+    Sobre la misma red enruta en bici con costos que incluyen la pendiente,
+    uno por perfil de ciclista; cada consulta elige su perfil (sólo cambia
+    de arreglo), sin estado compartido entre usuarios.
+    """
+
+    def __init__(
+        self,
+        graph: Dict[str, np.ndarray],
+        hierarchy: ContractionHierarchy,
+        fingerprint: Optional[str] = None,
+    ):
+        self.graph = graph
+        self.hierarchy = hierarchy
+        self.fingerprint = fingerprint
+        self.node_index = StationIndex([
+            {"lat": float(lat), "lon": float(lon)}
+            for lat, lon in zip(graph["node_lat"], graph["node_lon"])
+        ])
+        self._km = graph["edge_km"].tolist()
+        self._minutes = graph["edge_minutes"].tolist()
+        self._corridor = graph["edge_corridor"].tolist()
+        # Perfiles como listas: evaluar un tramo son dos accesos y una interpolación
+        self._profiles = [day.tolist() for day in graph["edge_profile"]]
+        self._ascent = graph["edge_ascent_m"].tolist()
+        if len(graph["edge_bike_minutes"]) != len(BIKE_PROFILES):
+            raise ValueError(
+                f"La red trae {len(graph['edge_bike_minutes'])} perfiles de bici y hay {len(BIKE_PROFILES)}"
+            )
+        self._bike_costs = {
+            name: costs.tolist() for name, costs in zip(BIKE_PROFILES, graph["edge_bike_minutes"])
+        }
+        self.default_bike_profile = DEFAULT_BIKE_PROFILE if DEFAULT_BIKE_PROFILE in BIKE_PROFILES else "pedal"
+        self._edges: Dict[Tuple[int, int], int] = {}
+        for e, (tail, head) in enumerate(zip(graph["edge_tail"].tolist(), graph["edge_head"].tolist())):
+            current = self._edges.get((tail, head))
+            if current is None or self._minutes[e] < self._minutes[current]:
+                self._edges[(tail, head)] = e
+        self._adjacency: List[List[Tuple[int, int]]] = [[] for _ in range(len(graph["node_lat"]))]
+        for (tail, head), e in self._edges.items():
+            self._adjacency[tail].append((head, e))
+
+    @classmethod
+    def build(cls, dem_path: Optional[str] = None) -> "RoadRouter":
+        """Construye la red y sus perfiles y preprocesa la jerarquía (paso offline)."""
+        # El DEM se abre (o se genera) antes de la huella para que ésta lo vea en disco
+        raster = ElevationRaster.load(dem_path)
+        graph = build_road_graph(raster)
+        hierarchy = ContractionHierarchy.build(
+            len(graph["node_lat"]), graph["edge_tail"], graph["edge_head"], graph["edge_minutes"]
+        )
+        return cls(graph, hierarchy, road_inputs_fingerprint(dem_path))
+
+    def save(self, path: str) -> None:
+        """Guarda red y jerarquía en un .npz (escritura atómica)."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                extra = {"fingerprint": np.array(self.fingerprint)} if self.fingerprint else {}
+                np.savez(handle, **self.graph, **self.hierarchy.arrays(), **extra)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, rebuild: bool = False) -> "RoadRouter":
+        """
+        Carga la jerarquía preprocesada; si no existe la construye y la guarda.
+
+        El archivo se reconstruye si su huella (road_inputs_fingerprint) no
+        coincide con la de las entradas actuales: otro DEM, otro perfil de
+        ciclista u otra congestión de FlowSense. Si el archivo no se puede
+        escribir se usa la jerarquía en memoria, salvo con rebuild (paso
+        offline, ver precompute), que siempre reconstruye y propaga el error.
+        """
+        path = path or default_ch_path()
+        if not rebuild and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    arrays = {name: data[name] for name in data.files}
+                fingerprint = str(arrays.pop("fingerprint"))
+                if fingerprint == road_inputs_fingerprint():
+                    graph = {name: arrays[name] for name in arrays if name not in CH_ARRAYS}
+                    return cls(graph, ContractionHierarchy({name: arrays[name] for name in CH_ARRAYS}), fingerprint)
+            except (OSError, ValueError, KeyError):
+                pass
+        router = cls.build()
+        try:
+            router.save(path)
+        except OSError:
+            if rebuild:
+                raise
+        return router
+
+    def edge_minutes_at(self, edge: int, day: int, clock: float) -> float:
+        """
+        Minutos para recorrer una arista entrando en ella a cierta hora.
+
+        Args:
+            edge: Índice de la arista
+            day: Índice en DAY_TYPES
+            clock: Minutos desde la medianoche
+        """
+        x = ((clock - PROFILE_STEP_MINUTES / 2) / PROFILE_STEP_MINUTES) % PROFILE_POINTS
+        i = int(x)
+        row = self._profiles[day][edge]
+        return row[i] + (row[i + 1] - row[i]) * (x - i)
+
+    def _td_dijkstra(
+        self,
+        source: int,
+        start: float,
+        departure: Optional[datetime],
+        max_minutes: float = float("inf"),
+        target: Optional[int] = None,
+        weights: Optional[List[float]] = None,
+        penalties: Optional[Dict[int, float]] = None,
+        potentials: Optional[List[float]] = None,
+    ) -> Tuple[Dict[int, float], Dict[int, Tuple[int, int, float]]]:
+        """
+        Dijkstra (dependiente del tiempo si hay hora de salida) desde un nodo.
+
+        Con perfiles FIFO (nadie llega antes por salir más tarde) el costo
+        de cada arista se evalúa en la llegada a su nodo de salida y el
+        algoritmo sigue siendo exacto. Con weights se usan esos costos fijos
+        (p. ej. los de la bici) en lugar de los del carro. Con penalties
+        el costo de esas aristas se multiplica (incidentes viales). Con
+        potentials (cota inferior del costo de cada nodo a target, ver
+        _potentials) la búsqueda es un A* que sólo asienta los nodos que
+        pueden mejorar el camino a target.
+
+        Returns:
+            Minutos desde la salida a cada nodo asentado y, por nodo, la
+            arista de llegada como (nodo anterior, arista, minutos)
+        """
+        day = DAY_TYPES.index("weekend" if departure.weekday() >= 5 else "weekday") if departure else 0
+        clock0 = departure.hour * 60 + departure.minute + departure.second / 60 if departure else 0.0
+        weights = weights or self._minutes
+        dist = {source: start}
+        parents: Dict[int, Tuple[int, int, float]] = {}
+        settled: Dict[int, float] = {}
+        heap = [(start + potentials[source] if potentials else start, source)]
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            d = settled[u] = dist[u]
+            if u == target:
+                break
+            for v, e in self._adjacency[u]:
+                w = self.edge_minutes_at(e, day, clock0 + d) if departure else weights[e]
+                if penalties and e in penalties:
+                    w *= penalties[e]
+                nd = d + w
+                if nd <= max_minutes and nd < dist.get(v, float("inf")):
+                    dist[v] = nd
+                    parents[v] = (u, e, w)
+                    heapq.heappush(heap, (nd + potentials[v] if potentials else nd, v))
+        return settled, parents
+
+    def _potentials(self, target: int, penalties: Optional[Dict[int, float]] = None) -> Optional[List[float]]:
+        """
+        Minutos a flujo libre de cada nodo a target, por la jerarquía de contracción.
+
+        Los perfiles nunca bajan del tiempo a flujo libre (ver
+        build_edge_profiles), así que es una cota inferior consistente del
+        tiempo dependiente de la hora y el A* de _td_dijkstra sigue siendo
+        exacto. Un multiplicador menor que 1 la rompería: entonces None.
+        """
+        if penalties and min(penalties.values()) < 1.0:
+            return None
+        # Margen por el redondeo float32 de los atajos de la jerarquía
+        return [d * (1.0 - 1e-6) for d in self.hierarchy.distances_to(target)]
+
+    @staticmethod
+    def _unwind(
+        parents: Dict[int, Tuple[int, int, float]], source: int, target: int
+    ) -> Tuple[List[int], List[int], List[float]]:
+        """Nodos, aristas y minutos por arista del camino encontrado por _td_dijkstra."""
+        path, edges, edge_minutes = [target], [], []
+        while path[-1] != source:
+            u, e, w = parents[path[-1]]
+            path.append(u)
+            edges.append(e)
+            edge_minutes.append(w)
+        return path[::-1], edges[::-1], edge_minutes[::-1]
+
+    def route(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float],
+        departure: Optional[datetime] = None,
+        penalties: Optional[Dict[int, float]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Ruta en carro entre dos coordenadas.
+
+        Los puntos se conectan al nodo vial más cercano por vías locales.
+        Sin hora de salida ni penalidades se usa la jerarquía de contracción
+        a flujo libre; con ellas, un A* dependiente del tiempo guiado por las
+        distancias a flujo libre de la jerarquía hacia el destino.
+
+        Args:
+            origin: (lat, lon) de origen
+            destination: (lat, lon) de destino
+            departure: Hora de salida para aplicar la congestión de cada tramo
+            penalties: Multiplicador del tiempo por arista (ver incident_edges)
+
+        Returns:
+            Diccionario con duration y free_flow_duration (min), distance (km),
+            nodes y steps por corredor, o None si no hay camino
+        """
+        source_idx, source_km = self.node_index.nearest(*origin, 1)
+        target_idx, target_km = self.node_index.nearest(*destination, 1)
+        source, target = int(source_idx[0]), int(target_idx[0])
+        access_km = float(source_km[0] + target_km[0]) * ROAD_DETOUR_FACTOR
+        access_minutes = access_km / ACCESS_SPEED_KMH * 60.0
+
+        if departure is None and not penalties:
+            _, path = self.hierarchy.query(source, target)
+            if path is None:
+                return None
+            edges = [self._edges[(u, v)] for u, v in zip(path, path[1:])]
+            edge_minutes = [self._minutes[e] for e in edges]
+        else:
+            # La salida a la red principal ocurre tras el tramo local de acceso
+            start = float(source_km[0]) * ROAD_DETOUR_FACTOR / ACCESS_SPEED_KMH * 60.0
+            settled, parents = self._td_dijkstra(
+                source, start, departure, target=target, penalties=penalties,
+                potentials=self._potentials(target, penalties),
+            )
+            if target not in settled:
+                return None
+            path, edges, edge_minutes = self._unwind(parents, source, target)
+
+        return {
+            "duration": access_minutes + sum(edge_minutes),
+            "free_flow_duration": access_minutes + sum(self._minutes[e] for e in edges),
+            "distance": access_km + sum(self._km[e] for e in edges),
+            "nodes": path,
+            "steps": self._steps(edges, edge_minutes, "driving", "Toma"),
+        }
+
+    def incident_edges(self, node: int) -> List[int]:
+        """Aristas que entran o salen de un nodo vial (las que bloquea un incidente allí)."""
+        edges = []
+        for neighbor, e in self._adjacency[node]:
+            edges.append(e)
+            back = self._edges.get((neighbor, node))
+            if back is not None:
+                edges.append(back)
+        return edges
+
+    def _steps(self, edges: List[int], edge_minutes: List[float], mode: str, verb: str) -> List[Dict[str, Any]]:
+        """Indicaciones por corredor, agrupando aristas consecutivas de la misma vía."""
+        steps: List[Dict[str, Any]] = []
+        for e, minutes in zip(edges, edge_minutes):
+            name = ROAD_CORRIDORS[self._corridor[e]][0]
+            if steps and steps[-1]["road"] == name:
+                steps[-1]["duration"] += minutes
+                steps[-1]["distance"] += self._km[e]
+            else:
+                steps.append({"road": name, "duration": minutes, "distance": self._km[e]})
+        return [
+            {
+                "instruction": f"{verb if i == 0 else 'Continúa por'} {step['road']}",
+                "duration": round(step["duration"], 1),
+                "distance": round(step["distance"], 1),
+                "mode": mode,
+            }
+            for i, step in enumerate(steps)
+        ]
+
+    def bike_route(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float],
+        profile: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Ruta en bici entre dos coordenadas con costos según la pendiente.
+
+        Args:
+            origin: (lat, lon) de origen
+            destination: (lat, lon) de destino
+            profile: Perfil de ciclista (por defecto BIKE_PROFILE o "pedal")
+
+        Returns:
+            Diccionario con duration (min), distance (km), ascent (m), nodes
+            y steps por corredor, o None si no hay camino
+
+        Raises:
+            ValueError: Si el perfil no existe
+        """
+        profile = profile or self.default_bike_profile
+        if profile not in self._bike_costs:
+            raise ValueError(f"Perfil de ciclista desconocido: {profile}")
+        costs = self._bike_costs[profile]
+        source_idx, source_km = self.node_index.nearest(*origin, 1)
+        target_idx, target_km = self.node_index.nearest(*destination, 1)
+        source, target = int(source_idx[0]), int(target_idx[0])
+        access_km = float(source_km[0] + target_km[0]) * ROAD_DETOUR_FACTOR
+        access_minutes = access_km / BIKE_PROFILES[profile]["flat_kmh"] * 60.0
+
+        settled, parents = self._td_dijkstra(source, 0.0, None, target=target, weights=costs)
+        if target not in settled:
+            return None
+        path, edges, edge_minutes = self._unwind(parents, source, target)
+        return {
+            "duration": access_minutes + sum(edge_minutes),
+            "distance": access_km + sum(self._km[e] for e in edges),
+            "ascent": sum(self._ascent[e] for e in edges),
+            "profile": profile,
+            "nodes": path,
+            "steps": self._steps(edges, edge_minutes, "bicycling", "Pedalea por"),
+        }
+
+    def reach(
+        self,
+        origin: Tuple[float, float],
+        max_minutes: float,
+        departure: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """
+        Minutos en carro desde un punto a todos los nodos viales (Dijkstra acotado).
+
+        Args:
+            origin: (lat, lon) de salida
+            max_minutes: Límite de la búsqueda
+            departure: Hora de salida para aplicar la congestión de cada tramo
+
+        Returns:
+            Arreglo con los minutos a cada nodo (inf si no se alcanza en el límite)
+        """
+        source_idx, source_km = self.node_index.nearest(*origin, 1)
+        start = float(source_km[0]) * ROAD_DETOUR_FACTOR / ACCESS_SPEED_KMH * 60.0
+        times = np.full(len(self._adjacency), np.inf)
+        if start > max_minutes:
+            return times
+        settled, _ = self._td_dijkstra(int(source_idx[0]), start, departure, max_minutes)
+        for node, minutes in settled.items():
+            times[node] = minutes
+        return times
+
+    def node_times(
+        self,
+        source: int,
+        departure: Optional[datetime] = None,
+        bike_profile: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Minutos desde un nodo vial a todos los demás (Dijkstra de uno a todos).
+
+        Args:
+            source: Índice del nodo de salida
+            departure: Hora de salida para aplicar la congestión de cada tramo
+            bike_profile: En bici con los costos de ese perfil (con pendiente);
+                la hora de salida no aplica
+
+        Returns:
+            Arreglo con los minutos a cada nodo (inf si no se alcanza)
+
+        Raises:
+            ValueError: Si el perfil no existe
+        """
+        times = np.full(len(self._adjacency), np.inf)
+        if bike_profile is not None:
+            if bike_profile not in self._bike_costs:
+                raise ValueError(f"Perfil de ciclista desconocido: {bike_profile}")
+            settled, _ = self._td_dijkstra(source, 0.0, None, weights=self._bike_costs[bike_profile])
+        else:
+            settled, _ = self._td_dijkstra(source, 0.0, departure)
+        for node, minutes in settled.items():
+            times[node] = minutes
+        return times
+
+    def profile(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float],
+        departures: List[datetime],
+    ) -> np.ndarray:
+        """
+        Minutos en carro entre dos puntos para muchas horas de salida a la vez.
+
+        Como los perfiles son lineales entre puntos cada 15 minutos, el camino
+        óptimo sólo cambia cerca de esos puntos: el Dijkstra dependiente del
+        tiempo corre una vez por franja de 15 minutos (no por salida) y cada
+        camino candidato se evalúa para todas las salidas juntas con numpy.
+
+        Args:
+            origin: (lat, lon) de origen
+            destination: (lat, lon) de destino
+            departures: Horas de salida
+
+        Returns:
+            Arreglo con los minutos de viaje por salida (inf si no hay camino)
+        """
+        source_idx, source_km = self.node_index.nearest(*origin, 1)
+        target_idx, target_km = self.node_index.nearest(*destination, 1)
+        source, target = int(source_idx[0]), int(target_idx[0])
+        start = float(source_km[0]) * ROAD_DETOUR_FACTOR / ACCESS_SPEED_KMH * 60.0
+        egress = float(target_km[0]) * ROAD_DETOUR_FACTOR / ACCESS_SPEED_KMH * 60.0
+        if not departures:
+            return np.zeros(0)
+
+        # Caminos candidatos: uno por franja de 15 minutos con salidas
+        slots = {
+            when.replace(minute=when.minute - when.minute % PROFILE_STEP_MINUTES, second=0, microsecond=0)
+            for when in departures
+        }
+        candidates = set()
+        potentials = self._potentials(target)
+        for when in slots:
+            settled, parents = self._td_dijkstra(source, start, when, target=target, potentials=potentials)
+            if target in settled:
+                candidates.add(tuple(self._unwind(parents, source, target)[1]))
+        if not candidates:
+            return np.full(len(departures), np.inf)
+
+        profiles = self.graph["edge_profile"]
+        day = np.array([1 if when.weekday() >= 5 else 0 for when in departures])
+        clock0 = np.array([when.hour * 60 + when.minute + when.second / 60 for when in departures]) + start
+        best = np.full(len(departures), np.inf)
+        for edges in candidates:
+            clock = clock0.copy()
+            for e in edges:
+                x = ((clock - PROFILE_STEP_MINUTES / 2) / PROFILE_STEP_MINUTES) % PROFILE_POINTS
+                i = x.astype(int)
+                low, high = profiles[day, e, i], profiles[day, e, i + 1]
+                clock += low + (high - low) * (x - i)
+            np.minimum(best, clock - clock0, out=best)
+        return best + start + egress
@@ -0,0 +1,148 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Caché LRU con expiración por modo para las rutas de PathFinder"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from movility_ai.sub_agents.pathfinder.transit_network import normalize_station_name
+
+# Vigencia de una ruta en caché según el modo (segundos): el tráfico cambia
+# rápido, los horarios del Metro poco y las rutas a pie o en bici casi nunca
+ROUTE_TTL_SECONDS = {
+    "driving": 5 * 60,
+    "transit": 15 * 60,
+    "bicycling": 6 * 60 * 60,
+    "walking": 6 * 60 * 60,
+}
+DEFAULT_TTL_SECONDS = 10 * 60
+
+# Resolución de la hora de salida en la llave; los itinerarios de transporte
+# público dependen del minuto exacto (el tren que se alcanza a tomar)
+DEPARTURE_BUCKET_MINUTES = 15
+DEPARTURE_BUCKET_MINUTES_BY_MODE = {"transit": 1}
+
+RouteKey = Tuple[str, str, str, str, str, str]
+
+
+class RouteCache:
+    """
+    Caché acotada con desalojo LRU y vigencia por modo de transporte.
+
+    Guarda copias de las rutas para que quien las reciba pueda modificarlas
+    sin alterar la entrada en caché. Es segura entre hilos.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = dict(ROUTE_TTL_SECONDS if ttl_seconds is None else ttl_seconds)
+        self._clock = clock
+        self._entries: "OrderedDict[RouteKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(
+        origin: str,
+        destination: str,
+        mode: str,
+        departure: datetime,
+        weather_condition: Optional[str] = None,
+        variant: Optional[str] = None,
+    ) -> RouteKey:
+        """
+        Llave normalizada: origen, destino, modo, franja de salida, clima y variante.
+
+        La franja es de 15 min, salvo en transporte público donde es el minuto
+        exacto para no devolver un tren que sale antes que el usuario.
+
+        Args:
+            origin: Origen en texto libre
+            destination: Destino en texto libre
+            mode: Modo de transporte
+            departure: Hora de salida
+            weather_condition: Condición climática, si se conoce
+            variant: Variante del modo que cambia la ruta (p. ej. perfil de ciclista)
+        """
+        bucket_minutes = DEPARTURE_BUCKET_MINUTES_BY_MODE.get(mode, DEPARTURE_BUCKET_MINUTES)
+        minute = departure.minute - departure.minute % bucket_minutes
+        bucket = departure.replace(minute=minute, second=0, microsecond=0, tzinfo=None)
+        return (
+            normalize_station_name(origin),
+            normalize_station_name(destination),
+            mode,
+            bucket.isoformat(timespec="minutes"),
+            (weather_condition or "").lower(),
+            variant or "",
+        )
+
+    def get(self, key: RouteKey) -> Optional[Dict[str, Any]]:
+        """Ruta en caché vigente para la llave, o None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, route = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(route)
+
+    def set(self, key: RouteKey, route: Dict[str, Any]) -> None:
+        """Guarda una ruta con la vigencia de su modo, desalojando la menos usada."""
+        ttl = self.ttl_seconds.get(key[2], DEFAULT_TTL_SECONDS)
+        value = copy.deepcopy(route)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Vacía la caché conservando los contadores."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de aciertos, fallos, desalojos y expiraciones."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,215 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Índice espacial y distancias Haversine vectorizadas para PathFinder"""
+
+import math
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Kilómetros mínimos por grado (meridiano) para que cada celda mida al menos cell_km
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LON_EQUATOR = 111.32
+
+
+def haversine_km(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    """
+    Distancia de gran círculo en km entre arreglos de coordenadas (con broadcasting).
+
+    Args:
+        lat1, lon1: Coordenadas de origen en grados (escalares o arreglos)
+        lat2, lon2: Coordenadas de destino en grados (escalares o arreglos)
+
+    Returns:
+        Arreglo de distancias en kilómetros
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class StationIndex:
+    """
+    Grilla regular sobre estaciones para búsquedas por radio y k vecinos.
+
+    Las estaciones se agrupan por celda (de al menos cell_km de lado); una
+    consulta sólo calcula distancias Haversine contra las celdas que pueden
+    contener resultados. Las consultas con muchos puntos se agrupan por celda
+    para evaluar cada grupo en una sola operación matricial.
+    """
+
+    def __init__(self, stations: List[Dict[str, Any]], cell_km: float = 0.5):
+        self.stations = list(stations)
+        self.cell_km = cell_km
+        self.lats = np.array([s["lat"] for s in self.stations], dtype=np.float64)
+        self.lons = np.array([s["lon"] for s in self.stations], dtype=np.float64)
+
+        if len(self.stations):
+            self.lat0 = float(self.lats.min())
+            self.lon0 = float(self.lons.min())
+            max_abs_lat = float(np.abs(self.lats).max())
+        else:
+            self.lat0 = self.lon0 = max_abs_lat = 0.0
+        self.dlat = cell_km / KM_PER_DEG_LAT
+        self.dlon = cell_km / (KM_PER_DEG_LON_EQUATOR * max(math.cos(math.radians(max_abs_lat)), 1e-6))
+
+        rows, cols = self._cells(self.lats, self.lons)
+        self.cells: Dict[Tuple[int, int], np.ndarray] = {}
+        if len(self.stations):
+            order = np.lexsort((cols, rows))
+            keys = np.stack([rows[order], cols[order]], axis=1)
+            boundaries = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+            for chunk in np.split(order, boundaries):
+                self.cells[(int(rows[chunk[0]]), int(cols[chunk[0]]))] = chunk
+            self.row_span = (int(rows.min()), int(rows.max()))
+            self.col_span = (int(cols.min()), int(cols.max()))
+        else:
+            self.row_span = self.col_span = (0, 0)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def _cells(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        rows = np.floor((np.asarray(lats) - self.lat0) / self.dlat).astype(np.int64)
+        cols = np.floor((np.asarray(lons) - self.lon0) / self.dlon).astype(np.int64)
+        return rows, cols
+
+    def _candidates(self, row: int, col: int, ring: int) -> np.ndarray:
+        """Índices de estaciones en las celdas a distancia de Chebyshev <= ring."""
+        chunks = [
+            self.cells[(r, c)]
+            for r in range(max(row - ring, self.row_span[0]), min(row + ring, self.row_span[1]) + 1)
+            for c in range(max(col - ring, self.col_span[0]), min(col + ring, self.col_span[1]) + 1)
+            if (r, c) in self.cells
+        ]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def _max_ring(self, row: int, col: int) -> int:
+        """Anillo que cubre toda la grilla desde la celda (row, col)."""
+        return max(
+            abs(row - self.row_span[0]), abs(row - self.row_span[1]),
+            abs(col - self.col_span[0]), abs(col - self.col_span[1]),
+        )
+
+    def query_radius(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Estaciones dentro de un radio, ordenadas por distancia.
+
+        Returns:
+            (índices, distancias en km)
+        """
+        indices, distances = self.query_radius_many([lat], [lon], radius_km)
+        return indices[0], distances[0]
+
+    def query_radius_many(
+        self, lats: Any, lons: Any, radius_km: float
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        Búsqueda por radio para muchos puntos a la vez.
+
+        Returns:
+            Por cada punto, (índices, distancias) ordenados por distancia
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        result_idx: List[np.ndarray] = [np.empty(0, dtype=np.int64)] * len(lats)
+        result_dist: List[np.ndarray] = [np.empty(0)] * len(lats)
+        if not len(self.stations):
+            return result_idx, result_dist
+
+        ring = int(math.ceil(radius_km / self.cell_km))
+        rows, cols = self._cells(lats, lons)
+        for (row, col), group in self._group_by_cell(rows, cols):
+            candidates = self._candidates(row, col, ring)
+            if not len(candidates):
+                continue
+            dist = haversine_km(
+                lats[group][:, None], lons[group][:, None],
+                self.lats[candidates][None, :], self.lons[candidates][None, :],
+            )
+            for q, row_dist in zip(group, dist):
+                inside = np.flatnonzero(row_dist <= radius_km)
+                order = inside[np.argsort(row_dist[inside], kind="stable")]
+                result_idx[q] = candidates[order]
+                result_dist[q] = row_dist[order]
+        return result_idx, result_dist
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Las k estaciones más cercanas a un punto.
+
+        Returns:
+            (índices, distancias en km) ordenados por distancia
+        """
+        indices, distances = self.nearest_many([lat], [lon], k)
+        return indices[0], distances[0]
+
+    def nearest_many(self, lats: Any, lons: Any, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k vecinos más cercanos para muchos puntos.
+
+        Los anillos de celdas se amplían por grupo hasta que la k-ésima
+        distancia del grupo queda dentro del radio cubierto, lo que garantiza
+        que ninguna estación fuera de los anillos puede estar más cerca.
+
+        Returns:
+            Matrices (n_puntos, k) de índices y distancias; se rellenan con -1
+            e inf si hay menos de k estaciones
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        out_idx = np.full((len(lats), k), -1, dtype=np.int64)
+        out_dist = np.full((len(lats), k), np.inf)
+        if not len(self.stations) or k <= 0:
+            return out_idx, out_dist
+
+        take = min(k, len(self.stations))
+        rows, cols = self._cells(lats, lons)
+        for (row, col), group in self._group_by_cell(rows, cols):
+            max_ring = self._max_ring(row, col)
+            ring = 1
+            while True:
+                candidates = self._candidates(row, col, ring)
+                if len(candidates) >= take:
+                    dist = haversine_km(
+                        lats[group][:, None], lons[group][:, None],
+                        self.lats[candidates][None, :], self.lons[candidates][None, :],
+                    )
+                    part = np.argpartition(dist, take - 1, axis=1)[:, :take]
+                    part_dist = np.take_along_axis(dist, part, axis=1)
+                    if ring >= max_ring or part_dist.max() <= ring * self.cell_km:
+                        order = np.argsort(part_dist, axis=1, kind="stable")
+                        out_idx[group, :take] = candidates[np.take_along_axis(part, order, axis=1)]
+                        out_dist[group, :take] = np.take_along_axis(part_dist, order, axis=1)
+                        break
+                ring += 1
+        return out_idx, out_dist
+
+    @staticmethod
+    def _group_by_cell(rows: np.ndarray, cols: np.ndarray) -> List[Tuple[Tuple[int, int], np.ndarray]]:
+        keys = np.stack([rows, cols], axis=1)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.flatnonzero(np.diff(inverse[order])) + 1
+        return [
+            ((int(unique[inverse[chunk[0]]][0]), int(unique[inverse[chunk[0]]][1])), chunk)
+            for chunk in np.split(order, boundaries)
+        ]
@@ -14,11 +14,65 @@
 
 """Tools para PathFinder Agent - Integración con APIs de Google y datos locales"""
 
+import asyncio
+import copy
+import functools
 import os
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import re
+import uuid
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
 import json
 
+import numpy as np
+
+from movility_ai.shared_libraries.constants import MEDELLIN_LANDMARKS, MEDELLIN_ZONES, ZONE_ALIASES
+from movility_ai.sub_agents.flowsense.events import to_epoch
+from movility_ai.sub_agents.flowsense.predictor import TRAFFIC_EVENTS
+from movility_ai.sub_agents.pathfinder.encicla import AvailabilityHistory
+from movility_ai.sub_agents.pathfinder.fares import FareEngine
+from movility_ai.sub_agents.pathfinder.geocoder import Gazetteer, default_cache_path
+from movility_ai.sub_agents.pathfinder.pareto import Graph, pareto_search, rank_by_priority
+from movility_ai.sub_agents.pathfinder.providers import AsyncMobilityProvider, LocalMockProvider
+from movility_ai.sub_agents.pathfinder.isochrone import (
+    HEX_CELL_KM,
+    arrival_times,
+    convex_hull,
+    hex_grid,
+    reach_radius_km,
+)
+from movility_ai.sub_agents.pathfinder.raptor import MAX_WAIT_MIN, RaptorRouter, day_type
+from movility_ai.sub_agents.pathfinder.road_network import ACCESS_SPEED_KMH, BIKE_PROFILES, RoadRouter
+from movility_ai.sub_agents.pathfinder.route_cache import RouteCache
+from movility_ai.sub_agents.pathfinder.spatial import StationIndex, haversine_km
+from movility_ai.sub_agents.pathfinder.transit_network import (
+    INF,
+    TransitNetwork,
+    line_mode,
+)
+from movility_ai.sub_agents.pathfinder.trip_sessions import (
+    ActiveTrips,
+    Segment,
+    road_segments,
+    transit_segments,
+)
+from movility_ai.sub_agents.pathfinder.travel_matrix import direct_matrix, road_matrix, transit_matrix
+from movility_ai.sub_agents.pathfinder.weather_service import (
+    WEATHER_FRESH_SECONDS,
+    WEATHER_STALE_SECONDS,
+    WeatherService,
+)
+from movility_ai.sub_agents.pathfinder.zone_matrix import (
+    DETOUR_FACTOR,
+    SPEED_KMH,
+    TAXI_COP_PER_KM,
+    TAXI_MIN_COP,
+    ZoneMatrix,
+)
+from movility_ai.tools.provider_client import ProviderClient, ProviderError, get_provider_client
+
 # Datos hardcodeados para hackathon (reemplazar con APIs reales)
 ENCICLA_STATIONS_MOCK = [
     {"id": 1, "name": "Estación Parque Lleras", "lat": 6.2088, "lon": -75.5664, "bikes_available": 12, "docks_available": 8},
@@ -28,6 +82,17 @@ ENCICLA_STATIONS_MOCK = [
     {"id": 5, "name": "Estación Laureles", "lat": 6.2447, "lon": -75.5956, "bikes_available": 10, "docks_available": 10},
 ]
 
+# Índice de grilla sobre las estaciones para búsquedas por radio y k vecinos
+ENCICLA_INDEX = StationIndex(ENCICLA_STATIONS_MOCK)
+
+# Historial acotado de disponibilidad por estación (capacidad = bicis + anclajes)
+ENCICLA_POSITION = {station["id"]: i for i, station in enumerate(ENCICLA_STATIONS_MOCK)}
+ENCICLA_AVAILABILITY = AvailabilityHistory(
+    [station["bikes_available"] + station["docks_available"] for station in ENCICLA_STATIONS_MOCK]
+)
+for _i, _station in enumerate(ENCICLA_STATIONS_MOCK):
+    ENCICLA_AVAILABILITY.record(_i, datetime.now(), _station["bikes_available"], _station["docks_available"])
+
 METRO_LINES_MOCK = {
     "linea_a": ["Niquía", "Bello", "Madera", "Acevedo", "Tricentenario", "Caribe", "Universidad", "Hospital", "Prado", "Parque Berrío", "San Antonio", "Alpujarra", "Exposiciones", "Industriales", "Poblado", "Aguacatala", "Ayurá", "Envigado", "Itagüí", "Sabaneta", "La Estrella"],
     "linea_b": ["San Antonio", "Cisneros", "Parque Berrío"],
@@ -38,6 +103,181 @@ METRO_LINES_MOCK = {
     "metrocable_m": ["El Pinal", "La Montaña"],
 }
 
+# Coordenadas aproximadas (lat, lon) de las estaciones
+METRO_STATION_COORDS_MOCK = {
+    "Niquía": (6.3375, -75.5440), "Bello": (6.3300, -75.5530), "Madera": (6.3150, -75.5550),
+    "Acevedo": (6.3002, -75.5585), "Tricentenario": (6.2905, -75.5650), "Caribe": (6.2775, -75.5695),
+    "Universidad": (6.2690, -75.5660), "Hospital": (6.2630, -75.5635), "Prado": (6.2570, -75.5665),
+    "Parque Berrío": (6.2505, -75.5685), "San Antonio": (6.2468, -75.5700), "Alpujarra": (6.2425, -75.5730),
+    "Exposiciones": (6.2365, -75.5740), "Industriales": (6.2290, -75.5755), "Poblado": (6.2125, -75.5780),
+    "Aguacatala": (6.1935, -75.5820), "Ayurá": (6.1865, -75.5860), "Envigado": (6.1750, -75.5920),
+    "Itagüí": (6.1630, -75.6050), "Sabaneta": (6.1560, -75.6175), "La Estrella": (6.1525, -75.6265),
+    "Cisneros": (6.2480, -75.5760), "Andalucía": (6.2935, -75.5530), "Popular": (6.2960, -75.5480),
+    "Santo Domingo": (6.2935, -75.5420), "San Javier": (6.2560, -75.6135), "Juan XXIII": (6.2570, -75.6210),
+    "Vallejuelos": (6.2600, -75.6290), "La Aurora": (6.2640, -75.6380), "El Tambo": (6.2960, -75.5370),
+    "Carpinelo": (6.2990, -75.5320), "La Sierra": (6.2330, -75.5380), "Oriente": (6.2340, -75.5440),
+    "Villa Sierra": (6.2300, -75.5350), "Cabañas": (6.2680, -75.5430), "Miraflores": (6.2420, -75.5530),
+    "El Pinal": (6.2440, -75.5500), "La Montaña": (6.2470, -75.5420),
+}
+
+# Red de transporte masivo con tabla de caminos mínimos precalculada al importar
+TRANSIT_NETWORK = TransitNetwork(METRO_LINES_MOCK)
+
+# Horarios en arreglos planos (frecuencias por franja) para RAPTOR
+TRANSIT_ROUTER = RaptorRouter(TRANSIT_NETWORK)
+
+# Tarifas del transporte público compiladas en tabla (ver fares.FARE_PRODUCTS)
+FARE_ENGINE = FareEngine()
+
+# Tarifa de un viaje en el sistema integrado Metro/Metrocable con Cívica
+METRO_FARE_COP = FARE_ENGINE.fare([{"service": "metro"}])
+
+
+@functools.lru_cache(maxsize=None)
+def get_zone_matrix() -> ZoneMatrix:
+    """
+    Matriz zona-zona (modo x hora de la semana) mapeada en memoria.
+
+    El archivo .npy se calcula offline (ver precompute) y se abre al iniciar
+    el agente con preload_routing_data; todos los procesos comparten sus
+    páginas. Si falta o está desactualizado se calcula al abrirlo.
+    """
+    return ZoneMatrix.load(TRANSIT_NETWORK, METRO_STATION_COORDS_MOCK, METRO_FARE_COP)
+
+
+@functools.lru_cache(maxsize=None)
+def get_geocoder() -> Gazetteer:
+    """
+    Nomenclátor local (zonas, estaciones de Metro y EnCicla, sitios de interés)
+    para ubicar orígenes y destinos en texto libre sin geocodificar en línea.
+
+    Se crea en la primera consulta, así el caché en disco se lee entonces.
+    """
+    return Gazetteer(
+        [
+            *(
+                {
+                    "name": zone["name"],
+                    "lat": zone["lat"],
+                    "lon": zone["lon"],
+                    "kind": "zone",
+                    "aliases": [alias for alias, target in ZONE_ALIASES.items() if target == zone_id],
+                }
+                for zone_id, zone in MEDELLIN_ZONES.items()
+            ),
+            *(
+                {"name": name, "lat": lat, "lon": lon, "kind": "metro"}
+                for name, (lat, lon) in METRO_STATION_COORDS_MOCK.items()
+            ),
+            *({**landmark, "kind": "landmark"} for landmark in MEDELLIN_LANDMARKS),
+            *(
+                {"name": station["name"], "lat": station["lat"], "lon": station["lon"], "kind": "encicla"}
+                for station in ENCICLA_STATIONS_MOCK
+            ),
+        ],
+        cache_path=default_cache_path(),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_road_router() -> RoadRouter:
+    """
+    Enrutador en carro y en bici sobre la red vial.
+
+    La jerarquía de contracción se preprocesa offline (ver precompute) en un
+    .npz que se abre al iniciar el agente con preload_routing_data. Si falta
+    o está desactualizado se construye al abrirlo.
+    """
+    return RoadRouter.load()
+
+
+def preload_routing_data() -> None:
+    """
+    Abre los datos precalculados al iniciar el agente, fuera de las consultas.
+
+    Así la primera consulta no paga la verificación de huellas ni, si
+    faltan los archivos, su cálculo.
+    """
+    get_zone_matrix()
+    get_road_router()
+
+
+# Caché de rutas compartida por todas las consultas del proceso
+ROUTE_CACHE_ENABLED = os.getenv("ENABLE_CACHE", "True").lower() in ("1", "true", "yes")
+ROUTE_CACHE = RouteCache(max_entries=int(os.getenv("ROUTE_CACHE_MAX_ENTRIES", "2048")))
+
+# Clima compartido por todas las rutas del proceso (consulta al proveedor con _fetch_weather)
+WEATHER_SERVICE = WeatherService(
+    lambda location: _fetch_weather(location),
+    fresh_seconds=float(os.getenv("WEATHER_FRESH_SECONDS", WEATHER_FRESH_SECONDS)),
+    stale_seconds=float(os.getenv("WEATHER_STALE_SECONDS", WEATHER_STALE_SECONDS)),
+)
+
+# Viajes en curso indexados por los tramos que recorren e incidentes vigentes
+# por id; un incidente sólo re-enruta las sesiones que cruzan sus tramos
+ACTIVE_TRIPS = ActiveTrips()
+ACTIVE_INCIDENTS: Dict[str, Dict[str, Any]] = {}
+
+# Distancia máxima (km) entre un incidente y el nodo vial que afecta
+INCIDENT_RADIUS_KM = 0.5
+
+# Multiplicador del tiempo en los tramos viales del incidente según su severidad
+INCIDENT_SLOWDOWN = {"low": 1.3, "medium": 2.0, "high": 4.0}
+
+# Demora (min) en los tramos de Metro/Metrocable de un incidente en una estación
+INCIDENT_TRANSIT_DELAY_MIN = {"low": 3, "medium": 8, "high": 15}
+
+# Celdas a partir de las cuales travel_time_matrix reparte filas entre procesos
+MATRIX_PARALLEL_MIN_CELLS = 250_000
+
+# Modos base que se combinan en las rutas multimodales
+BASE_MODES = ("walking", "bicycling", "transit", "driving")
+
+# Emisiones por modo (kg CO2 por km)
+CO2_PER_KM = {
+    "walking": 0,
+    "bicycling": 0,
+    "transit": 0.05,  # Metro es muy eficiente
+    "driving": 0.12,  # Promedio carro gasolina
+}
+
+# Nombre de cada combinación de modos del frente de Pareto
+ROUTE_NAMES = {
+    ("transit",): "Ruta Metro/Bus",
+    ("bicycling", "transit"): "Ruta Bici + Metro",
+    ("walking",): "Ruta a Pie",
+    ("driving",): "Ruta en Carro/Taxi",
+}
+
+# Costo por defecto cuando el proveedor no informa tarifa (COP)
+DEFAULT_COST_COP = {
+    "driving": 15000,  # Taxi aproximado
+    "transit": METRO_FARE_COP,
+    "walking": 0,
+    "bicycling": 0,
+}
+
+# Servicio tarifario de cada tipo de vehículo de Directions; los buses de
+# Metroplus y los alimentadores del Metro se reconocen por línea y operador
+GOOGLE_VEHICLE_SERVICES = {
+    "SUBWAY": "metro",
+    "METRO_RAIL": "metro",
+    "HEAVY_RAIL": "metro",
+    "GONDOLA_LIFT": "metrocable",
+    "CABLE_CAR": "metrocable",
+    "TRAM": "tranvia",
+    "BUS": "bus",
+    "TROLLEYBUS": "bus",
+}
+
+# Probabilidad de lluvia estimada según el tipo de clima de OpenWeather
+RAIN_PROBABILITY_BY_WEATHER = {
+    "Thunderstorm": 95,
+    "Rain": 85,
+    "Drizzle": 70,
+    "Clouds": 30,
+}
+
 WEATHER_MOCK_DATA = {
     "clear": {"condition": "Despejado", "temp": 24, "rain_probability": 5},
     "cloudy": {"condition": "Nublado", "temp": 22, "rain_probability": 30},
@@ -45,22 +285,143 @@ WEATHER_MOCK_DATA = {
 }
 
 
-def get_route_google_maps(origin: str, destination: str, mode: str = "driving") -> Dict[str, Any]:
+def _parse_departure_time(current_time: Optional[str]) -> datetime:
+    """Convierte la hora del viaje (ISO o 'now') en datetime; ante error usa ahora."""
+    if not current_time or current_time.lower() == 'now':
+        return datetime.now()
+    try:
+        return datetime.fromisoformat(current_time)
+    except (ValueError, AttributeError):
+        return datetime.now()
+
+
+def get_route_google_maps(
+    origin: str,
+    destination: str,
+    mode: str = "driving",
+    departure_time: Optional[str] = None,
+    weather_condition: Optional[str] = None,
+    bike_profile: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Obtiene información de ruta usando Google Maps API (simulado con datos mock).
     
+    Las respuestas se guardan en una caché LRU por origen, destino, modo,
+    franja de salida, clima y perfil de ciclista, con vigencia distinta
+    para cada modo.
+    
     Args:
         origin: Dirección o coordenadas de origen
         destination: Dirección o coordenadas de destino
         mode: Modo de transporte (driving, walking, bicycling, transit)
+        departure_time: Hora de salida (ISO format), None para ahora
+        weather_condition: Condición climática actual, si se conoce
+        bike_profile: Perfil de ciclista para bicycling ("pedal" o "ebike");
+            las rutas en bici consideran la pendiente
     
     Returns:
         Diccionario con información de la ruta
     """
-    # TODO: Integrar con Google Maps Directions API real
-    # import googlemaps
-    # gmaps = googlemaps.Client(key=os.getenv('GOOGLE_MAPS_API_KEY'))
-    # result = gmaps.directions(origin, destination, mode=mode)
+    if bike_profile is not None and bike_profile not in BIKE_PROFILES:
+        return {"error": f"Perfil de ciclista desconocido: {bike_profile}", "available_profiles": list(BIKE_PROFILES)}
+    departure = _parse_departure_time(departure_time)
+    if mode == "bicycling":
+        bike_profile = bike_profile or get_road_router().default_bike_profile
+    if not ROUTE_CACHE_ENABLED:
+        return _fetch_route(origin, destination, mode, departure, bike_profile)
+    
+    variant = bike_profile if mode == "bicycling" else None
+    key = ROUTE_CACHE.make_key(origin, destination, mode, departure, weather_condition, variant)
+    route = ROUTE_CACHE.get(key)
+    if route is None:
+        route = _fetch_route(origin, destination, mode, departure, bike_profile)
+        ROUTE_CACHE.set(key, route)
+    return route
+
+
+def get_route_cache_stats() -> Dict[str, Any]:
+    """
+    Obtiene los contadores de la caché de rutas.
+    
+    Returns:
+        Aciertos, fallos, desalojos, expiraciones, tamaño y tasa de aciertos
+    """
+    return ROUTE_CACHE.stats()
+
+
+def _fetch_route(
+    origin: str, destination: str, mode: str, departure: datetime, bike_profile: Optional[str] = None
+) -> Dict[str, Any]:
+    """Consulta la ruta al proveedor (sin caché)."""
+    # Llegada más temprana con RAPTOR sobre los horarios, caminando desde el
+    # origen a su estación más cercana y de la última estación al destino;
+    # sin un tren dentro de la espera máxima no hay servicio
+    if mode == "transit":
+        access = _station_access(origin)
+        egress = _station_access(destination)
+        if access and egress and access[0] != egress[0]:
+            stations = TRANSIT_NETWORK.stations
+            itinerary = TRANSIT_ROUTER.route(
+                stations[access[0]], stations[egress[0]], departure + timedelta(minutes=access[1])
+            )
+            if itinerary is None:
+                return {
+                    "error": "Sin servicio a esa hora",
+                    "mode": "transit",
+                    "departure_time": departure.strftime("%H:%M"),
+                }
+            services = [line_mode(line) for line in itinerary["lines"]]
+            steps = list(itinerary["steps"])
+            if access[1] >= 0.5:
+                steps.insert(0, _walk_step(f"Camina a estación {stations[access[0]]}", access[1]))
+            if egress[1] >= 0.5:
+                steps.append(_walk_step("Camina al destino", egress[1]))
+            duration = access[1] + itinerary["duration"] + egress[1]
+            return {
+                "duration": round(duration),
+                "distance": round(sum(step["distance"] for step in steps), 1),
+                "cost": FARE_ENGINE.fare([{"service": service} for service in services]),
+                "services": services,
+                "transfers": itinerary["transfers"],
+                "departure_time": itinerary["departure_time"],
+                "arrival_time": (departure + timedelta(minutes=duration)).strftime("%H:%M"),
+                "stations": itinerary["stations"],
+                "steps": steps,
+            }
+    
+    # Google Maps Directions API si hay API key; ante fallas, datos mock
+    client = get_provider_client("google_maps")
+    if client is not None:
+        try:
+            return _fetch_directions(client, origin, destination, mode, departure)
+        except ProviderError:
+            pass
+    
+    # Sin Google Maps: carro sobre la red vial local con la congestión de
+    # cada tramo a la hora en que se recorre
+    if mode == "driving":
+        origin_coords = _resolve_coordinates(origin)
+        destination_coords = _resolve_coordinates(destination)
+        if origin_coords and destination_coords:
+            road = get_road_router().route(origin_coords, destination_coords, departure)
+            if road:
+                return _driving_result(road)
+    
+    # Bici sobre la misma red con costos según la pendiente y el perfil de ciclista
+    if mode == "bicycling":
+        origin_coords = _resolve_coordinates(origin)
+        destination_coords = _resolve_coordinates(destination)
+        if origin_coords and destination_coords:
+            ride = get_road_router().bike_route(origin_coords, destination_coords, bike_profile)
+            if ride:
+                return {
+                    "duration": max(1, round(ride["duration"])),
+                    "distance": round(ride["distance"], 1),
+                    "cost": 0,
+                    "ascent": round(ride["ascent"]),
+                    "bike_profile": ride["profile"],
+                    "steps": ride["steps"],
+                }
     
     # Mock data para hackathon
     mock_routes = {
@@ -96,7 +457,8 @@ def get_route_google_maps(origin: str, destination: str, mode: str = "driving")
         "transit": {
             "duration": 40,
             "distance": 11.0,
-            "cost": 3050,  # Tarifa Metro Medellín 2025
+            "cost": METRO_FARE_COP,
+            "services": ["metro"],
             "steps": [
                 {"instruction": "Camina a estación Universidad", "duration": 5, "distance": 0.4, "mode": "walking"},
                 {"instruction": "Toma Metro Línea A hacia La Estrella", "duration": 25, "distance": 9.5, "mode": "metro"},
@@ -109,22 +471,125 @@ def get_route_google_maps(origin: str, destination: str, mode: str = "driving")
     return mock_routes.get(mode, mock_routes["driving"])
 
 
+def _walk_step(instruction: str, minutes: float) -> Dict[str, Any]:
+    """Paso a pie de un itinerario de transporte público."""
+    return {
+        "instruction": instruction,
+        "duration": round(minutes),
+        "distance": round(minutes / 60.0 * SPEED_KMH["walking"], 1),
+        "mode": "walking",
+    }
+
+
+def _driving_result(road: Dict[str, Any]) -> Dict[str, Any]:
+    """Adapta una ruta de RoadRouter al formato de las tools (con sus nodos viales)."""
+    return {
+        "duration": max(1, round(road["duration"])),
+        "free_flow_duration": max(1, round(road["free_flow_duration"])),
+        "distance": round(road["distance"], 1),
+        "cost": int(max(TAXI_MIN_COP, road["distance"] * TAXI_COP_PER_KM)),
+        "nodes": road["nodes"],
+        "steps": road["steps"],
+    }
+
+
+def _fetch_directions(
+    client: ProviderClient,
+    origin: str,
+    destination: str,
+    mode: str,
+    departure: datetime
+) -> Dict[str, Any]:
+    """Consulta Google Maps Directions API y adapta la respuesta al formato de las tools."""
+    params = {
+        "origin": origin,
+        "destination": destination,
+        "mode": mode,
+        "language": "es",
+        "region": "co",
+    }
+    if mode in ("driving", "transit"):
+        params["departure_time"] = max(int(departure.timestamp()), int(datetime.now().timestamp()))
+    data = client.get_json("/directions/json", params)
+    if data.get("status") != "OK" or not data.get("routes"):
+        raise ProviderError(f"Directions API: {data.get('status', 'sin rutas')}")
+    
+    route = data["routes"][0]
+    leg = route["legs"][0]
+    fare = route.get("fare", {}).get("value")
+    fare_legs = _google_fare_legs(leg) if mode == "transit" else []
+    if fare is None and fare_legs:
+        fare = FARE_ENGINE.fare(fare_legs)
+    result = {
+        "duration": round(leg.get("duration_in_traffic", leg["duration"])["value"] / 60),
+        "distance": round(leg["distance"]["value"] / 1000, 1),
+        "cost": int(fare) if fare is not None else DEFAULT_COST_COP.get(mode, 0),
+        "steps": [
+            {
+                "instruction": re.sub(r"<[^>]+>", "", step.get("html_instructions", "")),
+                "duration": round(step["duration"]["value"] / 60),
+                "distance": round(step["distance"]["value"] / 1000, 1),
+                "mode": step.get("travel_mode", mode).lower(),
+            }
+            for step in leg.get("steps", [])
+        ],
+    }
+    if "duration_in_traffic" in leg:
+        result["free_flow_duration"] = round(leg["duration"]["value"] / 60)
+    if fare_legs:
+        result["services"] = [fare_leg["service"] for fare_leg in fare_legs]
+    return result
+
+
+def _google_fare_legs(leg: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Tramos pagos de una ruta de Directions (servicio y minutos de subida/bajada)."""
+    fare_legs = []
+    for step in leg.get("steps", []):
+        details = step.get("transit_details")
+        if not details:
+            continue
+        line = details.get("line", {})
+        name = f"{line.get('name', '')} {line.get('short_name', '')}".lower()
+        agencies = " ".join(agency.get("name", "") for agency in line.get("agencies", [])).lower()
+        service = GOOGLE_VEHICLE_SERVICES.get(line.get("vehicle", {}).get("type"), "bus")
+        if service == "bus" and "metroplus" in name:
+            service = "metroplus"
+        elif service == "bus" and "metro" in agencies:
+            service = "alimentador"
+        fare_legs.append({
+            "service": service,
+            "board": details.get("departure_time", {}).get("value", 0) / 60.0,
+            "alight": details.get("arrival_time", {}).get("value", 0) / 60.0,
+        })
+    return fare_legs
+
+
 def get_weather_conditions(location: str = "Medellín") -> Dict[str, Any]:
     """
     Obtiene condiciones climáticas actuales y pronóstico.
     
+    Se sirve desde el servicio de clima: las consultas simultáneas para la
+    misma ubicación comparten una sola llamada al proveedor y el valor se
+    reutiliza (y refresca en segundo plano) durante unos minutos.
+    
     Args:
         location: Ciudad o coordenadas
     
     Returns:
         Diccionario con información del clima
     """
-    # TODO: Integrar con OpenWeather API real
-    # import requests
-    # api_key = os.getenv('OPENWEATHER_API_KEY')
-    # url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}"
-    # response = requests.get(url)
-    # return response.json()
+    return WEATHER_SERVICE.get(location)
+
+
+def _fetch_weather(location: str) -> Dict[str, Any]:
+    """Consulta el clima al proveedor (sin caché)."""
+    # OpenWeather API si hay API key; ante fallas, datos mock
+    client = get_provider_client("openweather")
+    if client is not None:
+        try:
+            return _fetch_openweather(client, location)
+        except ProviderError:
+            pass
     
     # Mock data para hackathon
     hour = datetime.now().hour
@@ -145,6 +610,29 @@ def get_weather_conditions(location: str = "Medellín") -> Dict[str, Any]:
     }
 
 
+def _fetch_openweather(client: ProviderClient, location: str) -> Dict[str, Any]:
+    """Consulta OpenWeather y adapta la respuesta al formato de get_weather_conditions."""
+    data = client.get_json("/weather", {"q": location, "units": "metric", "lang": "es"})
+    try:
+        main = data["weather"][0]["main"]
+        current = {
+            "condition": data["weather"][0]["description"].capitalize(),
+            "temp": round(data["main"]["temp"]),
+            # El clima actual no trae probabilidad: se estima por el tipo de clima
+            "rain_probability": RAIN_PROBABILITY_BY_WEATHER.get(main, 5),
+        }
+    except (KeyError, IndexError, TypeError) as exc:
+        raise ProviderError("Respuesta de OpenWeather incompleta") from exc
+    
+    hour = datetime.now().hour
+    return {
+        "location": location,
+        "current": current,
+        "timestamp": datetime.now().isoformat(),
+        "forecast_3h": WEATHER_MOCK_DATA["rainy" if hour >= 15 else "clear"],
+    }
+
+
 def get_encicla_stations(lat: Optional[float] = None, lon: Optional[float] = None, radius_km: float = 2.0) -> List[Dict[str, Any]]:
     """
     Obtiene estaciones de EnCicla cercanas.
@@ -155,19 +643,494 @@ def get_encicla_stations(lat: Optional[float] = None, lon: Optional[float] = Non
         radius_km: Radio de búsqueda en kilómetros
     
     Returns:
-        Lista de estaciones con disponibilidad
+        Lista de estaciones con disponibilidad, ordenadas por distancia
     """
     # TODO: Integrar con API real de EnCicla si existe
-    # Por ahora retornamos todas las estaciones mock
     
-    if lat and lon:
-        # Filtrar por distancia (implementación simplificada)
-        # En producción usar fórmula de Haversine
-        return ENCICLA_STATIONS_MOCK[:3]
+    if lat is not None and lon is not None:
+        # Distancia Haversine sobre las celdas del índice que cubren el radio
+        indices, distances = ENCICLA_INDEX.query_radius(lat, lon, radius_km)
+        return [
+            {**ENCICLA_INDEX.stations[i], "distance_km": round(float(d), 2)}
+            for i, d in zip(indices, distances)
+        ]
     
     return ENCICLA_STATIONS_MOCK
 
 
+def get_nearest_encicla_stations(
+    lat: float,
+    lon: float,
+    k: int = 3,
+    min_bikes: int = 0,
+    min_docks: int = 0,
+    arrival_time: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Obtiene las k estaciones de EnCicla más cercanas a un punto.
+    
+    Con arrival_time se filtra con la disponibilidad pronosticada para esa
+    hora en lugar de la actual.
+    
+    Args:
+        lat: Latitud de referencia
+        lon: Longitud de referencia
+        k: Número de estaciones a retornar
+        min_bikes: Bicicletas disponibles mínimas para considerar la estación
+        min_docks: Anclajes libres mínimos (para dejar la bici)
+        arrival_time: Hora de llegada a la estación (ISO format)
+    
+    Returns:
+        Lista de estaciones ordenadas por distancia
+    """
+    arrival = _parse_departure_time(arrival_time) if arrival_time else None
+    candidates = k if min_bikes <= 0 and min_docks <= 0 else len(ENCICLA_INDEX)
+    indices, distances = ENCICLA_INDEX.nearest(lat, lon, candidates)
+    stations = []
+    for i, d in zip(indices, distances):
+        if i < 0:
+            break
+        station = {**ENCICLA_INDEX.stations[i], "distance_km": round(float(d), 2)}
+        bikes, docks = station["bikes_available"], station["docks_available"]
+        if arrival is not None:
+            bikes, docks = ENCICLA_AVAILABILITY.forecast(ENCICLA_POSITION[station["id"]], arrival)
+            station["forecast_bikes"] = round(bikes, 1)
+            station["forecast_docks"] = round(docks, 1)
+        if bikes < min_bikes or docks < min_docks:
+            continue
+        stations.append(station)
+        if len(stations) == k:
+            break
+    return stations
+
+
+def record_encicla_availability(
+    station_id: int,
+    bikes_available: int,
+    docks_available: int,
+    when: Optional[datetime] = None
+) -> None:
+    """
+    Registra una lectura de disponibilidad de una estación EnCicla.
+    
+    Actualiza la disponibilidad actual y el historial usado para pronosticar.
+    
+    Args:
+        station_id: Id de la estación
+        bikes_available: Bicicletas disponibles
+        docks_available: Anclajes libres
+        when: Hora de la lectura (por defecto ahora)
+    """
+    position = ENCICLA_POSITION[station_id]
+    ENCICLA_AVAILABILITY.record(position, when or datetime.now(), bikes_available, docks_available)
+    station = ENCICLA_STATIONS_MOCK[position]
+    station["bikes_available"] = bikes_available
+    station["docks_available"] = docks_available
+
+
+def get_zone_travel_time(
+    origin_zone: str,
+    destination_zone: str,
+    mode: str = "transit",
+    departure_time: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Tiempo y costo típicos entre dos zonas de Medellín (p. ej. Laureles → El Poblado).
+
+    Responde desde la matriz precalculada por hora de la semana, sin
+    consultar proveedores externos.
+
+    Args:
+        origin_zone: Zona de origen (nombre o id, p. ej. "Laureles")
+        destination_zone: Zona de destino
+        mode: Modo de transporte (driving, walking, bicycling, transit)
+        departure_time: Hora de salida en ISO o 'now'
+
+    Returns:
+        Diccionario con duración en minutos y costo en COP
+    """
+    departure = _parse_departure_time(departure_time)
+    result = get_zone_matrix().lookup(origin_zone, destination_zone, mode, departure)
+    if result is None:
+        return {
+            "error": f"Zona o modo desconocido: {origin_zone} → {destination_zone} ({mode})",
+            "available_zones": [zone["name"] for zone in get_zone_matrix().zones.values()],
+        }
+    minutes, cost = result
+    if minutes == float("inf"):
+        return {
+            "origin": origin_zone,
+            "destination": destination_zone,
+            "mode": mode,
+            "error": "Sin servicio a esa hora",
+        }
+    return {
+        "origin": origin_zone,
+        "destination": destination_zone,
+        "mode": mode,
+        "departure_time": departure.strftime("%H:%M"),
+        "duration": int(round(minutes)),
+        "cost": int(round(cost)),
+    }
+
+
+def compute_isochrone(
+    origin: str,
+    minutes: int = 20,
+    modes: Optional[List[str]] = None,
+    departure_time: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Todo lo alcanzable desde un origen en N minutos (p. ej. "¿a dónde llego en 20 minutos desde Laureles?").
+    
+    Hace un solo barrido acotado: RAPTOR de uno a todos sobre el Metro desde
+    las estaciones a las que se llega caminando, Dijkstra acotado sobre la
+    red vial para el carro (con el tráfico de la hora) y tramos finales a pie, en bici o por calles
+    locales evaluados con broadcasting sobre zonas, estaciones y una grilla
+    hexagonal.
+    
+    Args:
+        origin: Lugar de origen (zona, estación, sitio o "lat,lon")
+        minutes: Tiempo disponible en minutos
+        modes: Modos a combinar (walking, bicycling, transit, driving); por
+            defecto caminar y transporte público
+        departure_time: Hora de salida en ISO o 'now'
+    
+    Returns:
+        Estaciones y zonas alcanzables con su tiempo, hexágonos y polígono envolvente
+    """
+    origin_coords = _resolve_coordinates(origin)
+    if origin_coords is None:
+        return {"error": f"No se pudo ubicar el origen: {origin}"}
+    modes = [mode for mode in (modes or ["walking", "transit"]) if mode in BASE_MODES]
+    departure = _parse_departure_time(departure_time)
+    start = departure.hour * 60 + departure.minute
+    lat, lon = origin_coords
+    
+    # Semillas: lugares alcanzados con su minuto de llegada y la velocidad del último tramo
+    seed_lat, seed_lon, seed_minutes, seed_speed, seed_mode = [lat], [lon], [0.0], [SPEED_KMH["walking"]], ["walking"]
+    if "bicycling" in modes:
+        seed_lat.append(lat)
+        seed_lon.append(lon)
+        seed_minutes.append(0.0)
+        seed_speed.append(SPEED_KMH["bicycling"])
+        seed_mode.append("bicycling")
+    
+    stations = TRANSIT_NETWORK.stations
+    station_lat = np.array([METRO_STATION_COORDS_MOCK[name][0] for name in stations])
+    station_lon = np.array([METRO_STATION_COORDS_MOCK[name][1] for name in stations])
+    walk_to_station = haversine_km(lat, lon, station_lat, station_lon) * DETOUR_FACTOR / SPEED_KMH["walking"] * 60.0
+    station_minutes = np.where(walk_to_station <= minutes, walk_to_station, np.inf)
+    if "transit" in modes:
+        sources = {i: start + float(t) for i, t in enumerate(walk_to_station) if t <= minutes}
+        timetable = TRANSIT_ROUTER.timetables[day_type(departure)]
+        station_minutes = np.array(TRANSIT_ROUTER.reach(sources, start + minutes, timetable)) - start
+        reached = np.isfinite(station_minutes)
+        seed_lat.extend(station_lat[reached])
+        seed_lon.extend(station_lon[reached])
+        seed_minutes.extend(station_minutes[reached])
+        seed_speed.extend([SPEED_KMH["walking"]] * int(reached.sum()))
+        seed_mode.extend(["transit"] * int(reached.sum()))
+    
+    if "driving" in modes:
+        router = get_road_router()
+        node_minutes = router.reach(origin_coords, minutes, departure)
+        reached = np.isfinite(node_minutes)
+        seed_lat.extend(router.graph["node_lat"][reached])
+        seed_lon.extend(router.graph["node_lon"][reached])
+        seed_minutes.extend(node_minutes[reached])
+        seed_speed.extend([ACCESS_SPEED_KMH] * int(reached.sum()))
+        seed_mode.extend(["driving"] * int(reached.sum()))
+    
+    seeds = (np.array(seed_lat), np.array(seed_lon), np.array(seed_minutes), np.array(seed_speed))
+    
+    def reachable(lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return arrival_times(*seeds, lats, lons, DETOUR_FACTOR)
+    
+    zone_ids = list(MEDELLIN_ZONES)
+    zone_minutes, zone_seed = reachable(
+        np.array([MEDELLIN_ZONES[z]["lat"] for z in zone_ids]),
+        np.array([MEDELLIN_ZONES[z]["lon"] for z in zone_ids]),
+    )
+    zones = sorted(
+        (
+            {
+                "id": zone_id,
+                "name": MEDELLIN_ZONES[zone_id]["name"],
+                "minutes": int(round(zone_minutes[i])),
+                "mode": seed_mode[zone_seed[i]],
+            }
+            for i, zone_id in enumerate(zone_ids) if zone_minutes[i] <= minutes
+        ),
+        key=lambda zone: zone["minutes"],
+    )
+    
+    reachable_stations = [
+        {"name": stations[i], "type": "metro", "minutes": int(round(station_minutes[i]))}
+        for i in np.argsort(station_minutes) if station_minutes[i] <= minutes
+    ]
+    bike_minutes, _ = reachable(
+        np.array([station["lat"] for station in ENCICLA_STATIONS_MOCK]),
+        np.array([station["lon"] for station in ENCICLA_STATIONS_MOCK]),
+    )
+    reachable_stations.extend(
+        {"name": station["name"], "type": "encicla", "minutes": int(round(bike_minutes[i]))}
+        for i, station in enumerate(ENCICLA_STATIONS_MOCK) if bike_minutes[i] <= minutes
+    )
+    
+    radius = reach_radius_km(lat, lon, *seeds, minutes, DETOUR_FACTOR)
+    hex_lat, hex_lon = hex_grid(lat, lon, radius)
+    hex_minutes, _ = reachable(hex_lat, hex_lon)
+    inside = hex_minutes <= minutes
+    hexagons = [
+        {"center": [round(float(a), 6), round(float(b), 6)], "minutes": int(round(t))}
+        for a, b, t in zip(hex_lat[inside], hex_lon[inside], hex_minutes[inside])
+    ]
+    polygon = convex_hull([tuple(hexagon["center"]) for hexagon in hexagons])
+    
+    return {
+        "origin": origin,
+        "origin_location": {"lat": lat, "lon": lon},
+        "minutes": minutes,
+        "modes": modes,
+        "departure_time": departure.strftime("%H:%M"),
+        "stations": reachable_stations,
+        "zones": zones,
+        "cell_km": HEX_CELL_KM,
+        "hexagons": hexagons,
+        "polygon": [list(point) for point in polygon],
+    }
+
+
+def find_best_departure_times(
+    origin: str,
+    destination: str,
+    window_start: str = "06:00",
+    window_end: str = "09:00",
+    step_minutes: int = 5,
+    date: Optional[str] = None,
+    modes: Optional[List[str]] = None,
+    arrive_by: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Mejores horas para salir dentro de una ventana (p. ej. cada 5 minutos de 6:00 a 9:00).
+    
+    No repite una ruta por cada hora: el Metro se resuelve con una sola
+    búsqueda de perfil (rRAPTOR) sobre todas las salidas de la ventana y el
+    carro con un Dijkstra dependiente del tiempo por franja de 15 minutos,
+    evaluando los caminos candidatos para todas las horas a la vez.
+    
+    Args:
+        origin: Lugar de origen (estación, zona, sitio o "lat,lon")
+        destination: Lugar de destino
+        window_start: Primera hora de salida (HH:MM)
+        window_end: Última hora de salida (HH:MM)
+        step_minutes: Minutos entre horas de salida evaluadas
+        date: Fecha del viaje (YYYY-MM-DD), por defecto hoy
+        modes: Modos a comparar (transit, driving); por defecto ambos
+        arrive_by: Hora límite de llegada (HH:MM) para buscar la salida más tardía
+    
+    Returns:
+        Duración y llegada por hora de salida y modo, y las mejores horas para salir
+    """
+    try:
+        day = datetime.fromisoformat(date) if date else datetime.now()
+        day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        first = _clock_minutes(window_start)
+        last = _clock_minutes(window_end)
+        deadline = _clock_minutes(arrive_by) if arrive_by else None
+    except ValueError:
+        return {"error": "Fecha u hora inválida: usa YYYY-MM-DD y HH:MM"}
+    if step_minutes < 1 or last < first:
+        return {"error": "La ventana de salida o el intervalo no son válidos"}
+    modes = [mode for mode in (modes or ["transit", "driving"]) if mode in ("transit", "driving")]
+    sweep = list(range(first, last + 1, step_minutes))
+    results: Dict[str, List[Optional[Dict[str, Any]]]] = {}
+    
+    if "transit" in modes:
+        access = _station_access(origin)
+        egress = _station_access(destination)
+        plan: List[Optional[Dict[str, Any]]] = [None] * len(sweep)
+        if access and egress and access[0] != egress[0]:
+            timetable = TRANSIT_ROUTER.timetables[day_type(day)]
+            profile = TRANSIT_ROUTER.profile(
+                access[0], egress[0], first + access[1], last + access[1], timetable
+            )
+            boardings = [entry[0] for entry in profile]
+            for i, minute in enumerate(sweep):
+                # Primer viaje del perfil que se alcanza saliendo a esa hora
+                j = bisect_left(boardings, minute + access[1])
+                if j < len(profile) and profile[j][0] - (minute + access[1]) <= MAX_WAIT_MIN:
+                    board, arrival, transfers = profile[j]
+                    arrival += egress[1]
+                    plan[i] = {
+                        "duration": int(round(arrival - minute)),
+                        "board_time": _format_clock(day, board),
+                        "arrival_time": _format_clock(day, arrival),
+                        "arrival": arrival,
+                        "transfers": transfers,
+                    }
+        results["transit"] = plan
+    
+    if "driving" in modes:
+        origin_coords = _resolve_coordinates(origin)
+        destination_coords = _resolve_coordinates(destination)
+        plan = [None] * len(sweep)
+        if origin_coords and destination_coords:
+            durations = get_road_router().profile(
+                origin_coords, destination_coords, [day + timedelta(minutes=m) for m in sweep]
+            )
+            for i, (minute, duration) in enumerate(zip(sweep, durations.tolist())):
+                if duration < INF:
+                    plan[i] = {
+                        "duration": int(round(duration)),
+                        "arrival_time": _format_clock(day, minute + duration),
+                        "arrival": minute + duration,
+                    }
+        results["driving"] = plan
+    
+    departures = []
+    for i, minute in enumerate(sweep):
+        options = {mode: plan[i] for mode, plan in results.items() if plan[i] is not None}
+        entry: Dict[str, Any] = {"departure_time": _format_clock(day, minute)}
+        for mode, option in options.items():
+            entry[mode] = {key: value for key, value in option.items() if key != "arrival"}
+        if options:
+            best_mode = min(options, key=lambda mode: options[mode]["arrival"])
+            entry["best_mode"] = best_mode
+            entry["best_duration"] = options[best_mode]["duration"]
+            entry["_arrival"] = options[best_mode]["arrival"]
+        departures.append(entry)
+    
+    feasible = [entry for entry in departures if "best_mode" in entry]
+    # Menor duración; a igual duración, la salida más tardía
+    best = sorted(feasible, key=lambda entry: (entry["best_duration"], -_clock_minutes(entry["departure_time"])))
+    response: Dict[str, Any] = {
+        "origin": origin,
+        "destination": destination,
+        "date": day.date().isoformat(),
+        "window": {"start": window_start, "end": window_end, "step_minutes": step_minutes},
+        "modes": modes,
+        "best_departures": [
+            {"departure_time": entry["departure_time"], "mode": entry["best_mode"], "duration": entry["best_duration"]}
+            for entry in best[:3]
+        ],
+    }
+    if deadline is not None:
+        on_time = [entry for entry in feasible if entry["_arrival"] <= deadline]
+        response["latest_departure"] = (
+            {
+                "departure_time": on_time[-1]["departure_time"],
+                "mode": on_time[-1]["best_mode"],
+                "duration": on_time[-1]["best_duration"],
+            }
+            if on_time else None
+        )
+    for entry in feasible:
+        del entry["_arrival"]
+    response["departures"] = departures
+    return response
+
+
+def _clock_minutes(clock: str) -> int:
+    """Minutos desde medianoche de una hora HH:MM (ValueError si no es válida)."""
+    hours, minutes = clock.split(":")
+    value = int(hours) * 60 + int(minutes)
+    if not 0 <= value < 24 * 60:
+        raise ValueError(clock)
+    return value
+
+
+def _format_clock(day: datetime, minutes: float) -> str:
+    """Hora HH:MM de un minuto contado desde la medianoche de day."""
+    return (day + timedelta(minutes=minutes)).strftime("%H:%M")
+
+
+def _station_access(place: str) -> Optional[Tuple[int, float]]:
+    """
+    Estación del Metro para un lugar y minutos a pie hasta ella.
+    
+    Returns:
+        (índice de estación, minutos caminando) o None si el lugar no se ubica
+    """
+    station = TRANSIT_NETWORK.find_station(place)
+    if station is not None:
+        return station, 0.0
+    coords = _resolve_coordinates(place)
+    if coords is None:
+        return None
+    stations = TRANSIT_NETWORK.stations
+    walk = haversine_km(
+        coords[0],
+        coords[1],
+        np.array([METRO_STATION_COORDS_MOCK[name][0] for name in stations]),
+        np.array([METRO_STATION_COORDS_MOCK[name][1] for name in stations]),
+    ) * DETOUR_FACTOR / SPEED_KMH["walking"] * 60.0
+    nearest = int(np.argmin(walk))
+    return nearest, float(walk[nearest])
+
+
+def geocode_place(query: str) -> Dict[str, Any]:
+    """
+    Ubica un lugar de Medellín escrito en texto libre (zona, estación o sitio).
+    
+    Tolera tildes, mayúsculas, nombres incompletos y errores de escritura.
+    
+    Args:
+        query: Lugar a ubicar (p. ej. "Centro", "parque lleras", "San Antonio")
+    
+    Returns:
+        Lugar con nombre, coordenadas y tipo, o error con sugerencias
+    """
+    place = get_geocoder().resolve(query, remote=_geocode_google)
+    if place is None:
+        return {
+            "error": f"No se encontró el lugar: {query}",
+            "suggestions": [candidate["name"] for candidate in get_geocoder().search(query, limit=3)],
+        }
+    return place
+
+
+def _geocode_google(query: str) -> Optional[Dict[str, Any]]:
+    """Geocoding API de Google para direcciones fuera del nomenclátor (si hay API key)."""
+    client = get_provider_client("google_maps")
+    if client is None:
+        return None
+    try:
+        data = client.get_json("/geocode/json", {
+            "address": query,
+            "components": "country:CO|administrative_area:Antioquia",
+            "language": "es",
+        })
+    except ProviderError:
+        return None
+    if data.get("status") != "OK" or not data.get("results"):
+        return None
+    result = data["results"][0]
+    location = result["geometry"]["location"]
+    return {"name": result.get("formatted_address", query), "lat": location["lat"], "lon": location["lng"]}
+
+
+def _resolve_coordinates(place: str) -> Optional[Tuple[float, float]]:
+    """
+    Coordenadas de un origen/destino: "lat,lon" o lugar del nomenclátor.
+    
+    Returns:
+        (lat, lon) o None si el lugar no se puede ubicar
+    """
+    parts = (place or "").split(",")
+    if len(parts) == 2:
+        try:
+            return float(parts[0]), float(parts[1])
+        except ValueError:
+            pass
+    
+    resolved = get_geocoder().resolve(place, remote=_geocode_google)
+    if resolved is None:
+        return None
+    return resolved["lat"], resolved["lon"]
+
+
 def calculate_multimodal_route(
     origin: str,
     destination: str,
@@ -180,7 +1143,7 @@ def calculate_multimodal_route(
     Args:
         origin: Origen del viaje
         destination: Destino del viaje
-        preferences: Preferencias del usuario (priority, use_bike, max_budget, etc.)
+        preferences: Preferencias del usuario (priority, use_bike, bike_profile, max_budget, etc.)
         current_time: Hora del viaje (ISO format)
     
     Returns:
@@ -188,88 +1151,222 @@ def calculate_multimodal_route(
     """
     # Obtener datos de contexto
     weather = get_weather_conditions("Medellín")
+    departure = _parse_departure_time(current_time)
+    base_routes = _get_base_routes(
+        origin, destination, departure, weather["current"]["condition"],
+        bike_profile=preferences.get("bike_profile"),
+    )
     
-    # Simular análisis de tráfico según hora
-    if not current_time or current_time.lower() == 'now':
-        hour = datetime.now().hour
-    else:
-        try:
-            hour = datetime.fromisoformat(current_time).hour
-        except (ValueError, AttributeError):
-            hour = datetime.now().hour
-    
-    traffic_factor = 1.5 if (7 <= hour <= 9) or (17 <= hour <= 19) else 1.0
-    
-    # Obtener rutas base de cada modo
-    walking = get_route_google_maps(origin, destination, "walking")
-    bicycling = get_route_google_maps(origin, destination, "bicycling")
-    transit = get_route_google_maps(origin, destination, "transit")
-    driving = get_route_google_maps(origin, destination, "driving")
-    
-    # Ajustar tiempos por tráfico
-    driving["duration"] = int(driving["duration"] * traffic_factor)
-    
-    # Calcular scores de sostenibilidad (kg CO2)
-    co2_per_km = {
-        "walking": 0,
-        "bicycling": 0,
-        "transit": 0.05,  # Metro es muy eficiente
-        "driving": 0.12,  # Promedio carro gasolina
+    return _build_multimodal_route(origin, preferences, departure, weather, base_routes, destination)
+
+
+async def acalculate_multimodal_route(
+    origin: str,
+    destination: str,
+    preferences: Dict[str, Any],
+    current_time: Optional[str] = None,
+    provider: Optional[AsyncMobilityProvider] = None
+) -> Dict[str, Any]:
+    """
+    Versión asíncrona de calculate_multimodal_route.
+    
+    Consulta el clima y las rutas de los cuatro modos al mismo tiempo: la
+    latencia es la de la llamada más lenta y no la suma. La condición
+    climática de la llave de caché de las rutas es la que WEATHER_SERVICE
+    ya tiene guardada (la misma que usa la versión síncrona); sin clima
+    guardado las rutas se piden sin condición.
+    
+    Args:
+        origin: Origen del viaje
+        destination: Destino del viaje
+        preferences: Preferencias del usuario (priority, use_bike, bike_profile, max_budget, etc.)
+        current_time: Hora del viaje (ISO format)
+        provider: Proveedor asíncrono; por defecto el proveedor local simulado
+    
+    Returns:
+        Ruta multimodal completa con todos los detalles
+    """
+    if provider is None:
+        provider = LocalMockProvider(get_route_google_maps, get_weather_conditions)
+    departure = _parse_departure_time(current_time)
+    cached_weather = WEATHER_SERVICE.cached("Medellín")
+    condition = cached_weather["current"]["condition"] if cached_weather else None
+    weather, *routes = await asyncio.gather(
+        provider.get_weather("Medellín"),
+        *(
+            provider.get_route(
+                origin, destination, mode, departure.isoformat(), condition,
+                preferences.get("bike_profile"),
+            )
+            for mode in BASE_MODES
+        ),
+    )
+    base_routes = dict(zip(BASE_MODES, routes))
+    
+    return _build_multimodal_route(origin, preferences, departure, weather, base_routes, destination)
+
+
+def _itineraries(graph: Graph, node: str, target: str) -> List[Tuple[Tuple[float, float, float], List[Dict[str, Any]]]]:
+    """Itinerarios completos de un grafo de tramos sin ciclos, con sus criterios sumados y sus tramos."""
+    if node == target:
+        return [((0.0, 0.0, 0.0), [])]
+    found = []
+    for neighbor, criteria, leg in graph.get(node, []):
+        for rest, legs in _itineraries(graph, neighbor, target):
+            found.append((tuple(a + b for a, b in zip(criteria, rest)), [leg, *legs]))
+    return found
+
+
+def _get_base_routes(
+    origin: str,
+    destination: str,
+    departure: datetime,
+    weather_condition: Optional[str] = None,
+    bike_profile: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Obtiene las rutas base de cada modo (cada una pasa por ROUTE_CACHE).
+    
+    Args:
+        origin: Origen del viaje
+        destination: Destino del viaje
+        departure: Hora de salida
+        weather_condition: Condición climática actual (parte de la llave de caché)
+        bike_profile: Perfil de ciclista de la ruta en bici
+    
+    Returns:
+        Rutas base por modo (walking, bicycling, transit, driving)
+    """
+    return {
+        mode: get_route_google_maps(
+            origin, destination, mode, departure.isoformat(), weather_condition, bike_profile
+        )
+        for mode in BASE_MODES
     }
+
+
+def _build_multimodal_route(
+    origin: str,
+    preferences: Dict[str, Any],
+    departure: datetime,
+    weather: Dict[str, Any],
+    base_routes: Dict[str, Dict[str, Any]],
+    destination: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Combina las rutas base de cada modo en opciones multimodales ordenadas.
+    
+    El grafo de tramos es pequeño: origen, estación EnCicla y destino, con
+    a lo sumo cuatro itinerarios candidatos (Metro, carro, bici + Metro y
+    caminata). Cada itinerario completo se cotiza primero con FARE_ENGINE
+    (con integraciones la tarifa no es la suma de la de sus tramos) y
+    pareto_search filtra los dominados y los que exceden el presupuesto
+    sobre ese costo, el mismo que se informa. rank_by_priority es el único
+    criterio de orden.
+    
+    Args:
+        origin: Origen del viaje (para ubicar la estación EnCicla)
+        preferences: Preferencias del usuario
+        departure: Hora de salida
+        weather: Condiciones climáticas ya consultadas
+        base_routes: Rutas base por modo
+        destination: Destino del viaje (para informar sus coordenadas)
+    
+    Returns:
+        Ruta multimodal completa con todos los detalles
+    """
+    origin_coords = _resolve_coordinates(origin)
+    destination_coords = _resolve_coordinates(destination) if destination else None
+    
+    walking = base_routes["walking"]
+    bicycling = base_routes["bicycling"]
+    transit = base_routes["transit"]
+    # La duración en carro ya incluye el tráfico a la hora de salida
+    driving = base_routes["driving"]
+    traffic_factor = driving["duration"] / max(driving.get("free_flow_duration", driving["duration"]), 1)
     
     # Determinar mejor ruta según preferencias
     priority = preferences.get("priority", "time")
     use_bike = preferences.get("use_bike", True)
     max_budget = preferences.get("max_budget", 10000)
     
-    # Opciones de rutas
-    routes = []
+    alerts: List[str] = []
     
-    # Opción 1: Solo transporte público
-    if transit["cost"] <= max_budget:
-        routes.append({
-            "name": "Ruta Metro/Bus",
-            "segments": transit["steps"],
-            "total_duration": transit["duration"],
-            "total_cost": transit["cost"],
-            "co2_kg": round(transit["distance"] * co2_per_km["transit"], 2),
-            "score": calculate_route_score(transit["duration"], transit["cost"], transit["distance"] * co2_per_km["transit"], priority),
-        })
+    # Grafo de tramos: cada arista lleva (duración, costo, CO2) y sus segmentos
+    graph: Graph = {
+        "origin": [],
+        "encicla": [],
+    }
     
-    # Opción 2: Bici + Metro (si acepta bici y no llueve mucho)
-    if use_bike and weather["current"]["rain_probability"] < 50:
-        encicla_stations = get_encicla_stations()
-        multimodal_duration = int(bicycling["duration"] * 0.3 + transit["duration"] * 0.7)
-        multimodal_cost = transit["cost"]
-        
-        routes.append({
-            "name": "Ruta Bici + Metro",
-            "segments": [
-                {"instruction": f"Toma bici en {encicla_stations[0]['name']}", "duration": int(bicycling["duration"] * 0.3), "mode": "bicycling"},
-                {"instruction": "Deja bici y toma Metro", "duration": int(transit["duration"] * 0.7), "mode": "transit"},
-            ],
-            "total_duration": multimodal_duration,
-            "total_cost": multimodal_cost,
-            "co2_kg": round(bicycling["distance"] * 0.3 * co2_per_km["bicycling"] + transit["distance"] * 0.7 * co2_per_km["transit"], 2),
-            "score": calculate_route_score(multimodal_duration, multimodal_cost, 0, priority),
-        })
+    def add_leg(start: str, end: str, mode: str, duration: float, cost: float, distance: float, segments: List[Dict[str, Any]], fares: Optional[List[Dict[str, Any]]] = None) -> None:
+        co2 = distance * CO2_PER_KM[mode]
+        graph[start].append((end, (duration, cost, co2), {"mode": mode, "segments": segments, "cost": cost, "fares": fares}))
+    
+    # Tramos pagos del transporte público, para cotizar cada opción completa
+    transit_fares = [{"service": service} for service in transit["services"]] if "services" in transit else None
+    has_transit = "error" not in transit
+    if not has_transit:
+        alerts.append(f"🚇 {transit['error']}: el Metro no opera a las {transit['departure_time']}")
+    
+    # Solo transporte público
+    if has_transit:
+        add_leg("origin", "destination", "transit", transit["duration"], transit["cost"], transit["distance"], transit["steps"], transit_fares)
     
-    # Opción 3: Caminata (si es factible)
+    # Carro/taxi con tiempo según el tráfico de cada tramo
+    add_leg("origin", "destination", "driving", driving["duration"], driving["cost"], driving["distance"], driving["steps"])
+    
+    # Bici + Metro (si acepta bici y no llueve mucho), sólo si a la hora de
+    # llegada se esperan bicicletas al recogerla y anclajes al dejarla
+    bike_stations = None
+    if has_transit and use_bike and weather["current"]["rain_probability"] < 50:
+        bike_duration = int(bicycling["duration"] * 0.3)
+        bike_stations = _plan_encicla_stations(origin_coords, destination_coords, departure, bike_duration)
+        if bike_stations is None:
+            alerts.append("🚲 No se esperan bicicletas o anclajes EnCicla disponibles en tu recorrido")
+    if bike_stations:
+        pickup, dropoff = bike_stations
+        metro_duration = int(transit["duration"] * 0.7)
+        add_leg("origin", "encicla", "bicycling", bike_duration, 0, bicycling["distance"] * 0.3, [
+            {"instruction": f"Toma bici en {pickup['name']}", "duration": bike_duration, "mode": "bicycling"},
+        ])
+        add_leg("encicla", "destination", "transit", metro_duration, transit["cost"], transit["distance"] * 0.7, [
+            {"instruction": f"Deja bici en {dropoff['name']} y toma Metro", "duration": metro_duration, "mode": "transit"},
+        ], transit_fares)
+    
+    # Caminata (si es factible)
     if walking["duration"] < 60:
+        add_leg("origin", "destination", "walking", walking["duration"], 0, walking["distance"], walking["steps"])
+    
+    # Tarifas de todos los itinerarios en una sola pasada, antes de comparar:
+    # un itinerario con descuento de integración puede dominar a otro
+    itineraries = _itineraries(graph, "origin", "destination")
+    fares = FARE_ENGINE.price([
+        [fare for leg in legs for fare in leg["fares"] or []] for _, legs in itineraries
+    ])
+    priced: Graph = {"origin": []}
+    for (criteria, legs), fare in zip(itineraries, fares):
+        cost = sum(leg["cost"] for leg in legs if leg["fares"] is None) + int(fare)
+        priced["origin"].append(("destination", (criteria[0], cost, criteria[2]), {"legs": legs}))
+    
+    # Itinerarios no dominados en (tiempo, costo, CO2) dentro del presupuesto;
+    # la prioridad sólo ordena ese frente
+    frontier = pareto_search(priced, "origin", "destination", bounds=(INF, max_budget, INF))
+    routes = []
+    for rank, label in enumerate(rank_by_priority(frontier, priority), start=1):
+        legs = label.edge["legs"]
+        duration, cost, co2 = label.criteria
+        modes = tuple(leg["mode"] for leg in legs)
         routes.append({
-            "name": "Ruta a Pie",
-            "segments": walking["steps"],
-            "total_duration": walking["duration"],
-            "total_cost": 0,
-            "co2_kg": 0,
-            "score": calculate_route_score(walking["duration"], 0, 0, priority),
+            "name": ROUTE_NAMES.get(modes, "Ruta " + " + ".join(modes)),
+            "modes": list(modes),
+            "segments": [segment for leg in legs for segment in leg["segments"]],
+            "total_duration": int(duration),
+            "total_cost": int(cost),
+            "co2_kg": round(co2, 2),
+            "rank": rank,
         })
     
-    # Ordenar rutas por score
-    routes.sort(key=lambda x: x["score"], reverse=True)
-    
     # Agregar alertas
-    alerts = []
     if weather["current"]["rain_probability"] > 70:
         alerts.append("⚠️ Alta probabilidad de lluvia - considera transporte techado")
     if traffic_factor > 1.3:
@@ -278,31 +1375,508 @@ def calculate_multimodal_route(
     return {
         "recommended_route": routes[0] if routes else None,
         "alternative_routes": routes[1:3] if len(routes) > 1 else [],
+        "pareto_front_size": len(routes),
+        "origin_location": {"lat": origin_coords[0], "lon": origin_coords[1]} if origin_coords else None,
+        "destination_location": {"lat": destination_coords[0], "lon": destination_coords[1]} if destination_coords else None,
         "weather": weather,
         "alerts": alerts,
         "timestamp": datetime.now().isoformat(),
     }
 
 
-def calculate_route_score(duration: int, cost: int, co2: float, priority: str) -> float:
+def _plan_encicla_stations(
+    origin_coords: Optional[Tuple[float, float]],
+    destination_coords: Optional[Tuple[float, float]],
+    departure: datetime,
+    bike_minutes: int
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Estaciones EnCicla para recoger y dejar la bici según el pronóstico.
+    
+    La bici se recoge en la estación más cercana al origen con bicicletas
+    esperadas al llegar caminando y se deja en la más cercana al punto donde
+    termina el tramo en bici con anclajes esperados a esa hora.
+    
+    Returns:
+        (estación de recogida, estación de entrega) o None si no hay opción
+    """
+    if not origin_coords:
+        return None
+    for pickup in get_nearest_encicla_stations(*origin_coords, k=len(ENCICLA_INDEX)):
+        walk = pickup["distance_km"] * DETOUR_FACTOR / SPEED_KMH["walking"] * 60.0
+        at_pickup = departure + timedelta(minutes=walk)
+        bikes, _ = ENCICLA_AVAILABILITY.forecast(ENCICLA_POSITION[pickup["id"]], at_pickup)
+        if bikes >= 1:
+            break
+    else:
+        return None
+    # El tramo en bici cubre la primera parte del viaje (ver el reparto de tiempos)
+    if destination_coords:
+        lat = origin_coords[0] + 0.3 * (destination_coords[0] - origin_coords[0])
+        lon = origin_coords[1] + 0.3 * (destination_coords[1] - origin_coords[1])
+    else:
+        lat, lon = pickup["lat"], pickup["lon"]
+    at_dropoff = (at_pickup + timedelta(minutes=bike_minutes)).isoformat()
+    dropoffs = [
+        station for station in get_nearest_encicla_stations(lat, lon, k=2, min_docks=1, arrival_time=at_dropoff)
+        if station["id"] != pickup["id"]
+    ]
+    if not dropoffs:
+        return None
+    return pickup, dropoffs[0]
+
+
+def calculate_multimodal_routes_batch(
+    od_pairs: List[Tuple[str, str]],
+    preferences: Dict[str, Any],
+    current_time: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
     """
-    Calcula score de una ruta según prioridad del usuario.
+    Calcula rutas multimodales para muchos pares origen-destino.
+    
+    El clima se consulta una sola vez para todo el lote y cada par distinto
+    se calcula una sola vez. Con max_workers > 1 los pares se reparten en
+    bloques sobre un pool de procesos.
     
     Args:
-        duration: Duración en minutos
-        cost: Costo en COP
-        co2: Emisiones en kg CO2
-        priority: time, cost, sustainability
+        od_pairs: Lista de pares (origen, destino)
+        preferences: Preferencias del usuario, comunes a todo el lote
+        current_time: Hora del viaje (ISO format)
+        max_workers: Procesos a usar; None o 1 calcula en el proceso actual
     
     Returns:
-        Score (mayor es mejor)
-    """
-    if priority == "time":
-        return 1000 / (duration + 1)
-    elif priority == "cost":
-        return 1000 / (cost + 1)
-    elif priority == "sustainability":
-        return 100 / (co2 + 0.1)
+        Una ruta multimodal por par, en el mismo orden de od_pairs
+    """
+    pairs = [(origin, destination) for origin, destination in od_pairs]
+    unique_pairs = list(dict.fromkeys(pairs))
+    weather = get_weather_conditions("Medellín")
+    departure = _parse_departure_time(current_time)
+    
+    if max_workers and max_workers > 1 and len(unique_pairs) > 1:
+        chunk_size = -(-len(unique_pairs) // max_workers)
+        chunks = [unique_pairs[i:i + chunk_size] for i in range(0, len(unique_pairs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunk_results = executor.map(
+                _route_pairs,
+                chunks,
+                [preferences] * len(chunks),
+                [departure] * len(chunks),
+                [weather] * len(chunks),
+            )
+            computed = [route for routes in chunk_results for route in routes]
     else:
-        # Balance
-        return (500 / (duration + 1)) + (300 / (cost + 1)) + (200 / (co2 + 0.1))
+        computed = _route_pairs(unique_pairs, preferences, departure, weather)
+    
+    # Los pares repetidos reciben copias: cada resultado se puede modificar sin tocar los demás
+    by_pair = dict(zip(unique_pairs, computed))
+    results, seen = [], set()
+    for pair in pairs:
+        results.append(copy.deepcopy(by_pair[pair]) if pair in seen else by_pair[pair])
+        seen.add(pair)
+    return results
+
+
+def _route_pairs(
+    pairs: List[Tuple[str, str]],
+    preferences: Dict[str, Any],
+    departure: datetime,
+    weather: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Calcula un bloque de pares (ya sin repetidos)."""
+    return [
+        _build_multimodal_route(
+            origin, preferences, departure, weather,
+            _get_base_routes(
+                origin, destination, departure, weather["current"]["condition"],
+                preferences.get("bike_profile"),
+            ),
+            destination,
+        )
+        for origin, destination in pairs
+    ]
+
+
+def start_trip_session(
+    origin: str,
+    destination: str,
+    preferences: Optional[Dict[str, Any]] = None,
+    current_time: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Calcula la ruta de un viaje y lo deja en seguimiento para re-enrutarlo
+    si aparece un incidente en los tramos que recorre.
+    
+    Args:
+        origin: Origen del viaje
+        destination: Destino del viaje
+        preferences: Preferencias del usuario (como en calculate_multimodal_route)
+        current_time: Hora del viaje (ISO format)
+    
+    Returns:
+        session_id y la ruta multimodal del viaje
+    """
+    session = {
+        "session_id": uuid.uuid4().hex[:12],
+        "origin": origin,
+        "destination": destination,
+        "preferences": dict(preferences or {}),
+        "departure": _parse_departure_time(current_time),
+    }
+    return {"session_id": session["session_id"], "route": _route_session(session)}
+
+
+def get_trip_session(session_id: str) -> Dict[str, Any]:
+    """
+    Consulta la ruta vigente de un viaje en seguimiento.
+    
+    Returns:
+        Datos de la sesión con su ruta actual, o error si no existe
+    """
+    session = ACTIVE_TRIPS.get(session_id)
+    if session is None:
+        return {"error": f"No hay un viaje activo con id {session_id}"}
+    return {
+        "session_id": session_id,
+        "origin": session["origin"],
+        "destination": session["destination"],
+        "departure_time": session["departure"].isoformat(),
+        "incidents": sorted(session["incidents"]),
+        "route": session["route"],
+    }
+
+
+def end_trip_session(session_id: str) -> Dict[str, Any]:
+    """
+    Termina el seguimiento de un viaje (llegó a su destino o se canceló).
+    
+    Returns:
+        session_id y ended=True, o error si no existe
+    """
+    if not ACTIVE_TRIPS.remove(session_id):
+        return {"error": f"No hay un viaje activo con id {session_id}"}
+    return {"session_id": session_id, "ended": True}
+
+
+def report_traffic_incident(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Registra un incidente reportado por FlowSense o Pulse y re-enruta sólo
+    los viajes activos que cruzan los tramos afectados.
+    
+    Un incidente vial afecta los tramos que llegan al nodo vial más cercano
+    (a menos de INCIDENT_RADIUS_KM); uno en una estación, los tramos de
+    Metro/Metrocable que llegan a ella. Volver a reportar el mismo id
+    actualiza el incidente.
+    
+    Args:
+        event: Evento con el formato de get_traffic_events (id, location,
+            severity y, si se conocen, lat y lon)
+    
+    Returns:
+        incident_id, tramos afectados y viajes re-enrutados con su duración
+        antes y después, o error si no se puede ubicar en la red
+    """
+    location = event.get("location")
+    if not location:
+        return {"error": "El incidente no tiene ubicación"}
+    severity = event.get("severity", "medium")
+    if severity not in INCIDENT_SLOWDOWN:
+        return {"error": f"Severidad desconocida: {severity}"}
+    incident_id = str(event.get("id", location))
+    
+    segments: List[Segment] = []
+    penalties: Dict[int, float] = {}
+    coords = (event["lat"], event["lon"]) if "lat" in event and "lon" in event else _resolve_coordinates(location)
+    if coords:
+        router = get_road_router()
+        node_idx, node_km = router.node_index.nearest(*coords, 1)
+        if float(node_km[0]) <= INCIDENT_RADIUS_KM:
+            tails, heads = router.graph["edge_tail"], router.graph["edge_head"]
+            for e in router.incident_edges(int(node_idx[0])):
+                penalties[e] = INCIDENT_SLOWDOWN[severity]
+                segments.extend(road_segments([int(tails[e]), int(heads[e])]))
+    station = TRANSIT_NETWORK.find_station(location)
+    if station is not None:
+        for stations in TRANSIT_NETWORK.lines.values():
+            ids = [TRANSIT_NETWORK.find_station(name) for name in stations]
+            for a, b in zip(ids, ids[1:]):
+                if station in (a, b):
+                    segments.extend(transit_segments([a, b]))
+    if not segments:
+        return {"error": f"No se encontraron tramos de la red cerca de {location}"}
+    
+    previous = ACTIVE_INCIDENTS.get(incident_id)
+    incident = {
+        "id": incident_id,
+        "location": location,
+        "severity": severity,
+        "penalties": penalties,
+        "segments": frozenset(segments),
+        "sessions": previous["sessions"] if previous else set(),
+    }
+    if previous and "source" in previous:
+        incident["source"] = previous["source"]
+    ACTIVE_INCIDENTS[incident_id] = incident
+    affected = set(ACTIVE_TRIPS.affected(incident["segments"]))
+    return {
+        "incident_id": incident_id,
+        "segments": len(incident["segments"]),
+        "rerouted": _reroute_sessions(sorted(affected | incident["sessions"])),
+    }
+
+
+def clear_traffic_incident(incident_id: str) -> Dict[str, Any]:
+    """
+    Retira un incidente y recalcula los viajes que lo cruzaban o lo evitaban.
+    
+    Returns:
+        incident_id y viajes re-enrutados, o error si no existe
+    """
+    incident = ACTIVE_INCIDENTS.pop(str(incident_id), None)
+    if incident is None:
+        return {"error": f"No hay un incidente activo con id {incident_id}"}
+    affected = set(ACTIVE_TRIPS.affected(incident["segments"])) | incident["sessions"]
+    return {"incident_id": incident["id"], "rerouted": _reroute_sessions(sorted(affected))}
+
+
+def sync_traffic_incidents(current_time: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Alinea los incidentes con los eventos de FlowSense activos a una hora.
+
+    Reporta los eventos activos que aún no son incidentes y retira los
+    incidentes que vinieron de FlowSense y ya terminaron; los reportados a
+    mano (p. ej. desde Pulse) no se tocan.
+
+    Args:
+        current_time: Hora de referencia (ISO format), None o 'now' para ahora
+
+    Returns:
+        Resultados de report_traffic_incident y clear_traffic_incident
+        (reported y cleared)
+    """
+    when = _parse_departure_time(current_time)
+    active = {str(event.get("id", event.get("location"))): event for event in TRAFFIC_EVENTS.active(when)}
+    reported = []
+    for incident_id, event in active.items():
+        if incident_id not in ACTIVE_INCIDENTS:
+            reported.append(_report_event(event))
+    cleared = [
+        clear_traffic_incident(incident_id)
+        for incident_id, incident in list(ACTIVE_INCIDENTS.items())
+        if incident.get("source") == "flowsense" and incident_id not in active
+    ]
+    return {"reported": reported, "cleared": cleared}
+
+
+def _report_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Reporta un evento de FlowSense como incidente y lo marca como suyo."""
+    result = report_traffic_incident(event)
+    if "error" not in result:
+        ACTIVE_INCIDENTS[result["incident_id"]]["source"] = "flowsense"
+    return result
+
+
+def _on_traffic_event(event: Dict[str, Any]) -> None:
+    """Suscriptor de TRAFFIC_EVENTS: un evento nuevo ya activo re-enruta de inmediato."""
+    now = datetime.now().timestamp()
+    if to_epoch(event["start_time"]) <= now <= to_epoch(event["estimated_end"]):
+        _report_event(event)
+
+
+# Los eventos que FlowSense agregue desde ahora llegan a los viajes activos;
+# los programados o ya terminados los aplica sync_traffic_incidents
+TRAFFIC_EVENTS.subscribe(_on_traffic_event)
+
+
+def _reroute_sessions(session_ids: List[str]) -> List[Dict[str, Any]]:
+    """Recalcula las sesiones indicadas (las demás no se tocan)."""
+    results = []
+    for session_id in session_ids:
+        session = ACTIVE_TRIPS.get(session_id)
+        if session is None:
+            continue
+        before = session["route"]["recommended_route"]
+        after = _route_session(session)["recommended_route"]
+        results.append({
+            "session_id": session_id,
+            "previous_route": before["name"] if before else None,
+            "previous_duration": before["total_duration"] if before else None,
+            "route": after["name"] if after else None,
+            "duration": after["total_duration"] if after else None,
+        })
+    return results
+
+
+def _route_session(session: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calcula la ruta de una sesión con los incidentes vigentes y reindexa sus tramos.
+    
+    Sólo se recalcula el carro si su ruta cruza un incidente y sólo se
+    demora el transporte público si pasa por una estación afectada.
+    """
+    origin, destination, departure = session["origin"], session["destination"], session["departure"]
+    weather = get_weather_conditions("Medellín")
+    base_routes = _get_base_routes(
+        origin, destination, departure, weather["current"]["condition"],
+        bike_profile=session["preferences"].get("bike_profile"),
+    )
+    
+    alerts: List[str] = []
+    crossed = set()
+    driving, transit = base_routes["driving"], base_routes["transit"]
+    road_crossed = set(road_segments(driving.get("nodes", [])))
+    transit_ids = [TRANSIT_NETWORK.find_station(name) for name in transit.get("stations", [])]
+    transit_crossed = set(transit_segments(transit_ids))
+    
+    on_road = [i for i in ACTIVE_INCIDENTS.values() if i["penalties"] and i["segments"] & road_crossed]
+    if on_road:
+        penalties: Dict[int, float] = {}
+        for incident in ACTIVE_INCIDENTS.values():
+            for e, factor in incident["penalties"].items():
+                penalties[e] = max(penalties.get(e, 1.0), factor)
+        origin_coords = _resolve_coordinates(origin)
+        destination_coords = _resolve_coordinates(destination)
+        road = get_road_router().route(origin_coords, destination_coords, departure, penalties) if origin_coords and destination_coords else None
+        if road:
+            base_routes = dict(base_routes, driving=_driving_result(road))
+        for incident in on_road:
+            crossed.add(incident["id"])
+            alerts.append(f"🚧 {incident['location']}: ruta en carro recalculada por el incidente")
+    
+    on_transit = [i for i in ACTIVE_INCIDENTS.values() if i["segments"] & transit_crossed]
+    if on_transit:
+        delay = sum(INCIDENT_TRANSIT_DELAY_MIN[i["severity"]] for i in on_transit)
+        base_routes = dict(base_routes, transit=dict(
+            transit,
+            duration=transit["duration"] + delay,
+            steps=[{
+                "instruction": f"Demora por incidente en {', '.join(i['location'] for i in on_transit)}",
+                "duration": delay,
+                "distance": 0,
+                "mode": "waiting",
+            }] + transit["steps"],
+        ))
+        for incident in on_transit:
+            crossed.add(incident["id"])
+            alerts.append(f"🚇 {incident['location']}: demora de {INCIDENT_TRANSIT_DELAY_MIN[incident['severity']]} min en transporte público")
+    
+    route = _build_multimodal_route(origin, session["preferences"], departure, weather, base_routes, destination)
+    route["alerts"].extend(alerts)
+    for incident_id in session.get("incidents", set()) - crossed:
+        if incident_id in ACTIVE_INCIDENTS:
+            ACTIVE_INCIDENTS[incident_id]["sessions"].discard(session["session_id"])
+    for incident_id in crossed:
+        ACTIVE_INCIDENTS[incident_id]["sessions"].add(session["session_id"])
+    session["incidents"] = crossed
+    session["route"] = route
+    
+    # Se indexan los tramos que usa la ruta recomendada
+    recommended = route["recommended_route"]
+    modes = recommended["modes"] if recommended else []
+    segments: List[Segment] = []
+    if "driving" in modes:
+        segments.extend(road_segments(base_routes["driving"].get("nodes", [])))
+    if "transit" in modes:
+        segments.extend(transit_crossed)
+    ACTIVE_TRIPS.put(session["session_id"], session, segments)
+    return route
+
+
+def travel_time_matrix(
+    points: List[Any],
+    mode: str = "driving",
+    departure_time: Optional[str] = None,
+    destinations: Optional[List[Any]] = None,
+    max_workers: Optional[int] = None,
+    bike_profile: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Matriz de tiempos de viaje entre muchos puntos (flotas, logística).
+    
+    Se calcula localmente sin una consulta por par: búsquedas de uno a
+    todos compartidas entre puntos cercanos y tramos de acceso evaluados
+    con broadcasting. Las filas se reparten en bloques sobre un pool de
+    procesos. En carro y en bici se recorre la red vial (en bici con los
+    costos con pendiente del perfil); caminando es una aproximación en
+    línea recta corregida por DETOUR_FACTOR, porque no hay red peatonal.
+    
+    Args:
+        points: Orígenes como (lat, lon), "lat,lon" o lugares del nomenclátor
+        mode: Modo de transporte (driving, walking, bicycling, transit)
+        departure_time: Hora de salida (ISO format), None para ahora
+        destinations: Destinos en el mismo formato; por defecto los mismos points
+        max_workers: Procesos a usar; None usa todos los núcleos en matrices
+            grandes y 1 calcula en el proceso actual
+        bike_profile: Perfil de ciclista en bicycling (por defecto BIKE_PROFILE o "pedal")
+    
+    Returns:
+        Matriz (N, M) float32 de minutos (inf si no hay conexión)
+    """
+    if mode not in BASE_MODES:
+        raise ValueError(f"Modo de transporte desconocido: {mode}")
+    if bike_profile is not None and bike_profile not in BIKE_PROFILES:
+        raise ValueError(f"Perfil de ciclista desconocido: {bike_profile}")
+    origins = _coordinates_array(points)
+    targets = origins if destinations is None else _coordinates_array(destinations)
+    departure = _parse_departure_time(departure_time)
+    if not len(origins) or not len(targets):
+        return np.zeros((len(origins), len(targets)), dtype=np.float32)
+    
+    if max_workers is None:
+        max_workers = (os.cpu_count() or 1) if len(origins) * len(targets) >= MATRIX_PARALLEL_MIN_CELLS else 1
+    if max_workers > 1 and len(origins) > 1:
+        chunk_size = -(-len(origins) // max_workers)
+        chunks = [origins[i:i + chunk_size] for i in range(0, len(origins), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            blocks = executor.map(
+                _matrix_rows,
+                chunks,
+                [targets] * len(chunks),
+                [mode] * len(chunks),
+                [departure] * len(chunks),
+                [bike_profile] * len(chunks),
+            )
+            return np.vstack(list(blocks))
+    return _matrix_rows(origins, targets, mode, departure, bike_profile)
+
+
+def _coordinates_array(points: List[Any]) -> np.ndarray:
+    """Arreglo (N, 2) de (lat, lon); ValueError si algún lugar no se puede ubicar."""
+    coords = []
+    for point in points:
+        if isinstance(point, str):
+            resolved = _resolve_coordinates(point)
+            if resolved is None:
+                raise ValueError(f"No se pudo ubicar el lugar: {point}")
+            coords.append(resolved)
+        else:
+            coords.append((float(point[0]), float(point[1])))
+    return np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+
+def _matrix_rows(
+    origins: np.ndarray,
+    targets: np.ndarray,
+    mode: str,
+    departure: datetime,
+    bike_profile: Optional[str] = None,
+) -> np.ndarray:
+    """Calcula un bloque de filas de la matriz de tiempos de viaje."""
+    if mode == "driving":
+        return road_matrix(get_road_router(), origins, targets, departure)
+    if mode == "bicycling":
+        router = get_road_router()
+        return road_matrix(router, origins, targets, bike_profile=bike_profile or router.default_bike_profile)
+    if mode == "transit":
+        stations = np.array([METRO_STATION_COORDS_MOCK[name] for name in TRANSIT_NETWORK.stations])
+        return transit_matrix(
+            TRANSIT_ROUTER,
+            TRANSIT_ROUTER.timetables[day_type(departure)],
+            stations,
+            origins,
+            targets,
+            departure.hour * 60 + departure.minute,
+            SPEED_KMH["walking"],
+            DETOUR_FACTOR,
+        )
+    return direct_matrix(origins, targets, SPEED_KMH[mode], DETOUR_FACTOR)
@@ -0,0 +1,253 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Red de Metro/Metrocable precalculada para PathFinder"""
+
+import heapq
+import unicodedata
+from typing import Dict, List, Any, Optional, Tuple
+
+# Tiempos promedio entre estaciones consecutivas (minutos) y distancia (km)
+MINUTES_PER_HOP = {
+    "metro": 2.5,
+    "metrocable": 4.0,
+}
+KM_PER_HOP = {
+    "metro": 1.2,
+    "metrocable": 0.8,
+}
+
+# Penalización por transbordo en estaciones compartidas (caminar + espera)
+TRANSFER_PENALTY_MIN = 4.0
+
+INF = float("inf")
+
+
+def normalize_station_name(name: str) -> str:
+    """
+    Normaliza un nombre de estación para comparaciones (sin tildes ni mayúsculas).
+
+    Args:
+        name: Nombre libre, p. ej. "Estación Itagüí"
+
+    Returns:
+        Nombre normalizado, p. ej. "itagui"
+    """
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = " ".join(text.lower().split())
+    for prefix in ("estacion ", "metro "):
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+    return text
+
+
+def line_mode(line_id: str) -> str:
+    """Modo de transporte de una línea según su identificador."""
+    return "metrocable" if line_id.startswith("metrocable") else "metro"
+
+
+def line_display_name(line_id: str) -> str:
+    """Nombre legible de una línea (linea_a -> Metro Línea A)."""
+    letter = line_id.rsplit("_", 1)[-1].upper()
+    if line_mode(line_id) == "metrocable":
+        return f"Metrocable Línea {letter}"
+    return f"Metro Línea {letter}"
+
+
+class TransitNetwork:
+    """
+    Grafo de estaciones con tabla de caminos mínimos entre todos los pares.
+
+    Cada nodo es una pareja (línea, estación); las aristas de viaje unen
+    estaciones consecutivas de una misma línea y las de transbordo unen los
+    nodos de una misma estación en líneas distintas (San Antonio, Acevedo,
+    Santo Domingo...). La tabla se calcula una sola vez al construir la red,
+    de modo que la duración de cualquier tramo estación-estación es una
+    consulta O(1).
+    """
+
+    def __init__(self, lines: Dict[str, List[str]]):
+        self.lines = {line_id: list(stations) for line_id, stations in lines.items()}
+
+        # Estaciones físicas (en orden de aparición) e índice por nombre normalizado
+        self.stations: List[str] = []
+        self.station_index: Dict[str, int] = {}
+        for stations in self.lines.values():
+            for station in stations:
+                key = normalize_station_name(station)
+                if key not in self.station_index:
+                    self.station_index[key] = len(self.stations)
+                    self.stations.append(station)
+
+        # Nodos (línea, estación) y lista de adyacencia
+        self.nodes: List[Tuple[str, int]] = []
+        self._line_positions: Dict[str, Dict[int, int]] = {}
+        self._nodes_by_station: List[List[int]] = [[] for _ in self.stations]
+        adjacency: List[List[Tuple[int, float]]] = []
+        for line_id, stations in self.lines.items():
+            mode = line_mode(line_id)
+            self._line_positions[line_id] = {}
+            previous = None
+            for position, station in enumerate(stations):
+                node = len(self.nodes)
+                station_id = self.station_index[normalize_station_name(station)]
+                self._line_positions[line_id][station_id] = position
+                self.nodes.append((line_id, station_id))
+                self._nodes_by_station[station_id].append(node)
+                adjacency.append([])
+                if previous is not None:
+                    adjacency[previous].append((node, MINUTES_PER_HOP[mode]))
+                    adjacency[node].append((previous, MINUTES_PER_HOP[mode]))
+                previous = node
+
+        for nodes in self._nodes_by_station:
+            for a in nodes:
+                for b in nodes:
+                    if a != b:
+                        adjacency[a].append((b, TRANSFER_PENALTY_MIN))
+        self._adjacency = adjacency
+
+        # Caminos mínimos desde cada nodo (Dijkstra, la red es pequeña y dispersa)
+        self._node_dist: List[List[float]] = []
+        self._node_pred: List[List[int]] = []
+        for source in range(len(self.nodes)):
+            dist, pred = self._dijkstra(source)
+            self._node_dist.append(dist)
+            self._node_pred.append(pred)
+
+        # Tabla estación x estación con el mejor par de nodos para reconstruir
+        n = len(self.stations)
+        self.station_dist: List[List[float]] = [[INF] * n for _ in range(n)]
+        self._best_nodes: List[List[Optional[Tuple[int, int]]]] = [[None] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(n):
+                if i == j:
+                    self.station_dist[i][j] = 0.0
+                    continue
+                for a in self._nodes_by_station[i]:
+                    for b in self._nodes_by_station[j]:
+                        if self._node_dist[a][b] < self.station_dist[i][j]:
+                            self.station_dist[i][j] = self._node_dist[a][b]
+                            self._best_nodes[i][j] = (a, b)
+
+    def _dijkstra(self, source: int) -> Tuple[List[float], List[int]]:
+        dist = [INF] * len(self.nodes)
+        pred = [-1] * len(self.nodes)
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for neighbor, weight in self._adjacency[node]:
+                nd = d + weight
+                if nd < dist[neighbor]:
+                    dist[neighbor] = nd
+                    pred[neighbor] = node
+                    heapq.heappush(heap, (nd, neighbor))
+        return dist, pred
+
+    def find_station(self, name: str) -> Optional[int]:
+        """Índice de la estación que corresponde a un texto libre, o None."""
+        return self.station_index.get(normalize_station_name(name))
+
+    def travel_time(self, origin: str, destination: str) -> Optional[float]:
+        """
+        Minutos mínimos entre dos estaciones (consulta a la tabla precalculada).
+
+        Returns:
+            Minutos o None si alguna estación no existe o no están conectadas
+        """
+        i, j = self.find_station(origin), self.find_station(destination)
+        if i is None or j is None or self.station_dist[i][j] == INF:
+            return None
+        return self.station_dist[i][j]
+
+    def route(self, origin: str, destination: str) -> Optional[Dict[str, Any]]:
+        """
+        Reconstruye el tramo de transporte público entre dos estaciones.
+
+        Args:
+            origin: Nombre de la estación de origen
+            destination: Nombre de la estación de destino
+
+        Returns:
+            Diccionario con duration, distance, transfers, stations (paradas
+            recorridas en orden) y steps, o None si las estaciones no existen
+            o no están conectadas
+        """
+        i, j = self.find_station(origin), self.find_station(destination)
+        if i is None or j is None or i == j or self._best_nodes[i][j] is None:
+            return None
+
+        source, target = self._best_nodes[i][j]
+        path = [target]
+        while path[-1] != source:
+            path.append(self._node_pred[source][path[-1]])
+        path.reverse()
+
+        # Agrupar el camino en tramos por línea
+        rides: List[Dict[str, Any]] = []
+        for a, b in zip(path, path[1:]):
+            line_a, station_a = self.nodes[a]
+            line_b, station_b = self.nodes[b]
+            if line_a != line_b:
+                continue  # Arista de transbordo
+            if rides and rides[-1]["line"] == line_a and rides[-1]["to"] == station_a:
+                rides[-1]["to"] = station_b
+                rides[-1]["hops"] += 1
+            else:
+                rides.append({"line": line_a, "from": station_a, "to": station_b, "hops": 1})
+
+        steps = []
+        distance = 0.0
+        for ride in rides:
+            mode = line_mode(ride["line"])
+            stations = self.lines[ride["line"]]
+            positions = self._line_positions[ride["line"]]
+            from_pos, to_pos = positions[ride["from"]], positions[ride["to"]]
+            terminal = stations[-1] if to_pos > from_pos else stations[0]
+            ride_km = ride["hops"] * KM_PER_HOP[mode]
+            distance += ride_km
+            steps.append({
+                "instruction": f"Toma {line_display_name(ride['line'])} en {self.stations[ride['from']]} hacia {terminal}",
+                "duration": round(ride["hops"] * MINUTES_PER_HOP[mode]),
+                "distance": round(ride_km, 1),
+                "mode": mode,
+            })
+            steps.append({
+                "instruction": f"Baja en estación {self.stations[ride['to']]}",
+                "duration": 0,
+                "distance": 0,
+                "mode": mode,
+            })
+
+        # Paradas recorridas, sin repetir la estación de un transbordo
+        visited: List[str] = []
+        for node in path:
+            station = self.stations[self.nodes[node][1]]
+            if not visited or visited[-1] != station:
+                visited.append(station)
+
+        return {
+            "origin_station": self.stations[i],
+            "destination_station": self.stations[j],
+            "duration": round(self.station_dist[i][j]),
+            "distance": round(distance, 1),
+            "transfers": max(len(rides) - 1, 0),
+            "lines": [ride["line"] for ride in rides],
+            "stations": visited,
+            "steps": steps,
+        }
@@ -0,0 +1,139 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Matrices de tiempos de viaje muchos-a-muchos entre puntos arbitrarios"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder.raptor import RaptorRouter, Timetable
+from movility_ai.sub_agents.pathfinder.road_network import (
+    ACCESS_SPEED_KMH,
+    BIKE_PROFILES,
+    ROAD_DETOUR_FACTOR,
+    RoadRouter,
+)
+from movility_ai.sub_agents.pathfinder.spatial import haversine_km
+from movility_ai.sub_agents.pathfinder.transit_network import INF
+
+# Caminata máxima hasta/desde una estación del Metro (minutos)
+MAX_ACCESS_WALK_MIN = 20.0
+
+
+def direct_matrix(
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    speed_kmh: float,
+    detour: float,
+) -> np.ndarray:
+    """
+    Minutos en línea recta corregida por rodeo (caminar, bici), con broadcasting.
+
+    Args:
+        origins: Arreglo (N, 2) de (lat, lon)
+        destinations: Arreglo (M, 2) de (lat, lon)
+        speed_kmh: Velocidad del modo
+        detour: Factor de rodeo sobre la distancia en línea recta
+
+    Returns:
+        Matriz (N, M) float32 de minutos
+    """
+    km = haversine_km(
+        origins[:, 0][:, None], origins[:, 1][:, None],
+        destinations[:, 0][None, :], destinations[:, 1][None, :],
+    )
+    return (km * detour / speed_kmh * 60.0).astype(np.float32)
+
+
+def road_matrix(
+    router: RoadRouter,
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    departure: Optional[datetime] = None,
+    bike_profile: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Minutos en carro (o en bici) entre todos los orígenes y destinos.
+
+    Los puntos se ubican en su nodo vial más cercano y sólo se corre un
+    Dijkstra de uno a todos por nodo de salida distinto (con la congestión
+    de la hora de salida si se indica); la matriz se arma sumando por
+    broadcasting el acceso, la tabla entre nodos y la salida de la red.
+    Para pares muy cercanos se usa el trayecto directo por calles locales.
+    Con bike_profile la red se recorre con los costos en bici de ese perfil
+    (con pendiente) y el acceso va a su velocidad en plano.
+
+    Returns:
+        Matriz (N, M) float32 de minutos (inf si no hay camino)
+    """
+    speed = BIKE_PROFILES[bike_profile]["flat_kmh"] if bike_profile else ACCESS_SPEED_KMH
+    origin_nodes, origin_km = router.node_index.nearest_many(origins[:, 0], origins[:, 1], 1)
+    target_nodes, target_km = router.node_index.nearest_many(destinations[:, 0], destinations[:, 1], 1)
+    access = origin_km[:, 0] * ROAD_DETOUR_FACTOR / speed * 60.0
+    egress = target_km[:, 0] * ROAD_DETOUR_FACTOR / speed * 60.0
+
+    sources, inverse = np.unique(origin_nodes[:, 0], return_inverse=True)
+    table = np.vstack([router.node_times(int(source), departure, bike_profile) for source in sources])
+    matrix = access[:, None] + table[inverse][:, target_nodes[:, 0]] + egress[None, :]
+    local = direct_matrix(origins, destinations, speed, ROAD_DETOUR_FACTOR)
+    return np.minimum(matrix, local).astype(np.float32)
+
+
+def transit_matrix(
+    router: RaptorRouter,
+    timetable: Timetable,
+    station_coords: np.ndarray,
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    start: float,
+    walk_kmh: float,
+    detour: float,
+) -> np.ndarray:
+    """
+    Minutos en Metro/Metrocable (caminando desde y hasta las estaciones).
+
+    Cada origen corre un RAPTOR de uno a todos desde todas las estaciones a
+    las que llega caminando; los orígenes con los mismos minutos de acceso
+    (redondeados) comparten la búsqueda. El tramo final a pie se evalúa
+    para todos los destinos a la vez y nunca se supera la caminata directa.
+
+    Args:
+        router: Enrutador RAPTOR
+        timetable: Horario del tipo de día
+        station_coords: Arreglo (S, 2) con las coordenadas de cada estación
+        origins: Arreglo (N, 2) de (lat, lon)
+        destinations: Arreglo (M, 2) de (lat, lon)
+        start: Minuto de salida desde medianoche
+        walk_kmh: Velocidad caminando
+        detour: Factor de rodeo para los tramos a pie
+
+    Returns:
+        Matriz (N, M) float32 de minutos
+    """
+    access = np.rint(direct_matrix(origins, station_coords, walk_kmh, detour))
+    egress = direct_matrix(station_coords, destinations, walk_kmh, detour)
+    egress[egress > MAX_ACCESS_WALK_MIN] = np.inf
+    matrix = direct_matrix(origins, destinations, walk_kmh, detour)
+
+    rows: Dict[Tuple[float, ...], np.ndarray] = {}
+    for i, walk in enumerate(access):
+        key = tuple(walk.tolist())
+        if key not in rows:
+            sources = {s: start + minutes for s, minutes in enumerate(key) if minutes <= MAX_ACCESS_WALK_MIN}
+            arrivals = np.array(router.reach(sources, INF, timetable)) - start
+            rows[key] = (arrivals[:, None] + egress).min(axis=0)
+        np.minimum(matrix[i], rows[key], out=matrix[i])
+    return matrix
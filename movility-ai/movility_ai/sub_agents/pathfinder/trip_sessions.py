@@ -0,0 +1,107 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Viajes en curso con índice inverso tramo -> sesiones para re-enrutar por incidentes"""
+
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Tramo de la red: ("road", nodo, nodo) o ("transit", estación, estación),
+# con los dos extremos en orden para que ambos sentidos sean el mismo tramo
+Segment = Tuple[str, int, int]
+
+
+def road_segments(nodes: Iterable[int]) -> List[Segment]:
+    """Tramos viales de un camino dado por sus nodos."""
+    nodes = list(nodes)
+    return [("road", min(a, b), max(a, b)) for a, b in zip(nodes, nodes[1:]) if a != b]
+
+
+def transit_segments(stations: Iterable[int]) -> List[Segment]:
+    """Tramos entre estaciones consecutivas de un itinerario (índices de estación)."""
+    stations = list(stations)
+    return [("transit", min(a, b), max(a, b)) for a, b in zip(stations, stations[1:]) if a != b]
+
+
+class ActiveTrips:
+    """
+    Sesiones de viaje activas indexadas por los tramos que recorren.
+
+    Además de los tramos de cada sesión se guarda el índice inverso
+    tramo -> sesiones, así un incidente sólo toca las sesiones que cruzan
+    sus tramos: el costo de cada evento es proporcional a los viajes
+    afectados y no al total de viajes activos.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._segments: Dict[str, FrozenSet[Segment]] = {}
+        self._index: Dict[Segment, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, session_id: str, session: Dict[str, Any], segments: Iterable[Segment]) -> None:
+        """Registra una sesión o reemplaza su itinerario, actualizando sólo los tramos que cambian."""
+        new = frozenset(segments)
+        with self._lock:
+            old = self._segments.get(session_id, frozenset())
+            for segment in old - new:
+                self._unindex(segment, session_id)
+            for segment in new - old:
+                self._index.setdefault(segment, set()).add(session_id)
+            self._sessions[session_id] = session
+            self._segments[session_id] = new
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Sesión registrada o None."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def remove(self, session_id: str) -> bool:
+        """Olvida una sesión; False si no existía."""
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            for segment in self._segments.pop(session_id):
+                self._unindex(segment, session_id)
+            del self._sessions[session_id]
+            return True
+
+    def affected(self, segments: Iterable[Segment]) -> List[str]:
+        """Sesiones que recorren alguno de los tramos, en orden estable."""
+        with self._lock:
+            found: Set[str] = set()
+            for segment in segments:
+                found.update(self._index.get(segment, ()))
+            return sorted(found)
+
+    def segments(self, session_id: str) -> FrozenSet[Segment]:
+        """Tramos indexados de una sesión."""
+        with self._lock:
+            return self._segments.get(session_id, frozenset())
+
+    def _unindex(self, segment: Segment, session_id: str) -> None:
+        sessions = self._index.get(segment)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._index[segment]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        """Sesiones activas y tramos presentes en el índice."""
+        with self._lock:
+            return {"sessions": len(self._sessions), "indexed_segments": len(self._index)}
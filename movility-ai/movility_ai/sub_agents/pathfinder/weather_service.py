@@ -0,0 +1,142 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Servicio de clima con consultas agrupadas (single-flight) y stale-while-revalidate"""
+
+import copy
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from movility_ai.sub_agents.pathfinder.transit_network import normalize_station_name
+
+# Segundos en que el clima se sirve sin consultar al proveedor
+WEATHER_FRESH_SECONDS = 5 * 60
+
+# Hasta cuándo se sirve un valor vencido mientras se refresca en segundo plano
+WEATHER_STALE_SECONDS = 30 * 60
+
+
+class WeatherService:
+    """
+    Clima por ubicación con una sola consulta en curso por ubicación.
+
+    - Dentro de la ventana de frescura se responde desde memoria.
+    - Vencido pero dentro de la ventana de tolerancia, se responde con el
+      valor anterior y se lanza un único refresco en segundo plano.
+    - Sin valor utilizable, la primera llamada consulta al proveedor y las
+      concurrentes para la misma ubicación esperan ese mismo resultado.
+
+    Es segura entre hilos; si el refresco en segundo plano falla se conserva
+    el valor anterior hasta que venza la tolerancia.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Dict[str, Any]],
+        fresh_seconds: float = WEATHER_FRESH_SECONDS,
+        stale_seconds: float = WEATHER_STALE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fetch = fetch
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.refresh_errors = 0
+
+    def get(self, location: str) -> Dict[str, Any]:
+        """
+        Clima de una ubicación según las ventanas de frescura y tolerancia.
+
+        Raises:
+            Exception: La del proveedor, si no hay ningún valor que servir
+        """
+        key = normalize_station_name(location)
+        with self._lock:
+            entry = self._entries.get(key)
+            age = self._clock() - entry[0] if entry else None
+            if entry and age < self.fresh_seconds:
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if entry and age < self.stale_seconds:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start(key, location, background=True)
+                return copy.deepcopy(entry[1])
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._start(key, location, background=False)
+            else:
+                self.coalesced += 1
+        if leader:
+            self._run(key, location, future)
+        return copy.deepcopy(future.result())
+
+    def cached(self, location: str) -> Optional[Dict[str, Any]]:
+        """Clima guardado dentro de la ventana de tolerancia, sin consultar al proveedor."""
+        key = normalize_station_name(location)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._clock() - entry[0] < self.stale_seconds:
+                return copy.deepcopy(entry[1])
+        return None
+
+    def _start(self, key: str, location: str, background: bool) -> Future:
+        """Registra una consulta en curso (llamar con el lock tomado)."""
+        future: Future = Future()
+        self._inflight[key] = future
+        self.fetches += 1
+        if background:
+            threading.Thread(target=self._run, args=(key, location, future), daemon=True).start()
+        return future
+
+    def _run(self, key: str, location: str, future: Future) -> None:
+        try:
+            value = self.fetch(location)
+        except Exception as exc:  # Se entrega a quienes esperan el resultado
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.refresh_errors += 1
+            future.set_exception(exc)
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), copy.deepcopy(value))
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def clear(self) -> None:
+        """Olvida los valores guardados conservando los contadores."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de aciertos, respuestas vencidas, consultas y llamadas agrupadas."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "fetches": self.fetches,
+                "coalesced": self.coalesced,
+                "refresh_errors": self.refresh_errors,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,274 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Matriz zona-zona de tiempos y costos de viaje, precalculada y mapeada en memoria"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from movility_ai.shared_libraries.cache import cache_dir
+from movility_ai.shared_libraries.constants import MEDELLIN_ZONES, ZONE_ALIASES
+from movility_ai.sub_agents.flowsense.predictor import HOURS_PER_WEEK, WEEKEND_FACTOR, ZONE_MODEL, hour_of_week
+from movility_ai.sub_agents.pathfinder.raptor import HEADWAY_TABLES
+from movility_ai.sub_agents.pathfinder.spatial import haversine_km
+from movility_ai.sub_agents.pathfinder.transit_network import TransitNetwork, normalize_station_name
+
+# Ejes de la matriz: (métrica, modo, hora de la semana, zona origen, zona destino)
+MATRIX_METRICS = ("minutes", "cost_cop")
+MATRIX_MODES = ("walking", "bicycling", "transit", "driving")
+MATRIX_VERSION = 1
+
+# Factor de desvío de la red vial respecto a la línea recta
+DETOUR_FACTOR = 1.3
+SPEED_KMH = {"walking": 4.5, "bicycling": 14.0}
+FREE_FLOW_KMH = 50.0
+MIN_DRIVING_KMH = 8.0
+DEFAULT_CONGESTION = 0.4
+
+# Taxi: tarifa por km con mínima
+TAXI_COP_PER_KM = 1200
+TAXI_MIN_COP = 6000
+
+
+def default_matrix_path() -> str:
+    """Ruta del archivo .npy (ZONE_MATRIX_PATH o la caché del usuario)."""
+    return os.getenv("ZONE_MATRIX_PATH") or os.path.join(cache_dir(), f"zone_travel_matrix_v{MATRIX_VERSION}.npy")
+
+
+def hourly_congestion(traffic_zone: Optional[str]) -> np.ndarray:
+    """Congestión típica (0-1) de una zona de tráfico para cada hora de la semana."""
+    row = ZONE_MODEL.position.get(traffic_zone) if traffic_zone else None
+    if row is None:
+        weekend_factor = np.where(np.arange(HOURS_PER_WEEK) // 24 >= 5, WEEKEND_FACTOR, 1.0)
+        return np.full(HOURS_PER_WEEK, DEFAULT_CONGESTION) * weekend_factor
+    return ZONE_MODEL.levels(np.array([row]), np.arange(HOURS_PER_WEEK)[None, :])[0]
+
+
+def hourly_metro_wait() -> np.ndarray:
+    """Espera media (media frecuencia) del Metro por hora de la semana; inf sin servicio."""
+    wait = np.full(HOURS_PER_WEEK, np.inf)
+    for hour in range(HOURS_PER_WEEK):
+        table = HEADWAY_TABLES["weekend" if hour // 24 >= 5 else "weekday"]["metro"]
+        minute = (hour % 24) * 60 + 30
+        for start, end, headway in table:
+            if start <= minute < end:
+                wait[hour] = headway / 2.0
+    return wait
+
+
+def build_zone_matrix(
+    zones: Dict[str, Dict[str, Any]],
+    network: TransitNetwork,
+    station_coords: Dict[str, Tuple[float, float]],
+    transit_fare_cop: float,
+) -> np.ndarray:
+    """
+    Precalcula tiempos (min) y costos (COP) entre todas las zonas, por modo y hora.
+
+    Args:
+        zones: Zonas con lat, lon y traffic_zone
+        network: Red de Metro/Metrocable con su tabla de caminos mínimos
+        station_coords: Coordenadas (lat, lon) de las estaciones
+        transit_fare_cop: Tarifa del transporte público
+
+    Returns:
+        Arreglo float32 de forma (2, modos, 168, zonas, zonas)
+    """
+    zone_ids = list(zones)
+    n = len(zone_ids)
+    lats = np.array([zones[z]["lat"] for z in zone_ids])
+    lons = np.array([zones[z]["lon"] for z in zone_ids])
+    km = haversine_km(lats[:, None], lons[:, None], lats[None, :], lons[None, :]) * DETOUR_FACTOR
+
+    matrix = np.zeros((len(MATRIX_METRICS), len(MATRIX_MODES), HOURS_PER_WEEK, n, n), dtype=np.float32)
+    minutes, cost = matrix[0], matrix[1]
+
+    for mode in ("walking", "bicycling"):
+        minutes[MATRIX_MODES.index(mode)] = (km / SPEED_KMH[mode] * 60.0)[None, :, :]
+
+    # Carro: velocidad según la congestión media de las zonas de origen y destino
+    congestion = np.stack([hourly_congestion(zones[z].get("traffic_zone")) for z in zone_ids], axis=1)
+    pair_congestion = (congestion[:, :, None] + congestion[:, None, :]) / 2.0
+    speed = np.maximum(FREE_FLOW_KMH * (1.0 - pair_congestion), MIN_DRIVING_KMH)
+    driving = MATRIX_MODES.index("driving")
+    minutes[driving] = km[None, :, :] / speed * 60.0
+    cost[driving] = np.where(km > 0, np.maximum(km * TAXI_COP_PER_KM, TAXI_MIN_COP), 0.0)[None, :, :]
+
+    # Transporte público: caminar a la estación más cercana, esperar, viajar y caminar al destino
+    stations = [s for s in network.stations if s in station_coords]
+    s_lats = np.array([station_coords[s][0] for s in stations])
+    s_lons = np.array([station_coords[s][1] for s in stations])
+    access_km = haversine_km(lats[:, None], lons[:, None], s_lats[None, :], s_lons[None, :]) * DETOUR_FACTOR
+    nearest = access_km.argmin(axis=1)
+    access_min = access_km[np.arange(n), nearest] / SPEED_KMH["walking"] * 60.0
+    station_ids = [network.find_station(stations[i]) for i in nearest]
+    table = np.asarray(network.station_dist, dtype=np.float64)
+    ride = table[np.ix_(station_ids, station_ids)]
+    same_station = np.equal.outer(station_ids, station_ids)
+    transit_min = access_min[:, None] + ride + access_min[None, :]
+    transit = MATRIX_MODES.index("transit")
+    wait = hourly_metro_wait()[:, None, None]
+    minutes[transit] = np.where(
+        same_station[None, :, :],
+        minutes[MATRIX_MODES.index("walking")],
+        transit_min[None, :, :] + wait,
+    )
+    cost[transit] = np.where(
+        same_station[None, :, :] | ~np.isfinite(minutes[transit]), 0.0, transit_fare_cop
+    )
+    return matrix
+
+
+def zone_matrix_fingerprint(
+    zones: Dict[str, Dict[str, Any]],
+    network: TransitNetwork,
+    station_coords: Dict[str, Tuple[float, float]],
+    transit_fare_cop: float,
+) -> str:
+    """
+    Huella de todo lo que entra en la matriz.
+
+    Cubre zonas, frecuencias del Metro, velocidades, tarifas, la tabla de
+    caminos mínimos de la red y la congestión horaria de FlowSense de cada
+    zona: si cualquiera cambia, la matriz guardada ya no sirve aunque
+    tenga la misma forma.
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps(
+        [MATRIX_VERSION, zones, HEADWAY_TABLES, SPEED_KMH, DETOUR_FACTOR, FREE_FLOW_KMH, MIN_DRIVING_KMH,
+         DEFAULT_CONGESTION, TAXI_COP_PER_KM, TAXI_MIN_COP, transit_fare_cop, network.stations, station_coords],
+        sort_keys=True,
+        default=str,
+    ).encode("utf-8"))
+    digest.update(np.asarray(network.station_dist, dtype=np.float64).tobytes())
+    for zone_id in zones:
+        digest.update(hourly_congestion(zones[zone_id].get("traffic_zone")).astype(np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_path(path: str) -> str:
+    """Archivo junto a la matriz con su huella."""
+    return path + ".sha1"
+
+
+def _write_atomic(path: str, suffix: str, write: Callable[[BinaryIO], Any]) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _save_atomic(path: str, matrix: np.ndarray, fingerprint: str) -> None:
+    """
+    Escribe el .npy y su huella en temporales y los renombra, para que otros
+    procesos nunca lean un archivo a medias. La huella va de última: si el
+    proceso muere entre ambos, la próxima carga no la reconoce y recalcula.
+    """
+    _write_atomic(path, ".npy.tmp", lambda handle: np.save(handle, matrix))
+    _write_atomic(fingerprint_path(path), ".sha1.tmp", lambda handle: handle.write(fingerprint.encode("ascii")))
+
+
+class ZoneMatrix:
+    """
+    Consultas zona-zona sobre la matriz precalculada.
+
+    El arreglo se abre con np.load(mmap_mode="r"): los procesos que cargan el
+    mismo archivo comparten las páginas del sistema operativo y una consulta
+    es un solo acceso por índice, sin llamadas a proveedores.
+    """
+
+    def __init__(self, zones: Dict[str, Dict[str, Any]], matrix: np.ndarray):
+        self.zones = zones
+        self.zone_ids: List[str] = list(zones)
+        self.matrix = matrix
+        self._lookup: Dict[str, int] = {}
+        for i, zone_id in enumerate(self.zone_ids):
+            self._lookup[normalize_station_name(zone_id.replace("_", " "))] = i
+            self._lookup[normalize_station_name(zones[zone_id]["name"])] = i
+        for alias, zone_id in ZONE_ALIASES.items():
+            if zone_id in zones:
+                self._lookup[normalize_station_name(alias)] = self.zone_ids.index(zone_id)
+
+    @classmethod
+    def load(
+        cls,
+        network: TransitNetwork,
+        station_coords: Dict[str, Tuple[float, float]],
+        transit_fare_cop: float,
+        path: Optional[str] = None,
+        zones: Optional[Dict[str, Dict[str, Any]]] = None,
+        rebuild: bool = False,
+    ) -> "ZoneMatrix":
+        """
+        Mapea la matriz en memoria; si no existe o su huella (ver
+        zone_matrix_fingerprint) no coincide con la de las entradas actuales,
+        la calcula y guarda.
+
+        Si el archivo no se puede escribir se usa la matriz en memoria,
+        salvo con rebuild (paso offline, ver precompute), que siempre
+        recalcula y propaga el error.
+        """
+        zones = zones or MEDELLIN_ZONES
+        path = path or default_matrix_path()
+        shape = (len(MATRIX_METRICS), len(MATRIX_MODES), HOURS_PER_WEEK, len(zones), len(zones))
+        fingerprint = zone_matrix_fingerprint(zones, network, station_coords, transit_fare_cop)
+        if not rebuild and os.path.exists(path):
+            try:
+                with open(fingerprint_path(path), "r", encoding="ascii") as handle:
+                    saved = handle.read().strip()
+                matrix = np.load(path, mmap_mode="r")
+                if saved == fingerprint and matrix.shape == shape:
+                    return cls(zones, matrix)
+            except (OSError, ValueError):
+                pass
+
+        matrix = build_zone_matrix(zones, network, station_coords, transit_fare_cop)
+        try:
+            _save_atomic(path, matrix, fingerprint)
+            return cls(zones, np.load(path, mmap_mode="r"))
+        except OSError:
+            if rebuild:
+                raise
+            return cls(zones, matrix)
+
+    def zone_index(self, name: str) -> Optional[int]:
+        """Índice de una zona por id, nombre o alias (sin tildes ni mayúsculas)."""
+        key = normalize_station_name(name)
+        return self._lookup.get(key, self._lookup.get(key.replace("_", " ")))
+
+    def lookup(self, origin: str, destination: str, mode: str, when: datetime) -> Optional[Tuple[float, float]]:
+        """
+        Tiempo (min) y costo (COP) entre dos zonas a una hora dada.
+
+        Returns:
+            (minutos, costo) o None si alguna zona o el modo no existen
+        """
+        i, j = self.zone_index(origin), self.zone_index(destination)
+        if i is None or j is None or mode not in MATRIX_MODES:
+            return None
+        m, h = MATRIX_MODES.index(mode), hour_of_week(when)
+        return float(self.matrix[0, m, h, i, j]), float(self.matrix[1, m, h, i, j])
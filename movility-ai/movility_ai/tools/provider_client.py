@@ -0,0 +1,249 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cliente HTTP compartido para proveedores externos (Google Maps, OpenWeather)"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Respuestas que vale la pena reintentar
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Configuración de cada proveedor: URL base, variable de la API key, nombre
+# del parámetro que la lleva y consultas por segundo permitidas por key
+PROVIDERS = {
+    "google_maps": {
+        "base_url": os.getenv("GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com/maps/api"),
+        "api_key_env": "GOOGLE_MAPS_API_KEY",
+        "api_key_param": "key",
+        "rate_per_sec": float(os.getenv("GOOGLE_MAPS_QPS", "50")),
+    },
+    "openweather": {
+        "base_url": os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5"),
+        "api_key_env": "OPENWEATHER_API_KEY",
+        "api_key_param": "appid",
+        "rate_per_sec": float(os.getenv("OPENWEATHER_QPS", "1")),
+    },
+}
+
+
+class ProviderError(Exception):
+    """Error al consultar un proveedor externo (tras agotar los reintentos)."""
+
+
+class TokenBucket:
+    """
+    Limitador de tasa tipo token bucket, seguro entre hilos.
+
+    Se recargan rate_per_sec fichas por segundo hasta capacity; cada consulta
+    consume una ficha y espera si no hay disponibles.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity if capacity is not None else max(rate_per_sec, 1.0)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Intenta consumir fichas sin esperar.
+
+        Returns:
+            0 si se consumieron; si no, los segundos a esperar para tenerlas
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate_per_sec
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Consume fichas, esperando lo necesario.
+
+        Returns:
+            True si se consumieron, False si se agotó el timeout
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+
+# Un limitador por API key, compartido por todos los clientes que la usan
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(api_key: str, rate_per_sec: float) -> TokenBucket:
+    """Limitador compartido para una API key (se crea la primera vez)."""
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(api_key)
+        if bucket is None:
+            bucket = _BUCKETS[api_key] = TokenBucket(rate_per_sec)
+        return bucket
+
+
+class ProviderClient:
+    """
+    Cliente HTTP con conexiones persistentes, límite de tasa y reintentos.
+
+    Usa una única requests.Session con un pool de conexiones keep-alive, de
+    modo que las consultas no abren una conexión TLS nueva cada vez. Los
+    reintentos usan backoff exponencial con jitter completo y respetan el
+    encabezado Retry-After de las respuestas 429.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        api_key_param: str = "key",
+        rate_per_sec: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        timeout: float = 10.0,
+        pool_size: int = 10,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.api_key_param = api_key_param
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._sleep = sleep
+        self.rate_limiter = get_rate_limiter(api_key or self.base_url, rate_per_sec)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Consulta GET y devuelve el JSON de la respuesta.
+
+        Args:
+            path: Ruta relativa a la URL base (p. ej. "/directions/json")
+            params: Parámetros de la consulta (la API key se agrega sola)
+
+        Returns:
+            Cuerpo de la respuesta decodificado
+
+        Raises:
+            ProviderError: Si la consulta falla tras agotar los reintentos
+        """
+        query = dict(params or {})
+        if self.api_key:
+            query[self.api_key_param] = self.api_key
+        url = f"{self.base_url}/{path.lstrip('/')}"
+
+        last_error = ""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                response = self.session.get(url, params=query, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                last_error = str(exc)
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    if response.status_code >= 400:
+                        raise ProviderError(f"{url} respondió {response.status_code}")
+                    try:
+                        return response.json()
+                    except ValueError as exc:
+                        raise ProviderError(f"{url} no devolvió JSON válido") from exc
+                last_error = f"{url} respondió {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+            if attempt < self.max_retries:
+                self._sleep(self._backoff(attempt, retry_after))
+
+        raise ProviderError(f"Falló la consulta tras {self.max_retries + 1} intentos: {last_error}")
+
+    def close(self) -> None:
+        """Cierra las conexiones del pool."""
+        self.session.close()
+
+
+# Clientes compartidos por proceso, uno por proveedor
+_CLIENTS: Dict[str, ProviderClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_provider_client(name: str) -> Optional[ProviderClient]:
+    """
+    Cliente compartido de un proveedor configurado en PROVIDERS.
+
+    Args:
+        name: google_maps u openweather
+
+    Returns:
+        El cliente, o None si la API key del proveedor no está configurada
+    """
+    config = PROVIDERS[name]
+    api_key = os.getenv(config["api_key_env"])
+    if not api_key:
+        return None
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(name)
+        if (
+            client is None
+            or client.api_key != api_key
+            or client.base_url != config["base_url"].rstrip("/")
+        ):
+            client = _CLIENTS[name] = ProviderClient(
+                config["base_url"],
+                api_key=api_key,
+                api_key_param=config["api_key_param"],
+                rate_per_sec=config["rate_per_sec"],
+            )
+        return client
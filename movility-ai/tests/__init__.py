@@ -0,0 +1,27 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests de MovilityAI"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+# Los archivos precalculados (matrices, red vial, DEM, geocodificación) de
+# las pruebas van a un directorio temporal y no a la caché del usuario
+if not os.getenv("MOVILITY_CACHE_DIR"):
+    os.environ["MOVILITY_CACHE_DIR"] = tempfile.mkdtemp(prefix="movility_ai_tests_")
+    atexit.register(shutil.rmtree, os.environ["MOVILITY_CACHE_DIR"], True)
+
@@ -0,0 +1,108 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Servidor HTTP local que simula proveedores externos en los tests"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Any, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+# Respuesta simulada: (código, cuerpo JSON[, encabezados])
+StubResponse = Union[Tuple[int, Any], Tuple[int, Any, Dict[str, str]]]
+
+
+class StubProviderServer:
+    """
+    Servidor HTTP/1.1 con keep-alive en 127.0.0.1 y un puerto libre.
+
+    Cada ruta responde con una lista de respuestas que se consumen en orden
+    (la última se repite) o con una función que recibe los parámetros de la
+    consulta. Registra las consultas y las conexiones abiertas para verificar
+    reintentos y reutilización de conexiones.
+
+    Uso:
+        with StubProviderServer({"/weather": [(200, {...})]}) as server:
+            client = ProviderClient(server.url)
+    """
+
+    def __init__(self, routes: Dict[str, Union[List[StubResponse], Callable[[Dict[str, str]], StubResponse]]]):
+        self.routes = {path: (list(r) if isinstance(r, list) else r) for path, r in routes.items()}
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _respond(self, path: str, params: Dict[str, str]) -> StubResponse:
+        with self._lock:
+            self.requests.append((path, params))
+            route = self.routes.get(path)
+            if route is None:
+                return 404, {"error": "not found"}
+            if callable(route):
+                return route(params)
+            return route.pop(0) if len(route) > 1 else route[0]
+
+    def _handler_class(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                response = stub._respond(parsed.path, params)
+                status, body = response[0], response[1]
+                headers = response[2] if len(response) > 2 else {}
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Silenciar la salida en los tests
+
+        return Handler
+
+    def start(self) -> "StubProviderServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,123 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el historial y pronóstico de disponibilidad EnCicla.
+
+Para ejecutar: python -m pytest tests/unit/test_encicla.py -v
+"""
+
+import copy
+import unittest
+from datetime import datetime, timedelta
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.encicla import AvailabilityHistory
+
+MONDAY = datetime(2025, 10, 27)
+
+
+class TestAvailabilityHistory(unittest.TestCase):
+    """Tests para el búfer circular y el EWMA estacional."""
+
+    def test_ring_buffer_keeps_fixed_memory(self):
+        """Test: más muestras que la capacidad no crecen la memoria y conservan las últimas."""
+        history = AvailabilityHistory([20], ring_capacity=8)
+        for minute in range(0, 100, 5):
+            history.record(0, MONDAY + timedelta(minutes=minute), minute % 20, 20 - minute % 20)
+        times, bikes, _ = history.samples(0)
+        self.assertEqual(len(times), 8)
+        self.assertEqual(list(times), sorted(times))
+        self.assertEqual(times[-1], (MONDAY + timedelta(minutes=95)).timestamp())
+        self.assertEqual(history._times.shape, (1, 8))
+
+    def test_seasonal_forecast_follows_weekly_pattern(self):
+        """Test: si la estación se vacía cada lunes a las 8:00, el pronóstico lo anticipa."""
+        history = AvailabilityHistory([20])
+        for week in range(4):
+            day = MONDAY + timedelta(weeks=week)
+            history.record(0, day.replace(hour=6), 15, 5)
+            history.record(0, day.replace(hour=8), 0, 20)
+        now = MONDAY + timedelta(weeks=4, hours=6)
+        history.record(0, now, 15, 5)
+        bikes_soon, _ = history.forecast(0, now + timedelta(minutes=10))
+        bikes_later, docks_later = history.forecast(0, now + timedelta(hours=2, minutes=10))
+        self.assertGreater(bikes_soon, 10)
+        self.assertLess(bikes_later, 2)
+        self.assertGreater(docks_later, 18)
+
+    def test_forecast_without_samples(self):
+        """Test: sin muestras no hay pronóstico."""
+        bikes, docks = AvailabilityHistory([10]).forecast(0, MONDAY)
+        self.assertNotEqual(bikes, bikes)
+        self.assertNotEqual(docks, docks)
+
+
+class TestEnciclaRouting(unittest.TestCase):
+    """Tests para el uso del pronóstico en las rutas."""
+
+    def setUp(self):
+        self._stations = copy.deepcopy(tools.ENCICLA_STATIONS_MOCK)
+        self._history = tools.ENCICLA_AVAILABILITY
+        tools.ENCICLA_AVAILABILITY = AvailabilityHistory(
+            [s["bikes_available"] + s["docks_available"] for s in tools.ENCICLA_STATIONS_MOCK]
+        )
+        self.now = datetime(2025, 10, 29, 7, 50)
+        for station in tools.ENCICLA_STATIONS_MOCK:
+            tools.record_encicla_availability(
+                station["id"], station["bikes_available"], station["docks_available"], self.now
+            )
+
+    def tearDown(self):
+        tools.ENCICLA_AVAILABILITY = self._history
+        for station, saved in zip(tools.ENCICLA_STATIONS_MOCK, self._stations):
+            station.update(saved)
+
+    def bike_segments(self):
+        route = tools.calculate_multimodal_route(
+            "Laureles", "Centro", {"priority": "sustainability"}, "2025-10-29T08:00:00"
+        )
+        for option in [route["recommended_route"]] + route["alternative_routes"]:
+            if option["name"] == "Ruta Bici + Metro":
+                return [segment["instruction"] for segment in option["segments"]], route["alerts"]
+        return None, route["alerts"]
+
+    def test_skips_station_expected_empty(self):
+        """Test: una estación vacía no se usa para recoger la bici."""
+        segments, _ = self.bike_segments()
+        self.assertEqual(segments[0], "Toma bici en Estación Laureles")
+        tools.record_encicla_availability(5, 0, 20, self.now)
+        segments, _ = self.bike_segments()
+        self.assertNotEqual(segments[0], "Toma bici en Estación Laureles")
+
+    def test_no_bike_leg_without_docks(self):
+        """Test: si no hay anclajes esperados al dejar la bici, no se propone el tramo."""
+        for station in tools.ENCICLA_STATIONS_MOCK:
+            total = station["bikes_available"] + station["docks_available"]
+            tools.record_encicla_availability(station["id"], total, 0, self.now)
+        segments, alerts = self.bike_segments()
+        self.assertIsNone(segments)
+        self.assertTrue(any("EnCicla" in alert for alert in alerts))
+
+    def test_nearest_stations_with_arrival_forecast(self):
+        """Test: con hora de llegada se informan bicis y anclajes pronosticados."""
+        stations = tools.get_nearest_encicla_stations(
+            6.2447, -75.5956, k=2, arrival_time=(self.now + timedelta(minutes=15)).isoformat()
+        )
+        self.assertIn("forecast_bikes", stations[0])
+        self.assertAlmostEqual(stations[0]["forecast_bikes"], stations[0]["bikes_available"], delta=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el almacén de eventos de tráfico indexado por tiempo y zona.
+
+Para ejecutar: python -m pytest tests/unit/test_events.py -v
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from movility_ai.sub_agents.flowsense import predictor
+from movility_ai.sub_agents.flowsense.events import PENDING_MERGE_SIZE, EventStore
+
+DAY = datetime(2025, 10, 29)
+ZONES = ["centro", "poblado", "laureles", None]
+
+
+def random_events(count, seed=7):
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        start = DAY + timedelta(minutes=rng.randrange(0, 30 * 24 * 60))
+        end = start + timedelta(minutes=rng.randrange(0, 12 * 60))
+        events.append({
+            "id": i,
+            "zone": rng.choice(ZONES),
+            "start_time": start.isoformat(),
+            "estimated_end": end.isoformat(),
+        })
+    return events
+
+
+def brute_force(events, t0, t1, zone=None):
+    return [
+        event for event in events
+        if (zone is None or event["zone"] == zone)
+        and datetime.fromisoformat(event["start_time"]) <= t1
+        and datetime.fromisoformat(event["estimated_end"]) >= t0
+    ]
+
+
+class TestEventStore(unittest.TestCase):
+    """Tests para los índices de intervalos del almacén de eventos."""
+
+    def test_matches_linear_scan(self):
+        """Test: los índices dan lo mismo que recorrer todos los eventos."""
+        events = random_events(3000)
+        store = EventStore(events)
+        self.assertEqual(store.stats()["pending"], 0)
+        rng = random.Random(1)
+        for _ in range(50):
+            when = DAY + timedelta(minutes=rng.randrange(0, 31 * 24 * 60))
+            zone = rng.choice(ZONES)
+            self.assertEqual(store.active(when, zone), brute_force(events, when, when, zone))
+            until = when + timedelta(hours=2)
+            self.assertEqual(store.overlapping(when, until), brute_force(events, when, until))
+
+    def test_pending_events_are_visible(self):
+        """Test: los eventos recién agregados se ven antes de reconstruir los índices."""
+        events = random_events(PENDING_MERGE_SIZE + 10)
+        store = EventStore(events)
+        extra = {"id": "nuevo", "zone": "centro", "start_time": "2025-10-29T08:00:00", "estimated_end": "2025-10-29T09:00:00"}
+        store.add(extra)
+        self.assertEqual(store.stats()["pending"], 1)
+        self.assertIn(extra, store.active("2025-10-29T08:30:00", "centro"))
+        self.assertNotIn(extra, store.active("2025-10-29T08:30:00", "poblado"))
+
+    def test_endpoints_are_inclusive(self):
+        """Test: un evento está activo en su hora de inicio y en su hora de fin."""
+        store = EventStore(predictor.TRAFFIC_EVENTS_MOCK)
+        self.assertEqual([e["id"] for e in store.active("2025-10-29T09:00:00")], [1, 2])
+        self.assertEqual([e["id"] for e in store.active("2025-10-29T18:00:00")], [2, 3])
+        self.assertEqual(store.active("2025-10-30T00:00:00"), [])
+
+
+class TestGetTrafficEvents(unittest.TestCase):
+    """Tests para la tool get_traffic_events."""
+
+    def test_filters_by_zone(self):
+        """Test: el argumento zone filtra los eventos activos."""
+        at = "2025-10-29T08:00:00"
+        self.assertEqual([e["id"] for e in predictor.get_traffic_events(at_time=at)], [1, 2])
+        self.assertEqual([e["id"] for e in predictor.get_traffic_events("poblado", at)], [2])
+        self.assertEqual(predictor.get_traffic_events("estadio", at), [])
+        self.assertEqual([e["id"] for e in predictor.get_traffic_events("estadio", "2025-10-29T20:00:00")], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el motor de tarifas con integraciones y transbordos Cívica.
+
+Para ejecutar: python -m pytest tests/unit/test_fares.py -v
+"""
+
+import importlib.util
+import os
+import unittest
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.fares import (
+    CIVICA_TRANSFER_WINDOW_MIN,
+    FARE_PRODUCTS,
+    FEEDER_INTEGRATION_COP,
+    INTEGRATED_SERVICES,
+    PAYMENTS,
+    FareEngine,
+)
+
+# Copia de las tarifas en NaviMind (paquete hermano con el mismo nombre, no importable)
+NAVIMIND_FARE_TOOL = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "movility_ai", "tools", "fare_tool.py"
+)
+
+METRO = FARE_PRODUCTS["metro"]["civica"]
+BUS = FARE_PRODUCTS["bus"]["civica"]
+
+
+def leg(service, board=0.0, alight=0.0):
+    return {"service": service, "board": board, "alight": alight}
+
+
+class TestFareEngine(unittest.TestCase):
+    """Tests para las reglas compiladas del motor de tarifas."""
+
+    def setUp(self):
+        self.engine = FareEngine()
+
+    def test_integrated_system_is_one_fare(self):
+        """Test: Metro + Metrocable + Tranvía se paga una sola vez."""
+        self.assertEqual(self.engine.fare([leg("metro"), leg("metrocable"), leg("tranvia")]), METRO)
+        self.assertEqual(self.engine.fare([leg("metro")], payment="cash"), FARE_PRODUCTS["metro"]["cash"])
+
+    def test_feeder_integration_within_window(self):
+        """Test: alimentador + Metro con Cívica dentro de la ventana paga la tarifa integrada."""
+        integrated = METRO + FEEDER_INTEGRATION_COP
+        self.assertEqual(self.engine.fare([leg("alimentador", 0, 10), leg("metro", 15, 40)]), integrated)
+        self.assertEqual(self.engine.fare([leg("metro", 0, 20), leg("alimentador", 25, 35)]), integrated)
+
+    def test_feeder_integration_requires_window_and_civica(self):
+        """Test: fuera de la ventana o en efectivo se pagan las dos tarifas."""
+        late = [leg("alimentador", 0, 10), leg("metro", 10 + CIVICA_TRANSFER_WINDOW_MIN + 1, 100)]
+        self.assertEqual(self.engine.fare(late), FARE_PRODUCTS["alimentador"]["civica"] + METRO)
+        cash = [leg("alimentador", 0, 10), leg("metro", 15, 40)]
+        self.assertEqual(
+            self.engine.fare(cash, payment="cash"),
+            FARE_PRODUCTS["alimentador"]["cash"] + FARE_PRODUCTS["metro"]["cash"],
+        )
+
+    def test_regular_buses_do_not_integrate(self):
+        """Test: un bus urbano sin integración paga tarifa completa."""
+        self.assertEqual(self.engine.fare([leg("bus", 0, 10), leg("metro", 12, 30)]), BUS + METRO)
+
+    def test_unpaid_legs_are_free_and_transparent(self):
+        """Test: caminar o pedalear entre tramos no cuesta ni rompe la integración."""
+        legs = [leg("alimentador", 0, 10), leg("walking", 10, 14), leg("metro", 15, 40), leg("bicycling", 40, 50)]
+        self.assertEqual(self.engine.fare(legs), METRO + FEEDER_INTEGRATION_COP)
+        self.assertEqual(self.engine.fare([leg("walking")]), 0)
+
+    def test_vectorized_price_matches_single_fares(self):
+        """Test: cotizar un lote da lo mismo que cotizar cada itinerario."""
+        itineraries = [
+            [],
+            [leg("metro")],
+            [leg("alimentador", 0, 10), leg("metro", 15, 40), leg("alimentador", 45, 60)],
+            [leg("bus", 0, 10), leg("bus", 90, 100)],
+            [leg("metroplus", 0, 10), leg("metro", 12, 20)],
+        ]
+        prices = self.engine.price(itineraries)
+        self.assertIsInstance(prices, np.ndarray)
+        self.assertEqual(list(prices), [self.engine.fare(legs) for legs in itineraries])
+
+    def test_unknown_payment(self):
+        """Test: un medio de pago desconocido lanza ValueError."""
+        with self.assertRaises(ValueError):
+            self.engine.price([[leg("metro")]], payment="bitcoin")
+
+
+class TestNaviMindFareTable(unittest.TestCase):
+    """Tests para que la tabla de tarifas de NaviMind no se aparte de la de PathFinder."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not os.path.exists(NAVIMIND_FARE_TOOL):
+            raise unittest.SkipTest("NaviMind no está en este árbol")
+        spec = importlib.util.spec_from_file_location("navimind_fare_tool", NAVIMIND_FARE_TOOL)
+        cls.navimind = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(cls.navimind)
+
+    def test_same_rules(self):
+        """Test: mismas tarifas, sistema integrado, integración y ventana Cívica."""
+        self.assertEqual(self.navimind.FARE_PRODUCTS, FARE_PRODUCTS)
+        self.assertEqual(set(self.navimind.INTEGRATED_SERVICES), set(INTEGRATED_SERVICES))
+        self.assertEqual(self.navimind.FEEDER_INTEGRATION_COP, FEEDER_INTEGRATION_COP)
+        self.assertEqual(self.navimind.CIVICA_TRANSFER_WINDOW_MIN, CIVICA_TRANSFER_WINDOW_MIN)
+
+    def test_same_compiled_table(self):
+        """Test: cada primer tramo y cada transbordo cuestan lo mismo en los dos motores."""
+        engine = FareEngine()
+        for p, payment in enumerate(PAYMENTS):
+            for service in FARE_PRODUCTS:
+                j = engine.index[service]
+                self.assertEqual(self.navimind.FARE_TABLE[(payment, None, service, True)], engine.board[p, j])
+                for prev in FARE_PRODUCTS:
+                    i = engine.index[prev]
+                    for window, within in enumerate((False, True)):
+                        self.assertEqual(
+                            self.navimind.FARE_TABLE[(payment, prev, service, within)],
+                            engine.transfer[p, i, j, window],
+                            (payment, prev, service, within),
+                        )
+
+
+class TestFaresInTools(unittest.TestCase):
+    """Tests para el uso del motor de tarifas en las tools."""
+
+    def test_metro_fare_comes_from_engine(self):
+        """Test: la tarifa del Metro de las tools es la del motor."""
+        self.assertEqual(tools.METRO_FARE_COP, METRO)
+
+    def test_directions_transit_legs_are_priced(self):
+        """Test: los tramos de Directions sin tarifa se cotizan según vehículo y operador."""
+        directions_leg = {"steps": [
+            {"travel_mode": "WALKING"},
+            {"transit_details": {
+                "line": {"vehicle": {"type": "BUS"}, "agencies": [{"name": "Metro de Medellín"}]},
+                "departure_time": {"value": 0}, "arrival_time": {"value": 600},
+            }},
+            {"transit_details": {
+                "line": {"vehicle": {"type": "SUBWAY"}},
+                "departure_time": {"value": 900}, "arrival_time": {"value": 2400},
+            }},
+        ]}
+        fare_legs = tools._google_fare_legs(directions_leg)
+        self.assertEqual([fare_leg["service"] for fare_leg in fare_legs], ["alimentador", "metro"])
+        self.assertEqual(tools.FARE_ENGINE.fare(fare_legs), METRO + FEEDER_INTEGRATION_COP)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el nomenclátor local de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_geocoder.py -v
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from movility_ai.sub_agents.pathfinder import geocoder, tools
+from movility_ai.sub_agents.pathfinder.geocoder import Gazetteer, normalize_place
+
+PLACES = [
+    {"name": "El Poblado", "lat": 6.2088, "lon": -75.5664, "kind": "zone", "aliases": ["Poblado"]},
+    {"name": "Centro", "lat": 6.2518, "lon": -75.5636, "kind": "zone"},
+    {"name": "Poblado", "lat": 6.2125, "lon": -75.5780, "kind": "metro"},
+    {"name": "San Antonio", "lat": 6.2468, "lon": -75.5700, "kind": "metro"},
+    {"name": "Parque Lleras", "lat": 6.2088, "lon": -75.5664, "kind": "landmark"},
+    {"name": "Parque de los Pies Descalzos", "lat": 6.2445, "lon": -75.5778, "kind": "landmark"},
+]
+
+
+class TestGazetteer(unittest.TestCase):
+    """Tests para la resolución exacta, por prefijo y difusa."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_path = os.path.join(self.tmp.name, "geocode.json")
+        self.gazetteer = self.open(PLACES)
+
+    def open(self, places):
+        # Lo pendiente se escribe antes de borrar el directorio temporal
+        gazetteer = Gazetteer(places, cache_path=self.cache_path)
+        self.addCleanup(gazetteer.flush)
+        return gazetteer
+
+    def test_normalize(self):
+        """Test: sin tildes, mayúsculas, puntuación ni prefijo 'estación'."""
+        self.assertEqual(normalize_place("Estación  San Antonio!"), "san antonio")
+        self.assertEqual(normalize_place("Itagüí"), "itagui")
+
+    def test_exact_prefers_zone(self):
+        """Test: ante nombres repetidos gana la zona sobre la estación."""
+        place = self.gazetteer.resolve("poblado")
+        self.assertEqual(place["name"], "El Poblado")
+        self.assertEqual(place["kind"], "zone")
+        self.assertEqual(place["match"], "exact")
+
+    def test_prefix_of_any_word(self):
+        """Test: un prefijo de cualquier palabra ubica el lugar."""
+        self.assertEqual(self.gazetteer.resolve("Parque Ll")["name"], "Parque Lleras")
+        self.assertEqual(self.gazetteer.resolve("pies desc")["name"], "Parque de los Pies Descalzos")
+
+    def test_fuzzy_typo(self):
+        """Test: tolera errores de escritura con trigramas."""
+        place = self.gazetteer.resolve("San Antnio")
+        self.assertEqual(place["name"], "San Antonio")
+        self.assertEqual(place["match"], "fuzzy")
+        self.assertIsNone(self.gazetteer.resolve("Bogotá"))
+
+    def test_disk_cache(self):
+        """Test: lo resuelto difusamente se guarda y se reutiliza tras reiniciar."""
+        self.gazetteer.resolve("San Antnio")
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.gazetteer.flush()
+        with open(self.cache_path, encoding="utf-8") as handle:
+            self.assertIn("san antnio", json.load(handle)["entries"])
+
+        reloaded = self.open(PLACES)
+        place = reloaded.resolve("san antnio")
+        self.assertEqual(place["match"], "cache")
+        self.assertEqual(place["name"], "San Antonio")
+
+        changed = self.open(PLACES[:-1])
+        self.assertNotEqual(changed.resolve("san antnio")["match"], "cache")
+
+    def test_cache_is_bounded_lru(self):
+        """Test: el caché descarta la resolución menos usada y escribe a disco por lotes."""
+        def remote(query):
+            return {"name": query, "lat": 6.2, "lon": -75.5}
+
+        with mock.patch.object(geocoder, "MAX_CACHE_ENTRIES", 3), mock.patch.object(geocoder, "CACHE_FLUSH_EVERY", 4):
+            for query in ["calle 1", "calle 2", "calle 3"]:
+                self.gazetteer.resolve(query, remote=remote)
+            self.assertEqual(self.gazetteer.resolve("calle 1")["match"], "cache")
+            self.gazetteer.resolve("calle 4", remote=remote)
+        with open(self.cache_path, encoding="utf-8") as handle:
+            self.assertEqual(list(json.load(handle)["entries"]), ["calle 3", "calle 1", "calle 4"])
+        self.assertIsNone(self.gazetteer.resolve("calle 2"))
+
+    def test_remote_fallback(self):
+        """Test: las direcciones desconocidas usan el geocodificador externo una sola vez."""
+        calls = []
+
+        def remote(query):
+            calls.append(query)
+            return {"name": "Calle 10 # 43-20", "lat": 6.21, "lon": -75.57}
+
+        first = self.gazetteer.resolve("Calle 10 # 43-20", remote=remote)
+        second = self.gazetteer.resolve("calle 10 43 20", remote=remote)
+        self.assertEqual(first["match"], "remote")
+        self.assertEqual(second["match"], "cache")
+        self.assertEqual(len(calls), 1)
+
+
+class TestGeocodeTools(unittest.TestCase):
+    """Tests para el nomenclátor de las tools."""
+
+    def test_geocode_place(self):
+        """Test: ubica zonas, estaciones y sitios de interés."""
+        self.assertEqual(tools.geocode_place("Centro")["kind"], "zone")
+        self.assertEqual(tools.geocode_place("Estación Acevedo")["kind"], "metro")
+        self.assertEqual(tools.geocode_place("parque lleras")["kind"], "landmark")
+        self.assertIn("suggestions", tools.geocode_place("zzzz"))
+
+    def test_multimodal_route_resolves_places(self):
+        """Test: la ruta multimodal informa las coordenadas de origen y destino."""
+        result = tools.calculate_multimodal_route(
+            "Parque Lleras", "Centro", {"priority": "time"}, "2025-01-15T11:00:00"
+        )
+        self.assertAlmostEqual(result["origin_location"]["lat"], 6.2088, places=3)
+        self.assertAlmostEqual(result["destination_location"]["lat"], 6.2518, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
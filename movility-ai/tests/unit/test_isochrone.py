@@ -0,0 +1,97 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para las isócronas de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_isochrone.py -v
+"""
+
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.isochrone import convex_hull, hex_grid
+from movility_ai.sub_agents.pathfinder.spatial import haversine_km
+
+
+class TestGeometry(unittest.TestCase):
+    """Tests para la grilla hexagonal y la envolvente convexa."""
+
+    def test_hex_grid_covers_radius(self):
+        """Test: la grilla cubre el radio pedido con celdas equidistantes."""
+        lats, lons = hex_grid(6.25, -75.57, 2.0, cell_km=0.5)
+        distances = haversine_km(6.25, -75.57, lats, lons)
+        self.assertGreaterEqual(distances.max(), 2.0)
+        nearest = np.sort(haversine_km(lats[0], lons[0], lats, lons))[1]
+        self.assertAlmostEqual(float(nearest), 0.5 * np.sqrt(3), delta=0.01)
+
+    def test_convex_hull(self):
+        """Test: descarta los puntos interiores."""
+        hull = convex_hull([(0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0.5)])
+        self.assertEqual(sorted(hull), [(0, 0), (0, 1), (1, 0), (1, 1)])
+
+
+class TestRaptorReach(unittest.TestCase):
+    """Tests para el RAPTOR de uno a todos acotado."""
+
+    def test_matches_point_to_point(self):
+        """Test: las llegadas coinciden con consultas punto a punto."""
+        departure = datetime(2025, 1, 15, 8, 0)
+        start = 8 * 60
+        router = tools.TRANSIT_ROUTER
+        source = tools.TRANSIT_NETWORK.find_station("Acevedo")
+        arrivals = router.reach({source: start}, start + 60, router.timetables["weekday"])
+        for name in ("Poblado", "Santo Domingo", "San Antonio"):
+            itinerary = router.route("Acevedo", name, departure)
+            reached = arrivals[tools.TRANSIT_NETWORK.find_station(name)] - start
+            self.assertAlmostEqual(reached, itinerary["duration"], delta=1)
+
+
+class TestComputeIsochrone(unittest.TestCase):
+    """Tests para la herramienta compute_isochrone."""
+
+    def test_more_time_reaches_more(self):
+        """Test: con más minutos se alcanzan más hexágonos y zonas."""
+        short = tools.compute_isochrone("Centro", 10, None, "2025-01-15T08:00:00")
+        long = tools.compute_isochrone("Centro", 30, None, "2025-01-15T08:00:00")
+        self.assertLess(len(short["hexagons"]), len(long["hexagons"]))
+        self.assertLessEqual(len(short["zones"]), len(long["zones"]))
+        self.assertTrue(all(h["minutes"] <= 30 for h in long["hexagons"]))
+
+    def test_transit_extends_reach(self):
+        """Test: el Metro lleva más lejos que caminar en hora de servicio."""
+        walking = tools.compute_isochrone("Centro", 25, ["walking"], "2025-01-15T08:00:00")
+        transit = tools.compute_isochrone("Centro", 25, ["walking", "transit"], "2025-01-15T08:00:00")
+        night = tools.compute_isochrone("Centro", 25, ["walking", "transit"], "2025-01-15T02:00:00")
+        names = {station["name"] for station in transit["stations"]}
+        self.assertIn("Poblado", names)
+        self.assertNotIn("Poblado", {station["name"] for station in walking["stations"]})
+        self.assertEqual(len(night["stations"]), len(walking["stations"]))
+
+    def test_driving_reaches_other_municipalities(self):
+        """Test: en carro desde Laureles se llega a otros municipios en 30 minutos (con tráfico)."""
+        result = tools.compute_isochrone("Laureles", 30, ["driving"], "2025-01-15T11:00:00")
+        self.assertIn("Envigado", {zone["name"] for zone in result["zones"]})
+        self.assertGreaterEqual(len(result["polygon"]), 3)
+
+    def test_unknown_origin(self):
+        """Test: un origen desconocido devuelve error."""
+        self.assertIn("error", tools.compute_isochrone("Narnia", 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
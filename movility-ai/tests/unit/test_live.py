@@ -0,0 +1,123 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para la ingesta en streaming de velocidades de vehículos sonda.
+
+Para ejecutar: python -m pytest tests/unit/test_live.py -v
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from movility_ai.sub_agents.flowsense import predictor
+from movility_ai.sub_agents.flowsense.live import LIVE_MAX_WEIGHT, LiveTraffic, follow
+
+AT = "2025-10-27T12:00:00"
+
+
+class TestLiveTraffic(unittest.TestCase):
+    """Tests para el estado EWMA por zona."""
+
+    def test_matches_sequential_ewma_with_one_sample_per_batch(self):
+        """Test: con lotes de una muestra el estado es el EWMA clásico."""
+        live = LiveTraffic(["centro"], alpha=0.1, batch_size=1)
+        speeds = [30.0, 20.0, 40.0, 35.0, 10.0]
+        live.ingest(("centro", speed) for speed in speeds)
+
+        mean, var = speeds[0], 0.0
+        for speed in speeds[1:]:
+            delta = speed - mean
+            mean += 0.1 * delta
+            var = 0.9 * (var + 0.1 * delta * delta)
+        self.assertAlmostEqual(live.mean[0], mean)
+        self.assertAlmostEqual(live.var[0], var)
+        self.assertEqual(live.count[0], len(speeds))
+
+    def test_batches_split_by_zone(self):
+        """Test: un lote mezclado actualiza cada zona con sus muestras."""
+        live = LiveTraffic(["centro", "poblado", "laureles"])
+        rows = np.array([0, 1, 0, 1, 0])
+        speeds = np.array([10.0, 40.0, 20.0, 44.0, 30.0])
+        live.ingest_arrays(rows, speeds, AT)
+        self.assertAlmostEqual(live.mean[0], 20.0)
+        self.assertAlmostEqual(live.var[0], np.var([10.0, 20.0, 30.0]))
+        self.assertAlmostEqual(live.mean[1], 42.0)
+        self.assertEqual(live.count.tolist(), [3, 2, 0])
+        self.assertEqual(set(live.snapshot()), {"centro", "poblado"})
+
+    def test_lines_and_file_tail(self):
+        """Test: se consumen líneas de un archivo y se descartan las inválidas."""
+        live = LiveTraffic(["centro"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "probes.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("centro,12.5\natlantis,30\ncentro,abc\ncentro,17.5\n")
+            accepted = live.ingest_lines(follow(path, from_start=True), AT)
+        self.assertEqual(accepted, 2)
+        self.assertEqual(live.dropped, 2)
+        self.assertAlmostEqual(live.mean[0], 15.0)
+
+    def test_invalid_speeds_are_dropped(self):
+        """Test: velocidades nan, infinitas, negativas o absurdas no dañan el estado."""
+        live = LiveTraffic(["centro"])
+        accepted = live.ingest_lines(["centro,20", "centro,nan", "centro,inf", "centro,-5", "centro,900"], AT)
+        self.assertEqual((accepted, live.dropped), (1, 4))
+        speeds = np.array([30.0, np.nan, np.inf, -1.0, 1000.0])
+        live.ingest_arrays(np.zeros(5, dtype=np.int64), speeds, AT)
+        self.assertEqual(live.dropped, 8)
+        self.assertEqual(live.count[0], 2)
+        self.assertTrue(np.isfinite(live.mean[0]) and np.isfinite(live.var[0]))
+        self.assertEqual(live.ingest([("centro", float("nan")), ("centro", 25.0)], AT), 1)
+        self.assertTrue(np.isfinite(live.blend_weights(np.array([0]), AT)[0]).all())
+
+    def test_weight_grows_with_samples_and_decays_with_age(self):
+        """Test: el peso del estado en vivo depende de las muestras y de su antigüedad."""
+        live = LiveTraffic(["centro"])
+        rows = np.array([0])
+        self.assertEqual(live.blend_weights(rows, AT)[1][0], 0.0)
+        live.ingest_arrays(np.zeros(100, dtype=np.int64), np.full(100, 10.0), AT)
+        level, weight = live.blend_weights(rows, AT)
+        self.assertAlmostEqual(level[0], 0.8)
+        self.assertAlmostEqual(weight[0], LIVE_MAX_WEIGHT)
+        self.assertAlmostEqual(live.blend_weights(rows, "2025-10-27T12:10:00")[1][0], LIVE_MAX_WEIGHT / 2)
+
+
+class TestLiveBlend(unittest.TestCase):
+    """Tests para la mezcla del estado en vivo con el modelo estático."""
+
+    def tearDown(self):
+        predictor.LIVE_TRAFFIC.reset()
+
+    def test_prediction_blends_live_speeds(self):
+        """Test: reportes lentos suben la congestión y el efecto se diluye con el horizonte."""
+        static = predictor.predict_traffic_congestion(AT)["current_conditions"]["laureles"]["level"]
+        predictor.LIVE_TRAFFIC.ingest((("laureles", 5.0) for _ in range(50)), AT)
+
+        result = predictor.predict_traffic_congestion(AT)
+        laureles = result["current_conditions"]["laureles"]
+        self.assertAlmostEqual(laureles["level"], static + LIVE_MAX_WEIGHT * (0.9 - static))
+        self.assertIn("Reportes en vivo", laureles["causes"])
+        self.assertEqual(result["current_conditions"]["centro"]["live_weight"], 0.0)
+
+        forecast = predictor.forecast_congestion(["laureles"], [0, 60, 180], AT)["zones"]["laureles"]["levels"]
+        self.assertAlmostEqual(forecast[0], laureles["level"])
+        self.assertTrue(forecast[0] > forecast[1] > forecast[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para la búsqueda multicriterio con frente de Pareto de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_pareto.py -v
+"""
+
+import copy
+import random
+import unittest
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.pareto import dominates, pareto_search, rank_by_priority
+
+
+def _edge(target, duration, cost, co2, mode):
+    return (target, (duration, cost, co2), {"mode": mode})
+
+
+class TestParetoSearch(unittest.TestCase):
+    """Tests para la búsqueda de etiquetas multicriterio."""
+
+    def setUp(self):
+        self.graph = {
+            "a": [
+                _edge("b", 10, 0, 0, "walking"),
+                _edge("b", 3, 3050, 0.2, "transit"),
+                _edge("c", 2, 15000, 1.0, "driving"),
+            ],
+            "b": [_edge("c", 5, 0, 0, "walking"), _edge("c", 6, 1000, 0.0, "bicycling")],
+        }
+
+    def test_frontier_is_non_dominated(self):
+        """Test: el frente contiene sólo itinerarios no dominados."""
+        frontier = pareto_search(self.graph, "a", "c")
+        criteria = [label.criteria for label in frontier]
+        self.assertIn((15, 0, 0), criteria)
+        self.assertIn((8, 3050, 0.2), criteria)
+        self.assertIn((2, 15000, 1.0), criteria)
+        self.assertNotIn((16, 1000, 0.0), criteria)
+        for a in criteria:
+            self.assertFalse(any(dominates(b, a) for b in criteria))
+
+    def test_bounds_prune_labels(self):
+        """Test: los límites (presupuesto) descartan itinerarios."""
+        frontier = pareto_search(self.graph, "a", "c", bounds=(float("inf"), 5000, float("inf")))
+        self.assertTrue(all(label.criteria[1] <= 5000 for label in frontier))
+        self.assertEqual(len(frontier), 2)
+
+    def test_priority_is_a_post_filter(self):
+        """Test: la prioridad reordena el mismo frente."""
+        frontier = pareto_search(self.graph, "a", "c")
+        self.assertEqual(rank_by_priority(frontier, "time")[0].criteria[0], 2)
+        self.assertEqual(rank_by_priority(frontier, "cost")[0].criteria[1], 0)
+        self.assertEqual(
+            [leg["mode"] for leg in rank_by_priority(frontier, "cost")[0].edges()],
+            ["walking", "walking"],
+        )
+
+    def test_label_cap(self):
+        """Test: el número de etiquetas por nodo está acotado."""
+        rng = random.Random(7)
+        graph = {
+            n: [
+                _edge(n + 1, rng.randint(1, 20), rng.randint(0, 5000), rng.random(), "x")
+                for _ in range(4)
+            ]
+            for n in range(12)
+        }
+        frontier = pareto_search(graph, 0, 12, max_labels=5)
+        self.assertLessEqual(len(frontier), 5)
+        self.assertGreater(len(frontier), 0)
+
+
+class TestMultimodalFrontier(unittest.TestCase):
+    """Tests para el frente de Pareto en calculate_multimodal_route."""
+
+    def test_recommendation_follows_priority(self):
+        """Test: la ruta recomendada es la mejor del frente en el criterio elegido."""
+        preferences = {"max_budget": 20000}
+        fastest = tools.calculate_multimodal_route(
+            "Centro", "Poblado", {**preferences, "priority": "time"}, "2025-10-29T10:00:00"
+        )["recommended_route"]
+        cheapest = tools.calculate_multimodal_route(
+            "Centro", "Poblado", {**preferences, "priority": "cost"}, "2025-10-29T10:00:00"
+        )["recommended_route"]
+        self.assertLessEqual(fastest["total_duration"], cheapest["total_duration"])
+        self.assertLessEqual(cheapest["total_cost"], fastest["total_cost"])
+
+    def test_budget_uses_integrated_fares(self):
+        """Test: el presupuesto y la dominancia usan la tarifa integrada que se informa, no la suma por tramo."""
+        departure = tools._parse_departure_time("2025-10-29T10:00:00")
+        weather = tools.get_weather_conditions("Medellín")
+        base_routes = copy.deepcopy(tools._get_base_routes("Centro", "Poblado", departure))
+        # Tarifa del proveedor sin integración, por encima del presupuesto
+        base_routes["transit"]["cost"] = tools.METRO_FARE_COP + 2000
+        preferences = {"max_budget": tools.METRO_FARE_COP + 1000, "priority": "cost"}
+        result = tools._build_multimodal_route("Centro", preferences, departure, weather, base_routes, "Poblado")
+        routes = [result["recommended_route"], *result["alternative_routes"]]
+        self.assertIn(["transit"], [route["modes"] for route in routes])
+        self.assertTrue(all(route["total_cost"] <= preferences["max_budget"] for route in routes))
+        self.assertEqual([route["rank"] for route in routes], list(range(1, len(routes) + 1)))
+
+if __name__ == "__main__":
+    unittest.main()
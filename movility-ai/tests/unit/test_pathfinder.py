@@ -0,0 +1,69 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para las tools de rutas multimodales de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_pathfinder.py -v
+"""
+
+import unittest
+from unittest import mock
+
+from movility_ai.sub_agents.pathfinder import tools
+
+DEPARTURE = "2025-10-29T08:00:00"
+PAIRS = [("Niquía", "Poblado"), ("Centro", "Laureles"), ("Niquía", "Poblado")]
+
+
+class TestMultimodalRoutesBatch(unittest.TestCase):
+    """Tests para el cálculo de rutas por lotes."""
+
+    def test_matches_single_pair(self):
+        """Test: cada resultado coincide con el cálculo individual."""
+        batch = tools.calculate_multimodal_routes_batch(PAIRS, {"priority": "time"}, DEPARTURE)
+        self.assertEqual(len(batch), len(PAIRS))
+        for (origin, destination), result in zip(PAIRS, batch):
+            single = tools.calculate_multimodal_route(
+                origin, destination, {"priority": "time"}, DEPARTURE
+            )
+            self.assertEqual(result["recommended_route"], single["recommended_route"])
+
+    def test_weather_fetched_once_and_routes_reused(self):
+        """Test: el clima se consulta una vez y los pares repetidos no repiten rutas."""
+        with mock.patch.object(
+            tools, "get_weather_conditions", wraps=tools.get_weather_conditions
+        ) as weather, mock.patch.object(
+            tools, "get_route_google_maps", wraps=tools.get_route_google_maps
+        ) as routes:
+            tools.calculate_multimodal_routes_batch(PAIRS, {}, DEPARTURE)
+        self.assertEqual(weather.call_count, 1)
+        self.assertEqual(routes.call_count, 4 * 2)
+
+    def test_repeated_pairs_do_not_share_results(self):
+        """Test: modificar el resultado de un par repetido no cambia el otro."""
+        batch = tools.calculate_multimodal_routes_batch(PAIRS, {}, DEPARTURE)
+        self.assertEqual(batch[0], batch[2])
+        batch[0]["recommended_route"]["modes"].append("teleport")
+        self.assertNotIn("teleport", batch[2]["recommended_route"]["modes"])
+
+    def test_process_pool(self):
+        """Test: con varios procesos se conserva el orden de los pares."""
+        batch = tools.calculate_multimodal_routes_batch(PAIRS, {}, DEPARTURE, max_workers=2)
+        self.assertEqual(batch[0]["recommended_route"], batch[2]["recommended_route"])
+        self.assertEqual(len(batch), len(PAIRS))
+
+
+if __name__ == "__main__":
+    unittest.main()
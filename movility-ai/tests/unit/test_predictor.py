@@ -0,0 +1,137 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el predictor de tráfico de FlowSense.
+
+Para ejecutar: python -m pytest tests/unit/test_predictor.py -v
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from movility_ai.sub_agents.flowsense import predictor
+
+MONDAY = datetime(2025, 10, 27)
+
+
+class TestCongestionGrid(unittest.TestCase):
+    """Tests para la grilla zona x instante de congestión."""
+
+    def test_full_day_shape(self):
+        """Test: un día cada 5 minutos para todas las zonas son 288 columnas."""
+        grid = predictor.predict_congestion_grid(None, MONDAY, MONDAY + timedelta(days=1), 5)
+        self.assertEqual(grid.shape, (len(predictor.MEDELLIN_ZONES), 288))
+        self.assertTrue(((grid >= 0) & (grid <= 1)).all())
+
+    def test_matches_single_predictions(self):
+        """Test: cada celda coincide con predict_traffic_congestion para esa zona y hora."""
+        start = MONDAY + timedelta(days=4, hours=5)  # Viernes a sábado
+        grid = predictor.predict_congestion_grid(
+            ["poblado", "centro"], start, start + timedelta(days=1), 30, "rainy"
+        )
+        for column in range(grid.shape[1]):
+            when = start + timedelta(minutes=30 * column)
+            current = predictor.predict_traffic_congestion(when.isoformat(), None, "rainy")["current_conditions"]
+            self.assertAlmostEqual(grid[0, column], current["poblado"]["level"])
+            self.assertAlmostEqual(grid[1, column], current["centro"]["level"])
+
+    def test_iso_strings_and_empty_range(self):
+        """Test: acepta horas ISO y un rango vacío da cero columnas."""
+        grid = predictor.predict_congestion_grid(["centro"], "2025-10-27T07:00:00", "2025-10-27T07:00:00")
+        self.assertEqual(grid.shape, (1, 0))
+
+    def test_unknown_zone(self):
+        """Test: una zona inexistente lanza ValueError."""
+        with self.assertRaises(ValueError):
+            predictor.predict_congestion_grid(["atlantis"], MONDAY, MONDAY + timedelta(hours=1))
+
+
+class TestZoneModel(unittest.TestCase):
+    """Tests para las zonas compiladas en tablas por hora de la semana."""
+
+    def test_tables_follow_peak_hours(self):
+        """Test: la tabla de horas pico reproduce los rangos de MEDELLIN_ZONES en todos los días."""
+        model = predictor.ZONE_MODEL
+        self.assertEqual(model.peak.shape, (len(predictor.MEDELLIN_ZONES), predictor.HOURS_PER_WEEK))
+        for zone_id, zone in predictor.MEDELLIN_ZONES.items():
+            row = model.position[zone_id]
+            for how in range(predictor.HOURS_PER_WEEK):
+                is_peak = any(start <= how % 24 < end for start, end in zone["peak_hours"])
+                self.assertEqual(bool(model.peak[row, how]), is_peak)
+                expected = (zone["peak_multiplier"] if is_peak else 1.0) * (
+                    predictor.WEEKEND_FACTOR if how >= 5 * 24 else 1.0
+                )
+                self.assertAlmostEqual(model.multiplier[row, how], expected)
+
+    def test_weekend_peak_hours(self):
+        """Test: una zona con weekend_peak_hours cambia sólo la hora pico de sábado y domingo."""
+        model = predictor.ZoneModel({"feria": {
+            "name": "Feria", "base_congestion": 0.5, "peak_multiplier": 1.5,
+            "peak_hours": [(7, 9)], "weekend_peak_hours": [(14, 18)],
+        }})
+        self.assertTrue(model.peak[0, 7] and not model.peak[0, 14])
+        self.assertTrue(model.peak[0, 5 * 24 + 14] and not model.peak[0, 5 * 24 + 7])
+        self.assertFalse(hasattr(model, "__dict__"))
+
+    def test_historical_patterns(self):
+        """Test: los patrones históricos se leen de la tabla compilada."""
+        pattern = predictor.get_historical_patterns("poblado", 0, 8)
+        zone = predictor.MEDELLIN_ZONES["poblado"]
+        self.assertTrue(pattern["is_typical_peak_hour"])
+        self.assertAlmostEqual(pattern["average_congestion"], zone["base_congestion"] * zone["peak_multiplier"])
+        self.assertFalse(predictor.get_historical_patterns("poblado", 0, 12)["is_typical_peak_hour"])
+        self.assertIn("error", predictor.get_historical_patterns("atlantis", 0, 8))
+
+    def test_single_zone_prediction(self):
+        """Test: pedir una zona sólo retorna esa zona."""
+        result = predictor.predict_traffic_congestion("2025-10-27T08:00:00", "centro")
+        self.assertEqual(list(result["current_conditions"]), ["centro"])
+        self.assertIn("Hora pico", result["current_conditions"]["centro"]["causes"])
+
+
+class TestForecast(unittest.TestCase):
+    """Tests para el pronóstico numérico a horizontes arbitrarios."""
+
+    def test_default_horizons_every_5_minutes(self):
+        """Test: por defecto se pronostica cada 5 minutos hasta 3 horas."""
+        result = predictor.forecast_congestion(target_time="2025-10-27T06:00:00")
+        self.assertEqual(result["horizons_minutes"], list(range(0, 181, 5)))
+        self.assertEqual(len(result["zones"]), len(predictor.MEDELLIN_ZONES))
+        self.assertEqual(len(result["zones"]["centro"]["levels"]), 37)
+
+    def test_matches_grid(self):
+        """Test: los niveles coinciden con la grilla para los mismos instantes."""
+        start = MONDAY + timedelta(hours=6, minutes=50)
+        result = predictor.forecast_congestion(["centro", "poblado"], [0, 10, 70, 600], start.isoformat(), "rainy")
+        grid = predictor.predict_congestion_grid(["centro", "poblado"], start, start + timedelta(minutes=601), 10, "rainy")
+        self.assertEqual(result["zones"]["centro"]["levels"], grid[0, [0, 1, 7, 60]].tolist())
+        self.assertEqual(result["zones"]["poblado"]["is_peak"], [False, True, True, False])
+
+    def test_predict_traffic_uses_target_time(self):
+        """Test: la evolución a 30 y 60 min se mide desde target_time y no desde la hora actual."""
+        result = predictor.predict_traffic_congestion("2025-10-27T06:45:00")
+        self.assertEqual(result["prediction_30min"]["centro"], "Aumentará congestión (entrando a hora pico)")
+        self.assertEqual(result["prediction_60min"]["estadio"], "Se mantendrá similar")
+        levels = result["forecast"]["levels"]["centro"]
+        self.assertGreater(levels[0], result["current_conditions"]["centro"]["level"])
+
+    def test_invalid_input(self):
+        """Test: zonas desconocidas u horizontes negativos retornan error."""
+        self.assertIn("error", predictor.forecast_congestion(["atlantis"]))
+        self.assertIn("error", predictor.forecast_congestion(horizons_minutes=[-5]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el cliente HTTP compartido de proveedores externos.
+
+Usan un servidor HTTP local (StubProviderServer), sin conexión a internet.
+
+Para ejecutar: python -m pytest tests/unit/test_provider_client.py -v
+"""
+
+import os
+import unittest
+from unittest import mock
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.tools import provider_client
+from movility_ai.tools.provider_client import ProviderClient, ProviderError, TokenBucket
+from tests.unit.stub_server import StubProviderServer
+
+DIRECTIONS_OK = {
+    "status": "OK",
+    "routes": [{
+        "legs": [{
+            "duration": {"value": 1500},
+            "distance": {"value": 12500},
+            "steps": [{
+                "html_instructions": "Dirígete al <b>norte</b>",
+                "duration": {"value": 1500},
+                "distance": {"value": 12500},
+                "travel_mode": "DRIVING",
+            }],
+        }],
+    }],
+}
+
+
+class FakeClock:
+    """Reloj controlable: dormir avanza el tiempo."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests para el limitador de tasa."""
+
+    def test_burst_then_waits(self):
+        """Test: permite la ráfaga inicial y luego espera a la recarga."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_sec=2, capacity=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(clock.now, 0.0)
+        bucket.acquire()
+        self.assertAlmostEqual(clock.now, 0.5)
+
+    def test_timeout(self):
+        """Test: sin fichas y con timeout corto no se espera."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_sec=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        self.assertFalse(bucket.acquire(timeout=0.1))
+
+
+class TestProviderClient(unittest.TestCase):
+    """Tests para reintentos y conexiones persistentes."""
+
+    def client(self, url, **kwargs):
+        return ProviderClient(url, api_key=f"test-{id(self)}-{url}", rate_per_sec=1000,
+                              sleep=lambda s: None, **kwargs)
+
+    def test_keep_alive_reuses_connection(self):
+        """Test: varias consultas usan una sola conexión."""
+        with StubProviderServer({"/weather": [(200, {"ok": True})]}) as server:
+            client = self.client(server.url)
+            for _ in range(5):
+                self.assertEqual(client.get_json("/weather"), {"ok": True})
+            client.close()
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_retries_transient_errors(self):
+        """Test: reintenta 503 y 429 y devuelve la respuesta exitosa."""
+        routes = {"/x": [(503, {}), (429, {}, {"Retry-After": "0"}), (200, {"ok": 1})]}
+        with StubProviderServer(routes) as server:
+            self.assertEqual(self.client(server.url).get_json("/x"), {"ok": 1})
+        self.assertEqual(len(server.requests), 3)
+
+    def test_gives_up_after_max_retries(self):
+        """Test: tras agotar los reintentos lanza ProviderError."""
+        with StubProviderServer({"/x": [(500, {})]}) as server:
+            with self.assertRaises(ProviderError):
+                self.client(server.url, max_retries=2).get_json("/x")
+        self.assertEqual(len(server.requests), 3)
+
+    def test_client_errors_are_not_retried(self):
+        """Test: un 403 falla de inmediato."""
+        with StubProviderServer({"/x": [(403, {})]}) as server:
+            with self.assertRaises(ProviderError):
+                self.client(server.url).get_json("/x")
+        self.assertEqual(len(server.requests), 1)
+
+    def test_api_key_is_sent(self):
+        """Test: la API key viaja en el parámetro configurado."""
+        with StubProviderServer({"/x": [(200, {})]}) as server:
+            ProviderClient(server.url, api_key="abc", api_key_param="appid").get_json("/x")
+        self.assertEqual(server.requests[0][1]["appid"], "abc")
+
+
+class TestPathfinderProviders(unittest.TestCase):
+    """Tests para get_route_google_maps y get_weather_conditions con proveedores reales."""
+
+    def setUp(self):
+        tools.ROUTE_CACHE.clear()
+        tools.WEATHER_SERVICE.clear()
+
+    def test_directions_api_response_is_adapted(self):
+        """Test: la respuesta de Directions API se adapta al formato de las tools."""
+        with StubProviderServer({"/directions/json": [(200, DIRECTIONS_OK)]}) as server:
+            config = {**provider_client.PROVIDERS["google_maps"], "base_url": server.url}
+            with mock.patch.dict(provider_client.PROVIDERS, {"google_maps": config}), \
+                    mock.patch.dict(os.environ, {"GOOGLE_MAPS_API_KEY": "k"}):
+                route = tools.get_route_google_maps("Centro", "Envigado", "driving")
+        self.assertEqual(route["duration"], 25)
+        self.assertEqual(route["cost"], tools.DEFAULT_COST_COP["driving"])
+        self.assertEqual(route["steps"][0]["instruction"], "Dirígete al norte")
+
+    def test_weather_falls_back_to_mock(self):
+        """Test: si OpenWeather falla se usan los datos simulados."""
+        with StubProviderServer({"/weather": [(401, {})]}) as server:
+            config = {**provider_client.PROVIDERS["openweather"], "base_url": server.url}
+            with mock.patch.dict(provider_client.PROVIDERS, {"openweather": config}), \
+                    mock.patch.dict(os.environ, {"OPENWEATHER_API_KEY": "k"}):
+                weather = tools.get_weather_conditions("Medellín")
+        self.assertIn(weather["current"], tools.WEATHER_MOCK_DATA.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para las consultas concurrentes a proveedores de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_providers.py -v
+"""
+
+import asyncio
+import time
+import unittest
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.providers import LocalMockProvider
+
+DEPARTURE = "2025-10-29T08:00:00"
+
+
+class TestAsyncMultimodalRoute(unittest.TestCase):
+    """Tests para acalculate_multimodal_route."""
+
+    def test_matches_sync_version(self):
+        """Test: el resultado coincide con la versión síncrona."""
+        result = asyncio.run(
+            tools.acalculate_multimodal_route("Niquía", "Poblado", {}, DEPARTURE)
+        )
+        expected = tools.calculate_multimodal_route("Niquía", "Poblado", {}, DEPARTURE)
+        self.assertEqual(result["recommended_route"], expected["recommended_route"])
+
+    def test_calls_run_concurrently(self):
+        """Test: la latencia total es la del proveedor más lento, no la suma."""
+        provider = LocalMockProvider(
+            tools.get_route_google_maps,
+            tools.get_weather_conditions,
+            latency_seconds={"weather": 0.2, "walking": 0.2, "bicycling": 0.2,
+                             "transit": 0.3, "driving": 0.2},
+        )
+        start = time.perf_counter()
+        result = asyncio.run(
+            tools.acalculate_multimodal_route("Centro", "Poblado", {}, DEPARTURE, provider)
+        )
+        elapsed = time.perf_counter() - start
+        self.assertIsNotNone(result["recommended_route"])
+        self.assertLess(elapsed, 0.45)
+
+    def test_blocking_functions_do_not_block_the_loop(self):
+        """Test: funciones síncronas que bloquean corren en paralelo en hilos."""
+        def slow_route(*args):
+            time.sleep(0.3)
+            return tools.get_route_google_maps(*args)
+
+        provider = LocalMockProvider(slow_route, tools.get_weather_conditions)
+        start = time.perf_counter()
+        result = asyncio.run(
+            tools.acalculate_multimodal_route("Centro", "Poblado", {}, DEPARTURE, provider)
+        )
+        self.assertIsNotNone(result["recommended_route"])
+        self.assertLess(time.perf_counter() - start, 0.9)
+
+    def test_shares_route_cache_with_sync_version(self):
+        """Test: la versión asíncrona usa las mismas llaves de caché (con el clima)."""
+        tools.ROUTE_CACHE.clear()
+        tools.get_weather_conditions("Medellín")
+        asyncio.run(tools.acalculate_multimodal_route("Centro", "Poblado", {}, DEPARTURE))
+        hits = tools.ROUTE_CACHE.stats()["hits"]
+        tools.calculate_multimodal_route("Centro", "Poblado", {}, DEPARTURE)
+        self.assertEqual(tools.ROUTE_CACHE.stats()["hits"] - hits, len(tools.BASE_MODES))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el enrutador RAPTOR de transporte público de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_raptor.py -v
+"""
+
+import unittest
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.raptor import RaptorRouter
+from movility_ai.sub_agents.pathfinder.transit_network import TransitNetwork
+
+# Miércoles 29 de octubre de 2025 (día hábil) y sábado 1 de noviembre
+WEEKDAY_PEAK = datetime(2025, 10, 29, 7, 3)
+SATURDAY = datetime(2025, 11, 1, 7, 3)
+
+
+class TestRaptorRouter(unittest.TestCase):
+    """Tests para itinerarios de llegada más temprana."""
+
+    def setUp(self):
+        self.router = tools.TRANSIT_ROUTER
+
+    def test_direct_trip_waits_for_next_train(self):
+        """Test: la duración incluye la espera hasta el siguiente tren."""
+        itinerary = self.router.route("Niquía", "Poblado", WEEKDAY_PEAK)
+        self.assertEqual(itinerary["transfers"], 0)
+        self.assertEqual(itinerary["departure_time"], "07:04")
+        static = tools.TRANSIT_NETWORK.travel_time("Niquía", "Poblado")
+        self.assertGreaterEqual(itinerary["duration"], round(static))
+
+    def test_transfers_are_real_connections(self):
+        """Test: cada abordaje ocurre después del descenso anterior más el transbordo."""
+        itinerary = self.router.route("La Sierra", "Cisneros", WEEKDAY_PEAK)
+        self.assertEqual(
+            itinerary["lines"], ["metrocable_l", "metrocable_k", "linea_a", "linea_b"]
+        )
+        waits = [s for s in itinerary["steps"] if s["mode"] == "waiting"]
+        self.assertTrue(all(s["duration"] >= 0 for s in waits))
+
+    def test_weekend_headways_are_longer(self):
+        """Test: con frecuencias de fin de semana el viaje no es más rápido."""
+        weekday = self.router.route("Niquía", "La Estrella", WEEKDAY_PEAK)
+        weekend = self.router.route("Niquía", "La Estrella", SATURDAY)
+        self.assertGreaterEqual(weekend["duration"], weekday["duration"])
+
+    def test_no_service_after_closing(self):
+        """Test: después del último tren no hay itinerario."""
+        self.assertIsNone(
+            self.router.route("Niquía", "Poblado", datetime(2025, 10, 29, 23, 50))
+        )
+
+    def test_no_service_before_opening(self):
+        """Test: de madrugada no se espera horas al primer tren."""
+        self.assertIsNone(self.router.route("Niquía", "Poblado", datetime(2025, 10, 29, 2, 0)))
+        first = self.router.route("Niquía", "Poblado", datetime(2025, 10, 29, 4, 20))
+        self.assertEqual(first["departure_time"], "04:30")
+
+    def test_round_limit(self):
+        """Test: con un solo viaje no se puede llegar si hace falta transbordar."""
+        router = RaptorRouter(TransitNetwork({"a": ["X", "Y"], "b": ["Y", "Z"]}))
+        self.assertIsNone(router.route("X", "Z", WEEKDAY_PEAK, max_rounds=1))
+        self.assertEqual(router.route("X", "Z", WEEKDAY_PEAK)["transfers"], 1)
+
+
+class TestProfileSearch(unittest.TestCase):
+    """Tests para la búsqueda de perfil (rRAPTOR) y el barrido de horas de salida."""
+
+    def test_profile_matches_independent_searches(self):
+        """Test: el perfil da la misma llegada que una búsqueda por cada hora."""
+        router = tools.TRANSIT_ROUTER
+        network = tools.TRANSIT_NETWORK
+        origin, target = network.find_station("La Sierra"), network.find_station("Itagüí")
+        profile = router.profile(origin, target, 360, 540, router.timetables["weekday"])
+        boardings = [entry[0] for entry in profile]
+        self.assertEqual(boardings, sorted(boardings))
+        for minute in range(360, 541, 5):
+            expected = router.route("La Sierra", "Itagüí", datetime(2025, 10, 29) + timedelta(minutes=minute))
+            _, arrival, transfers = profile[bisect_left(boardings, minute)]
+            self.assertEqual(expected["arrival_time"], f"{int(arrival) // 60:02d}:{int(arrival) % 60:02d}")
+            self.assertEqual(expected["transfers"], transfers)
+
+    def test_best_departure_times(self):
+        """Test: el barrido cubre la ventana y recomienda la salida más corta."""
+        result = tools.find_best_departure_times(
+            "Niquía", "Poblado", "06:00", "09:00", 5, "2025-10-29", arrive_by="08:00"
+        )
+        self.assertEqual(len(result["departures"]), 37)
+        shortest = min(entry["best_duration"] for entry in result["departures"])
+        self.assertEqual(result["best_departures"][0]["duration"], shortest)
+        latest = result["latest_departure"]["departure_time"]
+        self.assertLessEqual(latest, "08:00")
+        entry = next(e for e in result["departures"] if e["departure_time"] == "07:00")
+        self.assertEqual(
+            entry["transit"]["arrival_time"],
+            tools.TRANSIT_ROUTER.route("Niquía", "Poblado", datetime(2025, 10, 29, 7, 0))["arrival_time"],
+        )
+
+    def test_invalid_window(self):
+        """Test: una hora inválida devuelve error."""
+        self.assertIn("error", tools.find_best_departure_times("Niquía", "Poblado", "6am"))
+
+
+class TestTransitMode(unittest.TestCase):
+    """Tests para el modo transit con hora de salida."""
+
+    def test_get_route_uses_timetable(self):
+        """Test: get_route_google_maps devuelve horas de salida y llegada."""
+        route = tools.get_route_google_maps(
+            "Acevedo", "San Antonio", "transit", WEEKDAY_PEAK.isoformat()
+        )
+        self.assertIn("arrival_time", route)
+        self.assertEqual(route["cost"], tools.METRO_FARE_COP)
+
+    def test_no_service_is_explicit(self):
+        """Test: sin servicio se informa el error en vez de un viaje en Metro que no existe."""
+        for hour, minute in ((23, 50), (2, 0)):
+            when = datetime(2025, 10, 29, hour, minute).isoformat()
+            route = tools.get_route_google_maps("Niquía", "Poblado", "transit", when)
+            self.assertEqual(route["error"], "Sin servicio a esa hora")
+            self.assertNotIn("steps", route)
+
+    def test_multimodal_without_metro_service(self):
+        """Test: la ruta multimodal de madrugada no ofrece Metro y lo avisa."""
+        result = tools.calculate_multimodal_route(
+            "Niquía", "Poblado", {"priority": "time", "use_bike": True, "max_budget": 50000}, "2025-10-29T02:00:00"
+        )
+        routes = [result["recommended_route"], *result["alternative_routes"]]
+        self.assertTrue(all("transit" not in route["modes"] for route in routes))
+        self.assertTrue(any("Sin servicio" in alert for alert in result["alerts"]))
+
+    def test_departure_sweep_bounds_the_wait(self):
+        """Test: el barrido de salidas no propone esperar al Metro más de la espera máxima."""
+        result = tools.find_best_departure_times(
+            "Niquía", "Poblado", "03:00", "05:00", 30, "2025-10-29", modes=["transit"]
+        )
+        plans = {entry["departure_time"]: entry.get("transit") for entry in result["departures"]}
+        self.assertIsNone(plans["03:00"])
+        self.assertIsNotNone(plans["04:30"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para la red vial y las jerarquías de contracción.
+
+Para ejecutar: python -m pytest tests/unit/test_road_network.py -v
+"""
+
+import heapq
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder import precompute, tools
+from movility_ai.sub_agents.pathfinder.contraction import ContractionHierarchy
+from movility_ai.sub_agents.pathfinder.elevation import ElevationRaster
+from movility_ai.sub_agents.pathfinder.road_network import (
+    BIKE_PROFILES,
+    DAY_TYPES,
+    PROFILE_POINTS,
+    ROAD_NODES,
+    RoadRouter,
+)
+
+
+def dijkstra(num_nodes, edges, source):
+    adjacency = [[] for _ in range(num_nodes)]
+    for u, v, w in edges:
+        adjacency[u].append((v, w))
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adjacency[u]:
+            if d + w < dist.get(v, float("inf")):
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return dist
+
+
+class TestContractionHierarchy(unittest.TestCase):
+    """Tests para el preprocesamiento y las consultas CH."""
+
+    def test_matches_dijkstra_on_random_directed_graph(self):
+        """Test: en un grafo dirigido aleatorio coincide con Dijkstra."""
+        rng = random.Random(7)
+        n = 60
+        edges = [(rng.randrange(n), rng.randrange(n), rng.uniform(1, 10)) for _ in range(240)]
+        ch = ContractionHierarchy.build(n, *zip(*edges))
+        weights = {}
+        for u, v, w in edges:
+            weights[(u, v)] = min(w, weights.get((u, v), float("inf")))
+
+        for source in range(0, n, 5):
+            expected = dijkstra(n, edges, source)
+            for target in range(n):
+                cost, path = ch.query(source, target)
+                if target not in expected:
+                    self.assertIsNone(path)
+                    continue
+                self.assertAlmostEqual(cost, expected[target], places=3)
+                # El camino desempaquetado usa aristas originales y suma el costo
+                self.assertEqual((path[0], path[-1]), (source, target))
+                total = sum(weights[(u, v)] for u, v in zip(path, path[1:]))
+                self.assertAlmostEqual(total, cost, places=3)
+
+    def test_distances_to_matches_queries(self):
+        """Test: el uno-a-todos invertido da el mismo costo que cada consulta."""
+        rng = random.Random(11)
+        n = 60
+        edges = [(rng.randrange(n), rng.randrange(n), rng.uniform(1, 10)) for _ in range(240)]
+        ch = ContractionHierarchy.build(n, *zip(*edges))
+        for target in range(0, n, 7):
+            distances = ch.distances_to(target)
+            for source in range(n):
+                self.assertAlmostEqual(distances[source], ch.query(source, target)[0], places=3)
+
+
+class TestRoadRouter(unittest.TestCase):
+    """Tests para el enrutador en carro."""
+
+    def test_saved_hierarchy_roundtrip(self):
+        """Test: la jerarquía guardada responde igual que la recién construida."""
+        built = RoadRouter.build()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "road.npz")
+            built.save(path)
+            loaded = RoadRouter.load(path)
+        origin, destination = ROAD_NODES["niquia"], ROAD_NODES["caldas"]
+        self.assertEqual(built.route(origin, destination), loaded.route(origin, destination))
+        self.assertEqual(loaded.fingerprint, built.fingerprint)
+
+    def test_changed_inputs_rebuild_saved_network(self):
+        """Test: otro perfil de ciclista u otro DEM invalidan el .npz guardado."""
+        built = RoadRouter.build()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "road.npz")
+            built.save(path)
+            cargo = {"flat_kmh": 10.0, "climb_m_per_min": 6.0, "descent_recovery": 0.3, "max_kmh": 25.0}
+            with mock.patch.dict(BIKE_PROFILES, {"cargo": cargo}):
+                with self.assertRaises(ValueError):
+                    RoadRouter(built.graph, built.hierarchy)
+                rebuilt = RoadRouter.load(path)
+                self.assertNotEqual(rebuilt.fingerprint, built.fingerprint)
+                self.assertEqual(len(rebuilt.graph["edge_bike_minutes"]), len(BIKE_PROFILES))
+
+            built.save(path)
+            with mock.patch.dict(os.environ, {"DEM_PATH": os.path.join(tmp, "otro_dem.npy")}):
+                self.assertNotEqual(RoadRouter.load(path).fingerprint, built.fingerprint)
+            self.assertEqual(RoadRouter.load(path).fingerprint, built.fingerprint)
+
+    def test_offline_build_is_loaded_without_rebuilding(self):
+        """Test: el paso offline escribe la jerarquía y al iniciar sólo se abre."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "road.npz")
+            with mock.patch.dict(os.environ, {"ROAD_CH_PATH": path}):
+                self.assertEqual(precompute.precompute(["roads"]), {"roads": path})
+                with mock.patch.object(RoadRouter, "build", side_effect=AssertionError("reconstruyó")):
+                    loaded = RoadRouter.load()
+        self.assertIsNotNone(loaded.route(ROAD_NODES["niquia"], ROAD_NODES["caldas"]))
+
+    def test_route_steps_follow_corridors(self):
+        """Test: Niquía → Caldas va por la Autopista."""
+        route = tools.get_road_router().route(ROAD_NODES["niquia"], ROAD_NODES["caldas"])
+        self.assertEqual(route["steps"][0]["instruction"], "Toma Autopista Norte")
+        self.assertEqual(route["steps"][-1]["instruction"], "Continúa por Autopista Sur")
+        self.assertAlmostEqual(sum(s["distance"] for s in route["steps"]), route["distance"], delta=0.2)
+
+    def test_driving_tool_uses_road_router(self):
+        """Test: sin API key, el modo driving sale de la red vial local."""
+        tools.ROUTE_CACHE.clear()
+        route = tools.get_route_google_maps("Laureles", "Centro", "driving")
+        self.assertTrue(route["steps"][0]["instruction"].startswith("Toma "))
+        self.assertGreaterEqual(route["cost"], tools.TAXI_MIN_COP)
+
+
+class TestTimeDependentRouting(unittest.TestCase):
+    """Tests para los perfiles de tráfico y el Dijkstra dependiente del tiempo."""
+
+    def test_profiles_never_faster_than_free_flow(self):
+        """Test: los perfiles cubren el día y nunca bajan del flujo libre."""
+        graph = tools.get_road_router().graph
+        profile = graph["edge_profile"]
+        self.assertEqual(profile.shape, (len(DAY_TYPES), len(graph["edge_minutes"]), PROFILE_POINTS + 1))
+        self.assertTrue((profile >= graph["edge_minutes"][None, :, None] - 1e-4).all())
+
+    def test_peak_slower_than_midday(self):
+        """Test: Niquía → Caldas tarda más a las 7:30 que a las 11:00."""
+        origin, destination = ROAD_NODES["niquia"], ROAD_NODES["caldas"]
+        peak = tools.get_road_router().route(origin, destination, datetime(2025, 1, 15, 7, 30))
+        midday = tools.get_road_router().route(origin, destination, datetime(2025, 1, 15, 11, 0))
+        self.assertGreater(peak["duration"], midday["duration"])
+        self.assertGreater(midday["duration"], midday["free_flow_duration"])
+
+    def test_hierarchy_guided_search_is_exact(self):
+        """Test: el A* guiado por la jerarquía da lo mismo que el Dijkstra dependiente del tiempo."""
+        router = tools.get_road_router()
+        rng = random.Random(5)
+        nodes = len(router.graph["node_lat"])
+        for _ in range(200):
+            source, target = rng.randrange(nodes), rng.randrange(nodes)
+            when = datetime(2025, 1, rng.randrange(13, 20), rng.randrange(24), rng.randrange(60))
+            plain, _ = router._td_dijkstra(source, 0.0, when, target=target)
+            guided, _ = router._td_dijkstra(source, 0.0, when, target=target, potentials=router._potentials(target))
+            self.assertAlmostEqual(guided[target], plain[target], places=4)
+            self.assertLessEqual(len(guided), len(plain))
+
+    def test_peak_ramps_without_jumps(self):
+        """Test: la duración cambia poco entre salidas con un minuto de diferencia."""
+        origin, destination = ROAD_NODES["laureles"], ROAD_NODES["parque_poblado"]
+        durations = [
+            tools.get_road_router().route(origin, destination, datetime(2025, 1, 15, 6, minute))["duration"]
+            for minute in range(30, 60)
+        ]
+        steps = [abs(b - a) for a, b in zip(durations, durations[1:])]
+        self.assertLess(max(steps), 3)
+        self.assertGreater(durations[-1], durations[0])
+
+    def test_reach_respects_departure(self):
+        """Test: en hora pico se alcanzan menos nodos en el mismo tiempo."""
+        origin = ROAD_NODES["centro"]
+        peak = tools.get_road_router().reach(origin, 10, datetime(2025, 1, 15, 18, 0))
+        night = tools.get_road_router().reach(origin, 10, datetime(2025, 1, 15, 23, 0))
+        self.assertLessEqual(int((peak < 10).sum()), int((night < 10).sum()))
+        self.assertTrue((peak >= night - 1e-6).all())
+
+    def test_profile_matches_route(self):
+        """Test: el perfil de salidas coincide con una ruta por cada hora."""
+        origin, destination = ROAD_NODES["niquia"], ROAD_NODES["caldas"]
+        departures = [datetime(2025, 1, 15, 6, 0) + timedelta(minutes=5 * i) for i in range(37)]
+        durations = tools.get_road_router().profile(origin, destination, departures)
+        for when, duration in zip(departures, durations):
+            self.assertAlmostEqual(duration, tools.get_road_router().route(origin, destination, when)["duration"], places=3)
+
+
+class TestBikeRouting(unittest.TestCase):
+    """Tests para las rutas en bici con pendiente."""
+
+    def test_raster_is_memory_mapped(self):
+        """Test: el DEM guardado se abre mapeado en memoria y muestrea igual."""
+        with tempfile.TemporaryDirectory() as tmp:
+            raster = ElevationRaster.load(os.path.join(tmp, "dem.npy"))
+            self.assertIsInstance(raster.grid, np.memmap)
+            lat, lon = ROAD_NODES["las_palmas_2"]
+            self.assertGreater(float(raster.sample(lat, lon)), float(raster.sample(*ROAD_NODES["centro"])))
+            del raster
+
+    def test_uphill_slower_than_downhill(self):
+        """Test: subir por Las Palmas cuesta más que bajar."""
+        up = tools.get_road_router().bike_route(ROAD_NODES["parque_poblado"], ROAD_NODES["las_palmas_2"], "pedal")
+        down = tools.get_road_router().bike_route(ROAD_NODES["las_palmas_2"], ROAD_NODES["parque_poblado"], "pedal")
+        self.assertGreater(up["ascent"], 100)
+        self.assertGreater(up["duration"], 2 * down["duration"])
+
+    def test_ebike_profile_swaps_costs(self):
+        """Test: con bici eléctrica la subida es más rápida y la red no se reconstruye."""
+        router = tools.get_road_router()
+        graph = router.graph
+        origin, destination = ROAD_NODES["parque_poblado"], ROAD_NODES["las_palmas_2"]
+        pedal = router.bike_route(origin, destination, "pedal")
+        ebike = router.bike_route(origin, destination, "ebike")
+        self.assertLess(ebike["duration"], pedal["duration"])
+        self.assertEqual(graph["edge_bike_minutes"].shape[0], len(BIKE_PROFILES))
+        self.assertIs(router.graph, graph)
+        self.assertEqual(router.bike_route(origin, destination)["duration"], pedal["duration"])
+
+    def test_bike_profile_is_per_request(self):
+        """Test: el perfil de una consulta no cambia las rutas en bici de las demás."""
+        tools.ROUTE_CACHE.clear()
+        ebike = tools.get_route_google_maps("El Poblado", "Centro", "bicycling", bike_profile="ebike")
+        pedal = tools.get_route_google_maps("El Poblado", "Centro", "bicycling")
+        self.assertEqual((ebike["bike_profile"], pedal["bike_profile"]), ("ebike", "pedal"))
+        self.assertLess(ebike["duration"], pedal["duration"])
+        self.assertIn("error", tools.get_route_google_maps("El Poblado", "Centro", "bicycling", bike_profile="monociclo"))
+        self.assertFalse(hasattr(tools, "set_bike_profile"))
+
+    def test_bicycling_tool_uses_slope(self):
+        """Test: sin API key, el modo bicycling informa el desnivel."""
+        tools.ROUTE_CACHE.clear()
+        route = tools.get_route_google_maps("El Poblado", "Centro", "bicycling")
+        self.assertIn("ascent", route)
+        self.assertEqual(route["bike_profile"], "pedal")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para la caché de rutas de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_route_cache.py -v
+"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.route_cache import RouteCache
+
+
+class FakeClock:
+    """Reloj controlable para probar la expiración."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRouteCache(unittest.TestCase):
+    """Tests para llaves, desalojo LRU y vigencia por modo."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = RouteCache(max_entries=2, ttl_seconds={"driving": 60}, clock=self.clock)
+
+    def key(self, origin="Laureles", mode="driving", minute=0, weather="Despejado"):
+        return RouteCache.make_key(
+            origin, "El Poblado", mode, datetime(2025, 10, 29, 7, minute), weather
+        )
+
+    def test_key_normalization_and_bucket(self):
+        """Test: la llave ignora tildes/mayúsculas y agrupa por franja de 15 min."""
+        self.assertEqual(self.key("LAURELES", minute=1), self.key("Laureles", minute=14))
+        self.assertNotEqual(self.key(minute=14), self.key(minute=15))
+        self.assertNotEqual(self.key(weather="Lluvioso"), self.key())
+        self.assertNotEqual(self.key(mode="transit", minute=0), self.key(mode="transit", minute=1))
+
+    def test_hit_returns_copy(self):
+        """Test: un acierto devuelve una copia independiente."""
+        self.cache.set(self.key(), {"duration": 25, "steps": []})
+        route = self.cache.get(self.key())
+        route["steps"].append("x")
+        self.assertEqual(self.cache.get(self.key())["steps"], [])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_lru_eviction(self):
+        """Test: al superar el tamaño se desaloja la entrada menos usada."""
+        self.cache.set(self.key("a"), {"duration": 1})
+        self.cache.set(self.key("b"), {"duration": 2})
+        self.cache.get(self.key("a"))
+        self.cache.set(self.key("c"), {"duration": 3})
+        self.assertIsNone(self.cache.get(self.key("b")))
+        self.assertIsNotNone(self.cache.get(self.key("a")))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_ttl_per_mode(self):
+        """Test: cada modo expira según su vigencia."""
+        self.cache.set(self.key(), {"duration": 25})
+        self.clock.now = 59
+        self.assertIsNotNone(self.cache.get(self.key()))
+        self.clock.now = 60
+        self.assertIsNone(self.cache.get(self.key()))
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+
+class TestCachedRoutes(unittest.TestCase):
+    """Tests para la caché delante de get_route_google_maps."""
+
+    def setUp(self):
+        tools.ROUTE_CACHE.clear()
+
+    def test_repeated_request_skips_provider(self):
+        """Test: la misma consulta en la misma franja no vuelve al proveedor."""
+        with mock.patch.object(tools, "_fetch_route", wraps=tools._fetch_route) as fetch:
+            first = tools.get_route_google_maps("Centro", "Poblado", "driving", "2025-10-29T07:01:00")
+            duration = first["duration"]
+            first["duration"] = 999
+            second = tools.get_route_google_maps("centro", "Poblado", "driving", "2025-10-29T07:10:00")
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(second["duration"], duration)
+
+    def test_transit_uses_exact_departure_minute(self):
+        """Test: en transporte público no se reusa el itinerario de otro minuto de la franja."""
+        first = tools.get_route_google_maps("Niquía", "Poblado", "transit", "2025-10-29T08:00:00")
+        later = tools.get_route_google_maps("Niquía", "Poblado", "transit", "2025-10-29T08:14:00")
+        self.assertGreaterEqual(first["departure_time"], "08:00")
+        self.assertGreaterEqual(later["departure_time"], "08:14")
+        self.assertGreater(later["arrival_time"], first["arrival_time"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el índice espacial de estaciones EnCicla.
+
+Para ejecutar: python -m pytest tests/unit/test_spatial.py -v
+"""
+
+import unittest
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.spatial import StationIndex, haversine_km
+
+
+class TestHaversine(unittest.TestCase):
+    """Tests para la distancia Haversine vectorizada."""
+
+    def test_known_distance(self):
+        """Test: Parque Lleras → Laureles está a unos 5.2 km."""
+        distance = haversine_km(6.2088, -75.5664, 6.2447, -75.5956)
+        self.assertAlmostEqual(float(distance), 5.16, delta=0.1)
+
+    def test_broadcasting(self):
+        """Test: calcula una matriz de distancias con broadcasting."""
+        lats = np.array([6.2, 6.25])
+        matrix = haversine_km(lats[:, None], -75.57, lats[None, :], -75.57)
+        self.assertEqual(matrix.shape, (2, 2))
+        self.assertAlmostEqual(float(matrix[0, 0]), 0.0)
+
+
+class TestStationIndex(unittest.TestCase):
+    """Tests para búsquedas por radio y k vecinos."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.stations = [
+            {"id": i, "lat": 6.15 + rng.random() * 0.2, "lon": -75.65 + rng.random() * 0.15}
+            for i in range(2000)
+        ]
+        self.index = StationIndex(self.stations)
+        self.queries = rng.random((200, 2)) * [0.3, 0.25] + [6.1, -75.7]
+        self.brute = haversine_km(
+            self.queries[:, 0][:, None], self.queries[:, 1][:, None],
+            self.index.lats[None, :], self.index.lons[None, :],
+        )
+
+    def test_nearest_many_matches_brute_force(self):
+        """Test: k vecinos coinciden con la búsqueda exhaustiva."""
+        _, distances = self.index.nearest_many(self.queries[:, 0], self.queries[:, 1], k=4)
+        np.testing.assert_allclose(distances, np.sort(self.brute, axis=1)[:, :4])
+
+    def test_radius_many_matches_brute_force(self):
+        """Test: la búsqueda por radio encuentra exactamente las estaciones internas."""
+        indices, distances = self.index.query_radius_many(
+            self.queries[:, 0], self.queries[:, 1], 1.5
+        )
+        for q in range(len(self.queries)):
+            expected = set(np.flatnonzero(self.brute[q] <= 1.5))
+            self.assertEqual(set(indices[q].tolist()), expected)
+            self.assertTrue(np.all(np.diff(distances[q]) >= 0))
+
+    def test_fewer_stations_than_k(self):
+        """Test: rellena con -1 si hay menos estaciones que k."""
+        index = StationIndex(self.stations[:2])
+        indices, distances = index.nearest(6.2, -75.6, k=3)
+        self.assertEqual(indices[-1], -1)
+        self.assertTrue(np.isinf(distances[-1]))
+
+
+class TestEnCiclaTools(unittest.TestCase):
+    """Tests para las tools de EnCicla de PathFinder."""
+
+    def test_radius_filters_stations(self):
+        """Test: el radio descarta estaciones lejanas."""
+        stations = tools.get_encicla_stations(6.2447, -75.5956, radius_km=1.0)
+        self.assertEqual([s["name"] for s in stations], ["Estación Laureles"])
+
+    def test_nearest_with_bikes(self):
+        """Test: la estación más cercana respeta el mínimo de bicicletas."""
+        nearest = tools.get_nearest_encicla_stations(6.2676, -75.5694, k=1, min_bikes=6)
+        self.assertNotEqual(nearest[0]["name"], "Estación Universidad de Antioquia")
+
+    def test_bike_route_picks_station_near_origin(self):
+        """Test: la ruta Bici + Metro toma la bici junto al origen real."""
+        result = tools.calculate_multimodal_route(
+            "6.2447,-75.5956", "Poblado", {"use_bike": True}, "2025-10-29T08:00:00"
+        )
+        routes = [result["recommended_route"]] + result["alternative_routes"]
+        bike = next(r for r in routes if r["name"] == "Ruta Bici + Metro")
+        self.assertIn("Laureles", bike["segments"][0]["instruction"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para la red de Metro/Metrocable precalculada de PathFinder.
+
+Para ejecutar: python -m pytest tests/unit/test_transit_network.py -v
+"""
+
+import unittest
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.transit_network import (
+    TransitNetwork,
+    normalize_station_name,
+)
+
+
+class TestTransitNetwork(unittest.TestCase):
+    """Tests para la tabla de caminos mínimos entre estaciones."""
+
+    def setUp(self):
+        self.network = tools.TRANSIT_NETWORK
+
+    def test_normalize_station_name(self):
+        """Test: ignora tildes, mayúsculas y el prefijo 'Estación'."""
+        self.assertEqual(normalize_station_name("Estación Itagüí"), "itagui")
+        self.assertEqual(normalize_station_name("  PARQUE  Berrío "), "parque berrio")
+
+    def test_same_line_travel_time(self):
+        """Test: Niquía → Poblado es un viaje directo por la Línea A."""
+        leg = self.network.route("Niquía", "Poblado")
+        self.assertEqual(leg["transfers"], 0)
+        self.assertEqual(leg["lines"], ["linea_a"])
+        self.assertEqual(self.network.travel_time("Niquía", "Poblado"), leg["duration"])
+
+    def test_transfer_at_shared_station(self):
+        """Test: Santo Domingo → Itagüí transborda en Acevedo."""
+        leg = self.network.route("Santo Domingo", "Itagüí")
+        self.assertEqual(leg["lines"], ["metrocable_k", "linea_a"])
+        self.assertIn("Acevedo", leg["steps"][0]["instruction"])
+
+    def test_disconnected_and_unknown_stations(self):
+        """Test: estaciones sin conexión o inexistentes no tienen tramo."""
+        self.assertIsNone(self.network.route("San Javier", "Poblado"))
+        self.assertIsNone(self.network.travel_time("Parque Lleras", "Poblado"))
+
+    def test_table_is_symmetric(self):
+        """Test: la tabla es simétrica para una red con líneas bidireccionales."""
+        network = TransitNetwork({"a": ["X", "Y", "Z"], "b": ["Y", "W"]})
+        for origin in network.stations:
+            for destination in network.stations:
+                self.assertEqual(
+                    network.travel_time(origin, destination),
+                    network.travel_time(destination, origin),
+                )
+
+
+class TestTransitRoutes(unittest.TestCase):
+    """Tests para el modo transit de get_route_google_maps."""
+
+    def test_station_to_station_uses_network(self):
+        """Test: un tramo entre estaciones usa la red y la tarifa integrada."""
+        route = tools.get_route_google_maps("Acevedo", "San Antonio", "transit")
+        self.assertEqual(route["cost"], tools.METRO_FARE_COP)
+        self.assertEqual(route["transfers"], 0)
+        self.assertIn("San Antonio", route["steps"][-1]["instruction"])
+
+    def test_free_text_walks_to_nearest_stations(self):
+        """Test: orígenes que no son estaciones caminan a la más cercana y usan RAPTOR."""
+        route = tools.get_route_google_maps("Centro", "Poblado", "transit", "2025-10-29T08:00:00")
+        self.assertEqual(route["steps"][0]["mode"], "walking")
+        self.assertIn("Parque Berrío", route["steps"][0]["instruction"])
+        self.assertEqual(route["stations"][0], "Parque Berrío")
+        self.assertEqual(route["stations"][-1], "Poblado")
+        self.assertGreater(route["duration"], route["steps"][0]["duration"])
+
+        coords = tools.get_route_google_maps("6.2442,-75.5812", "Parque Lleras", "transit", "2025-10-29T08:00:00")
+        self.assertEqual(coords["transfers"], 1)
+        self.assertEqual(coords["steps"][-1]["instruction"], "Camina al destino")
+        late = tools.get_route_google_maps("Centro", "Poblado", "transit", "2025-10-29T23:59:00")
+        self.assertEqual(late["error"], "Sin servicio a esa hora")
+
+if __name__ == "__main__":
+    unittest.main()
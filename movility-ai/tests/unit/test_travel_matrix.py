@@ -0,0 +1,98 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para las matrices de tiempos de viaje muchos-a-muchos.
+
+Para ejecutar: python -m pytest tests/unit/test_travel_matrix.py -v
+"""
+
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.road_network import ACCESS_SPEED_KMH, BIKE_PROFILES, ROAD_DETOUR_FACTOR
+from movility_ai.sub_agents.pathfinder.spatial import haversine_km
+
+DEPARTURE = datetime(2025, 10, 29, 8, 0)
+
+
+def random_points(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(6.16, 6.33, n), rng.uniform(-75.61, -75.55, n)]).tolist()
+
+
+class TestTravelTimeMatrix(unittest.TestCase):
+    """Tests para travel_time_matrix."""
+
+    def test_driving_matches_point_to_point_routes(self):
+        """Test: cada celda coincide con la ruta punto a punto (o el trayecto local directo)."""
+        points = random_points(6, 3)
+        matrix = tools.travel_time_matrix(points, "driving", DEPARTURE.isoformat())
+        for i, origin in enumerate(points):
+            for j, destination in enumerate(points):
+                route = tools.get_road_router().route(tuple(origin), tuple(destination), DEPARTURE)
+                local = haversine_km(*origin, *destination) * ROAD_DETOUR_FACTOR / ACCESS_SPEED_KMH * 60.0
+                self.assertAlmostEqual(matrix[i, j], min(route["duration"], local), places=2)
+
+    def test_bicycling_follows_road_slopes(self):
+        """Test: en bici cada celda coincide con la ruta con pendiente (o el trayecto directo)."""
+        points = random_points(6, 9)
+        for profile in BIKE_PROFILES:
+            matrix = tools.travel_time_matrix(points, "bicycling", bike_profile=profile)
+            speed = BIKE_PROFILES[profile]["flat_kmh"]
+            for i, origin in enumerate(points):
+                for j, destination in enumerate(points):
+                    route = tools.get_road_router().bike_route(tuple(origin), tuple(destination), profile)
+                    local = haversine_km(*origin, *destination) * ROAD_DETOUR_FACTOR / speed * 60.0
+                    self.assertAlmostEqual(matrix[i, j], min(route["duration"], local), places=2)
+
+    def test_transit_never_slower_than_walking(self):
+        """Test: el Metro nunca empeora la caminata directa y la diagonal es cero."""
+        points = random_points(40, 5)
+        transit = tools.travel_time_matrix(points, "transit", DEPARTURE.isoformat())
+        walking = tools.travel_time_matrix(points, "walking", DEPARTURE.isoformat())
+        self.assertTrue((transit <= walking + 1e-3).all())
+        self.assertTrue((transit < walking - 5).any())
+        self.assertTrue(np.allclose(np.diag(transit), 0.0))
+
+    def test_rectangular_matrix_with_places(self):
+        """Test: orígenes y destinos distintos, también como nombres de lugares."""
+        matrix = tools.travel_time_matrix(
+            ["Laureles", "6.2,-75.57"], "bicycling", destinations=["Centro", "El Poblado", "Envigado"]
+        )
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(matrix.dtype, np.float32)
+
+    def test_parallel_blocks_match_single_process(self):
+        """Test: repartir filas entre procesos da la misma matriz."""
+        points = random_points(30, 7)
+        single = tools.travel_time_matrix(points, "transit", DEPARTURE.isoformat(), max_workers=1)
+        parallel = tools.travel_time_matrix(points, "transit", DEPARTURE.isoformat(), max_workers=2)
+        np.testing.assert_array_equal(single, parallel)
+
+    def test_invalid_input(self):
+        """Test: modo o lugar desconocido lanzan ValueError."""
+        with self.assertRaises(ValueError):
+            tools.travel_time_matrix([(6.25, -75.57)], "teleport")
+        with self.assertRaises(ValueError):
+            tools.travel_time_matrix(["Narnia"], "walking")
+        with self.assertRaises(ValueError):
+            tools.travel_time_matrix([(6.25, -75.57)], "bicycling", bike_profile="tandem")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para los viajes activos y el re-enrutamiento por incidentes.
+
+Para ejecutar: python -m pytest tests/unit/test_trip_sessions.py -v
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from movility_ai.sub_agents.flowsense import predictor
+from movility_ai.sub_agents.flowsense.predictor import TRAFFIC_EVENTS_MOCK
+from movility_ai.sub_agents.pathfinder import tools
+from movility_ai.sub_agents.pathfinder.trip_sessions import ActiveTrips, road_segments, transit_segments
+
+PREFERENCES = {"priority": "time", "use_bike": False, "max_budget": 50000}
+
+# Por la Autopista Norte (cruza la Calle 67) y por Av. El Poblado (no la cruza)
+NORTH_TRIP = ("6.3375,-75.5480", "6.2490,-75.5790")
+SOUTH_TRIP = ("6.2088,-75.5690", "6.1719,-75.5863")
+OFF_PEAK = "2025-10-29T11:00:00"
+
+
+class TestActiveTrips(unittest.TestCase):
+    """Tests para el índice inverso tramo -> sesiones."""
+
+    def test_segments_ignore_direction(self):
+        """Test: un tramo recorrido en ambos sentidos es la misma llave."""
+        self.assertEqual(road_segments([3, 1, 2]), [("road", 1, 3), ("road", 1, 2)])
+        self.assertEqual(transit_segments([5, 4]), [("transit", 4, 5)])
+
+    def test_affected_only_returns_sessions_on_segments(self):
+        """Test: sólo aparecen las sesiones que recorren los tramos consultados."""
+        trips = ActiveTrips()
+        trips.put("a", {}, road_segments([0, 1, 2]))
+        trips.put("b", {}, road_segments([5, 6]))
+        self.assertEqual(trips.affected([("road", 1, 2)]), ["a"])
+        self.assertEqual(trips.affected([("road", 5, 6), ("road", 0, 1)]), ["a", "b"])
+        self.assertEqual(trips.affected([("road", 8, 9)]), [])
+
+    def test_put_reindexes_and_remove_cleans_index(self):
+        """Test: cambiar el itinerario mueve la sesión de tramos y al terminar no deja rastro."""
+        trips = ActiveTrips()
+        trips.put("a", {}, road_segments([0, 1, 2]))
+        trips.put("a", {}, road_segments([0, 3]))
+        self.assertEqual(trips.affected([("road", 1, 2)]), [])
+        self.assertEqual(trips.affected([("road", 0, 3)]), ["a"])
+        self.assertTrue(trips.remove("a"))
+        self.assertFalse(trips.remove("a"))
+        self.assertEqual(trips.stats(), {"sessions": 0, "indexed_segments": 0})
+
+
+class TestIncidentRerouting(unittest.TestCase):
+    """Tests para el re-enrutamiento incremental de viajes activos."""
+
+    def setUp(self):
+        tools.ACTIVE_INCIDENTS.clear()
+        self.sessions = []
+
+    def tearDown(self):
+        for session_id in self.sessions:
+            tools.end_trip_session(session_id)
+        tools.ACTIVE_INCIDENTS.clear()
+
+    def start(self, trip):
+        result = tools.start_trip_session(*trip, preferences=PREFERENCES, current_time=OFF_PEAK)
+        self.sessions.append(result["session_id"])
+        return result
+
+    def test_incident_reroutes_only_crossing_trips(self):
+        """Test: el accidente de la Calle 67 sólo recalcula el viaje que pasa por allí."""
+        north = self.start(NORTH_TRIP)
+        self.start(SOUTH_TRIP)
+        self.assertEqual(north["route"]["recommended_route"]["modes"], ["driving"])
+
+        with mock.patch.object(tools, "_route_session", wraps=tools._route_session) as route_session:
+            result = tools.report_traffic_incident(TRAFFIC_EVENTS_MOCK[0])
+        self.assertEqual([trip["session_id"] for trip in result["rerouted"]], [north["session_id"]])
+        self.assertEqual(route_session.call_count, 1)
+
+        session = tools.get_trip_session(north["session_id"])
+        self.assertEqual(session["incidents"], ["1"])
+        self.assertTrue(any("Calle 67" in alert for alert in session["route"]["alerts"]))
+        self.assertGreater(result["rerouted"][0]["duration"], result["rerouted"][0]["previous_duration"])
+
+    def test_clearing_incident_restores_route(self):
+        """Test: al retirar el incidente vuelve la ruta original aunque ya lo evitara."""
+        north = self.start(NORTH_TRIP)
+        before = north["route"]["recommended_route"]["total_duration"]
+        tools.report_traffic_incident(TRAFFIC_EVENTS_MOCK[0])
+        result = tools.clear_traffic_incident("1")
+        self.assertEqual([trip["session_id"] for trip in result["rerouted"]], [north["session_id"]])
+        self.assertEqual(result["rerouted"][0]["duration"], before)
+        self.assertEqual(tools.get_trip_session(north["session_id"])["incidents"], [])
+
+    def test_ended_trips_are_not_rerouted(self):
+        """Test: un viaje terminado ya no se recalcula."""
+        north = self.start(NORTH_TRIP)
+        tools.end_trip_session(north["session_id"])
+        result = tools.report_traffic_incident(TRAFFIC_EVENTS_MOCK[0])
+        self.assertEqual(result["rerouted"], [])
+        self.assertIn("error", tools.get_trip_session(north["session_id"]))
+
+    def test_station_incident_delays_transit(self):
+        """Test: un incidente en una estación demora los viajes en Metro que pasan por ella."""
+        trip = tools.start_trip_session(
+            "Niquía", "Poblado", preferences=PREFERENCES, current_time="2025-10-29T07:45:00"
+        )
+        self.sessions.append(trip["session_id"])
+        self.assertIn("transit", trip["route"]["recommended_route"]["modes"])
+        result = tools.report_traffic_incident({"id": "caribe", "location": "Caribe", "severity": "high"})
+        self.assertEqual(len(result["rerouted"]), 1)
+        self.assertEqual(
+            result["rerouted"][0]["duration"],
+            result["rerouted"][0]["previous_duration"] + tools.INCIDENT_TRANSIT_DELAY_MIN["high"],
+        )
+
+    def test_flowsense_events_reach_active_trips(self):
+        """Test: un evento nuevo de FlowSense re-enruta el viaje y se retira al terminar."""
+        north = self.start(NORTH_TRIP)
+        now = datetime.now()
+        event = {
+            **TRAFFIC_EVENTS_MOCK[0],
+            "id": "flowsense-67",
+            "start_time": (now - timedelta(minutes=5)).isoformat(),
+            "estimated_end": (now + timedelta(hours=1)).isoformat(),
+        }
+        predictor.TRAFFIC_EVENTS.add(event)
+        self.assertEqual(tools.ACTIVE_INCIDENTS["flowsense-67"]["source"], "flowsense")
+        self.assertEqual(tools.get_trip_session(north["session_id"])["incidents"], ["flowsense-67"])
+
+        # Una hora después el evento terminó y el viaje vuelve a su ruta
+        later = (now + timedelta(hours=2)).isoformat()
+        result = tools.sync_traffic_incidents(later)
+        self.assertEqual([cleared["incident_id"] for cleared in result["cleared"]], ["flowsense-67"])
+        self.assertEqual(tools.get_trip_session(north["session_id"])["incidents"], [])
+
+    def test_sync_reports_scheduled_events(self):
+        """Test: sync aplica los eventos activos a la hora dada y respeta los reportados a mano."""
+        north = self.start(NORTH_TRIP)
+        tools.report_traffic_incident({"id": "manual", "location": "Caribe", "severity": "low"})
+        result = tools.sync_traffic_incidents("2025-10-29T08:00:00")
+        self.assertEqual(sorted(r["incident_id"] for r in result["reported"]), ["1", "2"])
+        self.assertIn("1", tools.get_trip_session(north["session_id"])["incidents"])
+        result = tools.sync_traffic_incidents("2025-10-29T12:00:00")
+        self.assertEqual([cleared["incident_id"] for cleared in result["cleared"]], ["1"])
+        self.assertIn("manual", tools.ACTIVE_INCIDENTS)
+
+    def test_incident_tools_are_registered(self):
+        """Test: el agente puede reportar, retirar y sincronizar incidentes."""
+        from movility_ai.sub_agents.pathfinder.agent import pathfinder_agent
+        names = {tool.__name__ for tool in pathfinder_agent.tools}
+        self.assertTrue({"report_traffic_incident", "clear_traffic_incident", "sync_traffic_incidents"} <= names)
+
+    def test_incident_outside_network(self):
+        """Test: un incidente lejos de la red retorna error."""
+        result = tools.report_traffic_incident({"location": "Guatapé", "lat": 6.23, "lon": -75.16, "severity": "low"})
+        self.assertIn("error", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
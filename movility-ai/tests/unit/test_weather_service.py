@@ -0,0 +1,136 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para el servicio de clima con single-flight y stale-while-revalidate.
+
+Para ejecutar: python -m pytest tests/unit/test_weather_service.py -v
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from movility_ai.sub_agents.pathfinder.weather_service import WeatherService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowProvider:
+    """Proveedor que tarda y cuenta sus llamadas."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self, location):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("proveedor caído")
+        return {"location": location, "current": {"rain_probability": call}}
+
+
+class TestWeatherService(unittest.TestCase):
+    """Tests para el servicio de clima."""
+
+    def test_concurrent_calls_share_one_fetch(self):
+        """Test: 20 llamadas simultáneas para la misma ciudad hacen una sola consulta."""
+        provider = SlowProvider(delay=0.2)
+        service = WeatherService(provider)
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(pool.map(service.get, ["Medellín"] * 10 + ["medellin"] * 10))
+        self.assertEqual(provider.calls, 1)
+        self.assertTrue(all(r["current"]["rain_probability"] == 1 for r in results))
+        self.assertEqual(service.stats()["coalesced"], 19)
+
+    def test_fresh_then_stale_while_revalidate(self):
+        """Test: dentro de la frescura no se consulta; vencido se sirve el anterior y se refresca."""
+        provider = SlowProvider()
+        clock = FakeClock()
+        service = WeatherService(provider, fresh_seconds=300, stale_seconds=1800, clock=clock)
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 1)
+        clock.now = 200
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 1)
+        self.assertEqual(provider.calls, 1)
+
+        clock.now = 400
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 1)
+        for _ in range(100):
+            if service.stats()["fetches"] == 2 and not service._inflight:
+                break
+            time.sleep(0.01)
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 2)
+        self.assertEqual(provider.calls, 2)
+
+    def test_expired_value_blocks_for_fresh_fetch(self):
+        """Test: pasada la tolerancia se espera una consulta nueva."""
+        provider = SlowProvider()
+        clock = FakeClock()
+        service = WeatherService(provider, fresh_seconds=300, stale_seconds=1800, clock=clock)
+        service.get("Medellín")
+        clock.now = 5000
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 2)
+
+    def test_failed_refresh_keeps_stale_value(self):
+        """Test: si el refresco falla se sigue sirviendo el valor anterior."""
+        provider = SlowProvider()
+        clock = FakeClock()
+        service = WeatherService(provider, fresh_seconds=300, stale_seconds=1800, clock=clock)
+        service.get("Medellín")
+        provider.fail = True
+        clock.now = 400
+        service.get("Medellín")
+        for _ in range(100):
+            if service.stats()["refresh_errors"]:
+                break
+            time.sleep(0.01)
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 1)
+        clock.now = 5000
+        with self.assertRaises(RuntimeError):
+            service.get("Medellín")
+
+    def test_returned_values_are_copies(self):
+        """Test: modificar el clima recibido no altera el valor guardado."""
+        service = WeatherService(SlowProvider())
+        service.get("Medellín")["current"]["rain_probability"] = 99
+        self.assertEqual(service.get("Medellín")["current"]["rain_probability"], 1)
+
+    def test_cached_does_not_fetch(self):
+        """Test: cached sólo lee el valor guardado, sin consultar al proveedor."""
+        provider = SlowProvider()
+        clock = FakeClock()
+        service = WeatherService(provider, fresh_seconds=300, stale_seconds=1800, clock=clock)
+        self.assertIsNone(service.cached("Medellín"))
+        service.get("Medellín")
+        clock.now = 400
+        self.assertEqual(service.cached("medellin")["current"]["rain_probability"], 1)
+        clock.now = 5000
+        self.assertIsNone(service.cached("Medellín"))
+        self.assertEqual(provider.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# Copyright 2025 MovilityAI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🧪 Tests para la matriz zona-zona mapeada en memoria.
+
+Para ejecutar: python -m pytest tests/unit/test_zone_matrix.py -v
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+
+from movility_ai.sub_agents.pathfinder import precompute, tools, zone_matrix
+from movility_ai.sub_agents.pathfinder.zone_matrix import (
+    HOURS_PER_WEEK,
+    MATRIX_MODES,
+    ZoneMatrix,
+    fingerprint_path,
+    hour_of_week,
+    zone_matrix_fingerprint,
+)
+
+
+def load_matrix(path: str) -> ZoneMatrix:
+    return ZoneMatrix.load(
+        tools.TRANSIT_NETWORK, tools.METRO_STATION_COORDS_MOCK, tools.METRO_FARE_COP, path=path
+    )
+
+
+class TestZoneMatrix(unittest.TestCase):
+    """Tests para la construcción y consulta de la matriz."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "zones.npy")
+        cls.matrix = load_matrix(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_saved_and_memory_mapped(self):
+        """Test: la matriz se guarda y se vuelve a abrir mapeada en memoria."""
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIsInstance(self.matrix.matrix, np.memmap)
+        zones = len(self.matrix.zone_ids)
+        self.assertEqual(self.matrix.matrix.shape, (2, len(MATRIX_MODES), HOURS_PER_WEEK, zones, zones))
+
+        reloaded = load_matrix(self.path)
+        np.testing.assert_array_equal(reloaded.matrix, self.matrix.matrix)
+
+    def test_changed_inputs_rebuild_matrix(self):
+        """Test: una matriz de la misma forma pero con otra tarifa se recalcula."""
+        when = datetime(2025, 1, 15, 8, 0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "zones.npy")
+            load_matrix(path)
+            fare = tools.METRO_FARE_COP + 500
+            changed = ZoneMatrix.load(tools.TRANSIT_NETWORK, tools.METRO_STATION_COORDS_MOCK, fare, path=path)
+            self.assertEqual(changed.lookup("Aranjuez", "Envigado", "transit", when)[1], fare)
+            with open(fingerprint_path(path), encoding="ascii") as handle:
+                self.assertEqual(
+                    handle.read(),
+                    zone_matrix_fingerprint(tools.MEDELLIN_ZONES, tools.TRANSIT_NETWORK, tools.METRO_STATION_COORDS_MOCK, fare),
+                )
+
+    def test_offline_build_is_loaded_without_rebuilding(self):
+        """Test: el paso offline escribe la matriz y al iniciar sólo se abre."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "zones.npy")
+            with mock.patch.dict(os.environ, {"ZONE_MATRIX_PATH": path}):
+                self.assertEqual(precompute.main(["--only", "matrix"]), 0)
+                self.assertTrue(os.path.exists(fingerprint_path(path)))
+                with mock.patch.object(zone_matrix, "build_zone_matrix", side_effect=AssertionError("recalculó")):
+                    self.assertIsInstance(load_matrix(path).matrix, np.memmap)
+
+    def test_lookup_by_name_and_alias(self):
+        """Test: las zonas se encuentran por nombre, id o alias sin tildes."""
+        when = datetime(2025, 1, 15, 11, 0)
+        by_name = self.matrix.lookup("Laureles", "El Poblado", "walking", when)
+        by_alias = self.matrix.lookup("laureles", "poblado", "walking", when)
+        self.assertIsNotNone(by_name)
+        self.assertEqual(by_name, by_alias)
+        self.assertEqual(self.matrix.zone_index("Belen"), self.matrix.zone_index("belén"))
+        self.assertIsNone(self.matrix.lookup("Atlántida", "Laureles", "walking", when))
+
+    def test_driving_slower_at_peak(self):
+        """Test: en carro la hora pico es más lenta que el mediodía y que el domingo."""
+        peak = self.matrix.lookup("Laureles", "Centro", "driving", datetime(2025, 1, 15, 7, 30))
+        midday = self.matrix.lookup("Laureles", "Centro", "driving", datetime(2025, 1, 15, 11, 0))
+        sunday = self.matrix.lookup("Laureles", "Centro", "driving", datetime(2025, 1, 19, 7, 30))
+        self.assertGreater(peak[0], midday[0])
+        self.assertGreater(peak[0], sunday[0])
+        self.assertEqual(peak[1], midday[1])
+
+    def test_transit_uses_fare_and_service_hours(self):
+        """Test: el Metro cobra la tarifa y no tiene servicio de madrugada."""
+        day = self.matrix.lookup("Aranjuez", "Envigado", "transit", datetime(2025, 1, 15, 8, 0))
+        night = self.matrix.lookup("Aranjuez", "Envigado", "transit", datetime(2025, 1, 15, 2, 0))
+        self.assertEqual(day[1], tools.METRO_FARE_COP)
+        self.assertLess(day[0], self.matrix.lookup("Aranjuez", "Envigado", "walking", datetime(2025, 1, 15, 8, 0))[0])
+        self.assertEqual(night[0], float("inf"))
+
+    def test_hour_of_week(self):
+        """Test: lunes 00:00 es 0 y domingo 23:00 es 167."""
+        self.assertEqual(hour_of_week(datetime(2025, 1, 13, 0, 0)), 0)
+        self.assertEqual(hour_of_week(datetime(2025, 1, 19, 23, 0)), 167)
+
+
+class TestZoneTravelTimeTool(unittest.TestCase):
+    """Tests para la herramienta get_zone_travel_time."""
+
+    def test_known_zones(self):
+        """Test: responde duración y costo entre zonas conocidas."""
+        result = tools.get_zone_travel_time("Laureles", "El Poblado", "driving", "2025-01-15T11:00:00")
+        self.assertNotIn("error", result)
+        self.assertGreater(result["duration"], 0)
+        self.assertGreater(result["cost"], 0)
+
+    def test_unknown_zone(self):
+        """Test: una zona desconocida devuelve error y las zonas disponibles."""
+        result = tools.get_zone_travel_time("Narnia", "Laureles")
+        self.assertIn("error", result)
+        self.assertIn("Laureles", result["available_zones"])
+
+
+if __name__ == "__main__":
+    unittest.main()
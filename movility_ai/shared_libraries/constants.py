@@ -43,6 +43,63 @@ MEDELLIN_ZONES = [
     "Caldas",
 ]
 
+# Coordenadas aproximadas (lat, lng) de zonas, estaciones y sitios de interés
+ZONE_COORDINATES = {
+    "Laureles": (6.2447, -75.5956),
+    "El Poblado": (6.2088, -75.5664),
+    "Envigado": (6.1719, -75.5863),
+    "Belén": (6.2310, -75.6030),
+    "Centro": (6.2518, -75.5636),
+    "Estadio": (6.2569, -75.5903),
+    "Aranjuez": (6.2820, -75.5560),
+    "Castilla": (6.2940, -75.5740),
+    "Robledo": (6.2780, -75.5960),
+    "Buenos Aires": (6.2390, -75.5530),
+    "La Candelaria": (6.2480, -75.5700),
+    "Guayabal": (6.2160, -75.5850),
+    "Itagüí": (6.1719, -75.6110),
+    "Sabaneta": (6.1515, -75.6160),
+    "La Estrella": (6.1580, -75.6430),
+    "Caldas": (6.0910, -75.6360),
+}
+
+METRO_STATION_COORDINATES = {
+    "Niquía": (6.3375, -75.5440),
+    "Acevedo": (6.3002, -75.5585),
+    "Universidad": (6.2690, -75.5660),
+    "Parque Berrío": (6.2505, -75.5685),
+    "San Antonio": (6.2468, -75.5700),
+    "Alpujarra": (6.2425, -75.5730),
+    "Industriales": (6.2290, -75.5755),
+    "Poblado": (6.2125, -75.5780),
+    "Aguacatala": (6.1935, -75.5820),
+    "Santo Domingo": (6.2935, -75.5420),
+    "San Javier": (6.2560, -75.6135),
+}
+
+LANDMARK_COORDINATES = {
+    "Parque Lleras": (6.2088, -75.5664),
+    "Plaza Botero": (6.2522, -75.5685),
+    "Pueblito Paisa": (6.2366, -75.5797),
+    "Parque Explora": (6.2705, -75.5655),
+    "Jardín Botánico": (6.2705, -75.5637),
+    "Parque de los Pies Descalzos": (6.2445, -75.5778),
+    "Aeropuerto Olaya Herrera": (6.2201, -75.5906),
+    "Estadio Atanasio Girardot": (6.2566, -75.5906),
+    "Universidad de Antioquia": (6.2676, -75.5694),
+    "Terminal del Norte": (6.2758, -75.5674),
+    "Terminal del Sur": (6.2155, -75.5870),
+    "Comuna 13": (6.2560, -75.6190),
+}
+
+ENCICLA_STATION_COORDINATES = {
+    "EnCicla Parque Lleras": (6.2088, -75.5664),
+    "EnCicla Universidad de Antioquia": (6.2676, -75.5694),
+    "EnCicla Parque de las Luces": (6.2512, -75.5698),
+    "EnCicla Terminal del Norte": (6.2758, -75.5674),
+    "EnCicla Laureles": (6.2447, -75.5956),
+}
+
 # Transport modes
 TRANSPORT_MODES = [
     "metro",
@@ -26,7 +26,7 @@ import unittest
 
 # Los imports fallarán si las tools no están implementadas como esperamos
 try:
-    from movility_ai.tools import data_mock_tool, visualizer_tool, memory_display_tool
+    from movility_ai.tools import data_mock_tool, visualizer_tool, memory_display_tool, geocoding_tool, fare_tool
     TOOLS_AVAILABLE = True
 except ImportError:
     TOOLS_AVAILABLE = False
@@ -147,6 +147,72 @@ class TestDataMockTool(unittest.TestCase):
         self.assertGreater(len(insights["traffic_trend"]), 0)
 
 
+class TestGeocodingTool(unittest.TestCase):
+    """Tests para el nomenclátor local de lugares."""
+    
+    def setUp(self):
+        """Verificar que las tools están disponibles."""
+        if not TOOLS_AVAILABLE:
+            self.skipTest("Tools no disponibles - esperando implementación")
+
+    def test_resolve_zone_without_accents(self):
+        """Test: ubica zonas sin importar tildes ni mayúsculas."""
+        place = geocoding_tool.resolve_place("itagui")
+        self.assertEqual(place["name"], "Itagüí")
+        self.assertEqual(place["type"], "zona")
+
+    def test_resolve_prefix_and_typo(self):
+        """Test: ubica lugares incompletos o mal escritos."""
+        self.assertEqual(geocoding_tool.resolve_place("pueblito")["name"], "Pueblito Paisa")
+        self.assertEqual(geocoding_tool.resolve_place("San Antnio")["name"], "San Antonio")
+        self.assertIsNone(geocoding_tool.resolve_place("xyz"))
+
+    def test_cache_is_bounded(self):
+        """Test: el caché de búsquedas difusas no crece sin límite."""
+        for i in range(geocoding_tool.MAX_CACHE_ENTRIES + 50):
+            geocoding_tool.resolve_place(f"pueblito {i}")
+        self.assertLessEqual(len(geocoding_tool._CACHE), geocoding_tool.MAX_CACHE_ENTRIES)
+        self.assertEqual(geocoding_tool.resolve_place("San Antnio")["name"], "San Antonio")
+
+    def test_mock_route_uses_real_coordinates(self):
+        """Test: la ruta simulada usa las coordenadas del origen y destino."""
+        route = data_mock_tool.generate_mock_route("Parque Lleras", "Centro")
+        self.assertAlmostEqual(route["origin"]["lat"], 6.2088, places=3)
+        self.assertAlmostEqual(route["destination"]["lat"], 6.2518, places=3)
+
+
+class TestFareTool(unittest.TestCase):
+    """Tests para las tarifas con integraciones Metro/Cívica."""
+    
+    def setUp(self):
+        """Verificar que las tools están disponibles."""
+        if not TOOLS_AVAILABLE:
+            self.skipTest("Tools no disponibles - esperando implementación")
+
+    def test_integrated_system_pays_once(self):
+        """Test: Metro + Metrocable cobra una sola tarifa."""
+        segments = [
+            {"mode": "metro", "duration_minutes": 20, "distance_km": 8},
+            {"mode": "metrocable", "duration_minutes": 10, "distance_km": 2},
+        ]
+        self.assertEqual(fare_tool.segment_costs(segments), [fare_tool.FARE_PRODUCTS["metro"]["civica"], 0])
+
+    def test_feeder_integration_and_window(self):
+        """Test: el alimentador se integra con Cívica sólo dentro de la ventana."""
+        metro = fare_tool.FARE_PRODUCTS["metro"]["civica"]
+        feeder = [{"mode": "alimentador", "duration_minutes": 10}, {"mode": "metro", "duration_minutes": 20}]
+        late = [feeder[0], {"mode": "caminando", "duration_minutes": fare_tool.CIVICA_TRANSFER_WINDOW_MIN + 1}, feeder[1]]
+        self.assertEqual(
+            fare_tool.price_routes([feeder, late]),
+            [metro + fare_tool.FEEDER_INTEGRATION_COP, fare_tool.FARE_PRODUCTS["alimentador"]["civica"] + metro],
+        )
+
+    def test_mock_route_total_matches_segments(self):
+        """Test: el costo total de la ruta simulada es la suma de sus segmentos."""
+        route = data_mock_tool.generate_mock_route("Centro", "Envigado")
+        self.assertEqual(route["total_cost_cop"], sum(s["cost_cop"] for s in route["segments"]))
+
+
 class TestVisualizerTool(unittest.TestCase):
     """Tests para la herramienta de visualización."""
     
@@ -35,6 +35,8 @@ from movility_ai.shared_libraries.constants import (
     TRAFFIC_LEVELS,
     EVENT_TYPES
 )
+from movility_ai.tools.fare_tool import segment_costs
+from movility_ai.tools.geocoding_tool import resolve_place
 
 
 def generate_mock_route(origin: str, destination: str, preferred_mode: str = None) -> Dict[str, Any]:
@@ -55,12 +57,10 @@ def generate_mock_route(origin: str, destination: str, preferred_mode: str = Non
     segments = []
     total_time = 0
     total_distance = 0
-    total_cost = 0
     
     for i, mode in enumerate(modes):
         duration = random.randint(5, 20)
         distance = random.uniform(1.0, 5.0)
-        cost = _calculate_mock_cost(mode, distance)
         
         segment = {
             "mode": mode,
@@ -68,21 +68,24 @@ def generate_mock_route(origin: str, destination: str, preferred_mode: str = Non
             "to_location": destination if i == len(modes) - 1 else f"Punto intermedio {i+1}",
             "duration_minutes": duration,
             "distance_km": round(distance, 2),
-            "cost_cop": cost,
             "instructions": _generate_instructions(mode, origin, destination)
         }
         segments.append(segment)
         
         total_time += duration
         total_distance += distance
-        total_cost += cost
+    
+    # Tarifas de la ruta completa: los transbordos integrados no se cobran dos veces
+    for segment, cost in zip(segments, segment_costs(segments)):
+        segment["cost_cop"] = cost
+    total_cost = sum(segment["cost_cop"] for segment in segments)
     
     # Calcular eco score basado en los modos utilizados
     eco_score = _calculate_eco_score(modes)
     
     return {
-        "origin": {"name": origin, "lat": 6.2442, "lng": -75.5812},
-        "destination": {"name": destination, "lat": 6.2308, "lng": -75.5906},
+        "origin": _locate(origin, default=(6.2442, -75.5812)),
+        "destination": _locate(destination, default=(6.2308, -75.5906)),
         "segments": segments,
         "total_duration_minutes": total_time,
         "total_distance_km": round(total_distance, 2),
@@ -219,19 +222,12 @@ def generate_mock_insights() -> Dict[str, Any]:
 
 # Helper functions
 
-def _calculate_mock_cost(mode: str, distance_km: float) -> int:
-    """Calcula el costo aproximado según el modo de transporte."""
-    costs = {
-        "metro": 3200,
-        "metrocable": 3200,
-        "bus": 2900,
-        "tranvia": 3200,
-        "bicicleta": 0,
-        "caminando": 0,
-        "carro": int(distance_km * 2000),  # ~2000 COP por km
-        "moto": int(distance_km * 1500),   # ~1500 COP por km
-    }
-    return costs.get(mode, 0)
+def _locate(place: str, default: tuple) -> Dict[str, Any]:
+    """Ubica un lugar con el nomenclátor local; si no se encuentra usa coordenadas por defecto."""
+    resolved = resolve_place(place)
+    if resolved is None:
+        return {"name": place, "lat": default[0], "lng": default[1]}
+    return {"name": place, "lat": resolved["lat"], "lng": resolved["lng"], "resolved_name": resolved["name"]}
 
 
 def _calculate_eco_score(modes: List[str]) -> int:
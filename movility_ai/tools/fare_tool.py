@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+💳 Fare Tool - Tarifas de rutas completas con integraciones del Metro.
+
+Las reglas tarifarias se compilan al importar en una tabla de consulta:
+- Metro, Metrocable, Tranvía y Metroplús integrados: un solo pago por viaje
+- Alimentadores con tarifa integrada al Metro pagando con Cívica
+- Ventana de transbordo de la Cívica entre bajarse y volver a validar
+- Carro y moto por kilómetro; caminar y bicicleta no cuestan
+
+Así el costo de una ruta es una suma de consultas a la tabla por cada
+par de segmentos consecutivos, y un lote de rutas se cotiza en una pasada.
+"""
+
+from typing import Dict, Any, List
+
+# Tarifa por servicio (COP): con tarjeta Cívica y en efectivo. Debe coincidir
+# con FARE_PRODUCTS de PathFinder (pathfinder/fares.py); lo verifica
+# movility-ai/tests/unit/test_fares.py, ya que los dos paquetes no se importan entre sí
+FARE_PRODUCTS = {
+    "metro": {"civica": 3050, "cash": 3550},
+    "metrocable": {"civica": 3050, "cash": 3550},
+    "tranvia": {"civica": 3050, "cash": 3550},
+    "metroplus": {"civica": 3050, "cash": 3550},
+    "alimentador": {"civica": 2900, "cash": 3100},
+    "bus": {"civica": 2900, "cash": 3100},
+}
+PAYMENTS = ("civica", "cash")
+
+# Servicios entre los que se transborda sin salir de la zona paga
+INTEGRATED_SERVICES = ("metro", "metrocable", "tranvia", "metroplus")
+
+# Alimentador + sistema integrado con Cívica: tarifa del sistema más este valor
+FEEDER_INTEGRATION_COP = 650
+
+# Minutos para volver a validar la Cívica y conservar la integración
+CIVICA_TRANSFER_WINDOW_MIN = 60
+
+# Modos que se cobran por distancia (COP por km)
+DISTANCE_COP_PER_KM = {
+    "carro": 2000,
+    "moto": 1500,
+}
+
+
+def _compile_rules() -> Dict[tuple, int]:
+    """
+    Tabla (pago, servicio anterior, servicio, en ventana) -> COP a pagar al subir.
+
+    El servicio anterior None es el primer tramo pagado del viaje.
+    """
+    table = {}
+    for payment in PAYMENTS:
+        for service, fares in FARE_PRODUCTS.items():
+            for within in (True, False):
+                table[(payment, None, service, within)] = fares[payment]
+        for prev in FARE_PRODUCTS:
+            for service in FARE_PRODUCTS:
+                full = FARE_PRODUCTS[service][payment]
+                for within in (True, False):
+                    cost = full
+                    if prev in INTEGRATED_SERVICES and service in INTEGRATED_SERVICES:
+                        cost = 0
+                    elif within and payment == "civica" and "alimentador" in (prev, service) and (
+                        prev in INTEGRATED_SERVICES or service in INTEGRATED_SERVICES
+                    ):
+                        rail = FARE_PRODUCTS[service if service in INTEGRATED_SERVICES else prev][payment]
+                        cost = max(rail + FEEDER_INTEGRATION_COP - FARE_PRODUCTS[prev][payment], 0)
+                    table[(payment, prev, service, within)] = cost
+    return table
+
+
+FARE_TABLE = _compile_rules()
+
+
+def segment_costs(segments: List[Dict[str, Any]], payment: str = "civica") -> List[int]:
+    """
+    Costo de cada segmento de una ruta teniendo en cuenta las integraciones.
+
+    Args:
+        segments: Segmentos con mode, duration_minutes y distance_km, en orden
+        payment: "civica" o "cash"
+
+    Returns:
+        Lista con el costo (COP) de cada segmento
+
+    Raises:
+        ValueError: Si el medio de pago no existe
+    """
+    if payment not in PAYMENTS:
+        raise ValueError(f"Medio de pago desconocido: {payment}")
+    costs = []
+    previous = None
+    clock = 0.0
+    alighted = 0.0
+    for segment in segments:
+        mode = segment.get("mode")
+        if mode in FARE_PRODUCTS:
+            within = clock - alighted <= CIVICA_TRANSFER_WINDOW_MIN
+            costs.append(FARE_TABLE[(payment, previous, mode, within)])
+            previous = mode
+            clock += segment.get("duration_minutes", 0)
+            alighted = clock
+        else:
+            costs.append(int(segment.get("distance_km", 0) * DISTANCE_COP_PER_KM.get(mode, 0)))
+            clock += segment.get("duration_minutes", 0)
+    return costs
+
+
+def price_routes(routes: List[List[Dict[str, Any]]], payment: str = "civica") -> List[int]:
+    """
+    Costo total de un lote de rutas candidatas.
+
+    Args:
+        routes: Cada ruta es su lista de segmentos (ver segment_costs)
+        payment: "civica" o "cash"
+
+    Returns:
+        Costo total (COP) de cada ruta, en el mismo orden
+    """
+    return [sum(segment_costs(segments, payment)) for segments in routes]
@@ -0,0 +1,159 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+📍 Geocoding Tool - Ubica lugares de Medellín escritos en texto libre.
+
+Nomenclátor local de zonas, estaciones del Metro, estaciones EnCicla y
+sitios de interés con:
+- Coincidencia exacta (sin tildes ni mayúsculas)
+- Búsqueda por prefijo de cualquier palabra del nombre
+- Búsqueda difusa por trigramas para errores de escritura
+- Caché acotado en memoria de las búsquedas por prefijo o difusas
+
+Así cada consulta se resuelve localmente sin llamar a una API de geocoding;
+como todo se recalcula en microsegundos, nada se guarda en disco.
+"""
+
+import bisect
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from movility_ai.shared_libraries.constants import (
+    ZONE_COORDINATES,
+    METRO_STATION_COORDINATES,
+    LANDMARK_COORDINATES,
+    ENCICLA_STATION_COORDINATES,
+)
+
+# Similitud mínima de trigramas para aceptar una coincidencia difusa
+TRIGRAM_THRESHOLD = 0.4
+
+# Búsquedas por prefijo o difusas que se recuerdan (se descartan las más antiguas)
+MAX_CACHE_ENTRIES = 1024
+
+
+def normalize(text: str) -> str:
+    """
+    Normaliza un nombre: sin tildes, minúsculas y sin puntuación.
+
+    Args:
+        text: Texto libre
+
+    Returns:
+        Texto normalizado
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = "".join(c if c.isalnum() else " " for c in text.lower())
+    words = text.split()
+    if words and words[0] in ("estacion", "metro", "encicla") and len(words) > 1:
+        words = words[1:]
+    return " ".join(words)
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Nomenclátor en orden de preferencia ante nombres repetidos
+PLACES: List[Dict[str, Any]] = [
+    {"name": name, "lat": lat, "lng": lng, "type": place_type}
+    for place_type, coordinates in (
+        ("zona", ZONE_COORDINATES),
+        ("metro", METRO_STATION_COORDINATES),
+        ("sitio", LANDMARK_COORDINATES),
+        ("encicla", ENCICLA_STATION_COORDINATES),
+    )
+    for name, (lat, lng) in coordinates.items()
+]
+
+# Índices construidos una sola vez al importar
+_EXACT: Dict[str, int] = {}
+_PREFIXES: List[Tuple[str, int, int]] = []
+_TRIGRAMS: Dict[str, List[int]] = {}
+_TRIGRAM_SIZES: List[int] = []
+
+for _index, _place in enumerate(PLACES):
+    _key = normalize(_place["name"])
+    _EXACT.setdefault(_key, _index)
+    _words = _key.split()
+    for _start in range(len(_words)):
+        _PREFIXES.append((" ".join(_words[_start:]), len(_key), _index))
+    for _gram in _trigrams(_key):
+        _TRIGRAMS.setdefault(_gram, []).append(_index)
+    _TRIGRAM_SIZES.append(len(_trigrams(_key)))
+_PREFIXES.sort()
+_PREFIX_KEYS = [key for key, _, _ in _PREFIXES]
+
+# Índice en PLACES de cada consulta normalizada ya resuelta, del uso más antiguo al más reciente
+_CACHE: "OrderedDict[str, int]" = OrderedDict()
+
+
+def resolve_place(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Ubica un lugar de Medellín escrito en texto libre.
+
+    Args:
+        query: Lugar (ej: "Centro", "parque lleras", "Estación San Antonio")
+
+    Returns:
+        Diccionario con name, lat, lng y type, o None si no se encuentra
+    """
+    key = normalize(query)
+    if not key:
+        return None
+    if key in _EXACT:
+        return dict(PLACES[_EXACT[key]])
+
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return dict(PLACES[_CACHE[key]])
+
+    # Prefijo de cualquier palabra: gana el nombre más corto
+    place_index = None
+    start = bisect.bisect_left(_PREFIX_KEYS, key)
+    best = None
+    for position in range(start, len(_PREFIX_KEYS)):
+        if not _PREFIX_KEYS[position].startswith(key):
+            break
+        candidate = _PREFIXES[position][1:]
+        if best is None or candidate < best:
+            best = candidate
+    if best is not None:
+        place_index = best[1]
+    else:
+        # Similitud de Jaccard entre trigramas
+        grams = _trigrams(key)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for index in _TRIGRAMS.get(gram, []):
+                shared[index] = shared.get(index, 0) + 1
+        scored = [
+            (count / (len(grams) + _TRIGRAM_SIZES[index] - count), -index)
+            for index, count in shared.items()
+        ]
+        if scored:
+            score, negative_index = max(scored)
+            if score >= TRIGRAM_THRESHOLD:
+                place_index = -negative_index
+
+    if place_index is None:
+        return None
+    _CACHE[key] = place_index
+    if len(_CACHE) > MAX_CACHE_ENTRIES:
+        _CACHE.popitem(last=False)
+    return dict(PLACES[place_index])